@@ -0,0 +1,106 @@
+"""
+Micro-benchmark: per-resource availability for a busy multi-staff day.
+
+One day with RESOURCES staff and APPOINTMENTS bookings spread over them
+(a few left unassigned, as rows booked before resources existed are).
+Times `slots_for_day(..., resources=...)` for the whole pool and for a
+service only half the staff can do, next to the single-resource path,
+and `pick_resource` for every offered slot. The budget is 10 ms per day.
+
+Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.allocation_bench
+"""
+import os
+import random
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+# pure computation; the models only need some engine to import
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from Backend.services.allocation import pick_resource  # noqa: E402
+from Backend.services.availability_service import BUFFER_MINUTES, SLOT_INCREMENT_MINUTES, slots_for_day  # noqa: E402
+from Backend.services.timezones import day_frame, get_zone  # noqa: E402
+
+DAY = date(2025, 3, 9)  # US spring-forward day: the slowest frame path
+ZONE = "America/New_York"
+OPEN_INTERVALS = [(8 * 60, 12 * 60), (13 * 60, 20 * 60)]
+RESOURCES = 20
+APPOINTMENTS = 200
+UNASSIGNED = 5
+DURATION = 30
+ROUNDS = 200
+BUDGET_MS = 10.0
+
+
+def day_of_bookings(frame, seed=16):
+    rng = random.Random(seed)
+    resources = [f"resource-{i:02d}" for i in range(RESOURCES)]
+    appointments = []
+    for i in range(APPOINTMENTS):
+        start = frame.start + timedelta(minutes=rng.randrange(8 * 60, 19 * 60, 15))
+        appointments.append(SimpleNamespace(
+            start_time=start,
+            end_time=start + timedelta(minutes=rng.choice((15, 30, 45, 60))),
+            resource_id=None if i < UNASSIGNED else resources[i % RESOURCES],
+        ))
+    return resources, appointments
+
+
+def pick_for_slots(frame, slots, appointments, resources):
+    """What booking does per request, minus the queries: overlap + pick."""
+    day_load = {}
+    for appt in appointments:
+        day_load[appt.resource_id] = day_load.get(appt.resource_id, 0) + 1
+    picked = 0
+    for start, _ in slots:
+        hour, minute = map(int, start[:5].split(":"))
+        begin = frame.start + timedelta(minutes=frame.wall_to_minute(hour * 60 + minute))
+        end = begin + timedelta(minutes=DURATION)
+        overlapping = [a.resource_id for a in appointments if a.start_time < end and a.end_time > begin]
+        if pick_resource(resources, overlapping, day_load) is not None:
+            picked += 1
+    return picked
+
+
+def timed(fn, *args):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    frame = day_frame(get_zone(ZONE), DAY)
+    resources, appointments = day_of_bookings(frame)
+    half = resources[::2]
+
+    cases = [
+        ("single resource", None),
+        (f"{RESOURCES} resources", resources),
+        (f"{len(half)} eligible", half),
+    ]
+    print(f"{RESOURCES} resources, {APPOINTMENTS} appointments, {ZONE} {DAY}")
+    print(f"{'path':<20} {'slots':>6} {'ms / day':>10} {'budget':>8}")
+    for label, pool in cases:
+        slots = slots_for_day(DAY, OPEN_INTERVALS, appointments, DURATION, frame=frame, resources=pool)
+        elapsed = timed(
+            slots_for_day, DAY, OPEN_INTERVALS, appointments, DURATION,
+            SLOT_INCREMENT_MINUTES, BUFFER_MINUTES, frame, pool,
+        ) * 1000
+        verdict = "ok" if elapsed < BUDGET_MS else "OVER"
+        print(f"{label:<20} {len(slots):>6} {elapsed:>10.3f} {verdict:>8}")
+
+    slots = slots_for_day(DAY, OPEN_INTERVALS, appointments, DURATION, frame=frame, resources=resources)
+    elapsed = timed(pick_for_slots, frame, slots, appointments, resources) * 1000
+    picked = pick_for_slots(frame, slots, appointments, resources)
+    print(f"pick_resource for {len(slots)} slots: {picked} assigned in {elapsed:.3f} ms "
+          f"({elapsed / max(len(slots), 1) * 1000:.1f} µs / booking)")
+
+
+if __name__ == "__main__":
+    main()
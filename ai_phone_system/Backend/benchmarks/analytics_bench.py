@@ -0,0 +1,257 @@
+"""
+Dashboard rollup benchmark: incremental rollups vs recomputing from appointments.
+
+Seeds tenants of very different sizes with two years of history, written
+straight to the table as before rollups existed, then runs the chunked
+backfill. Next, on one tenant, it books and cancels through
+booking_service (some cancels twice) and imports rows with
+bulk_import. Some of that traffic runs in threads while the tenant is
+being backfilled again.
+
+Checks that every tenant's daily and hourly rollups equal a full
+recompute from its appointments. Then times a dashboard read (per-day
+counts + busiest hours) for 30 and 365 days: from the rollups, and by
+reading and grouping the appointments in range. Exits non-zero on any
+mismatch.
+
+Run from `ai_phone_system/` (SQLite temp file by default):
+
+    python -m Backend.benchmarks.analytics_bench
+    python -m Backend.benchmarks.analytics_bench --sizes 1000,20000,200000 --live 300
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "analytics_bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.analytics import DailyRollup, HourlyRollup  # noqa: E402
+from Backend.models.appointment import Appointment, uuid_str  # noqa: E402
+from Backend.models.business import Business  # noqa: E402
+from Backend.models.service import Service  # noqa: E402
+from Backend.services import analytics, booking_service, bulk_import  # noqa: E402
+from Backend.services.timezones import business_zones, day_frame  # noqa: E402
+from Backend.utils.instrumentation import install_query_hooks, queries_total  # noqa: E402
+
+TODAY = date(2025, 3, 10)
+HISTORY_DAYS = 730
+PRICES = {"Cut": 4500, "Colour": 12000, "Consult": None}
+
+
+def seed_tenant(size: int, rng: random.Random) -> str:
+    """A tenant with `size` appointments over two years, bypassing the rollups."""
+    db = SessionLocal()
+    try:
+        business = Business(name=f"Tenant {size}", timezone="America/Toronto")
+        db.add(business)
+        db.flush()
+        services = [Service(business_id=business.id, name=name, duration_minutes=30, price_cents=price)
+                    for name, price in PRICES.items()]
+        db.add_all(services)
+        db.flush()
+        zone = business_zones.get(db, business.id)
+        first = TODAY - timedelta(days=HISTORY_DAYS)
+        rows = []
+        for n in range(size):
+            frame = day_frame(zone, first + timedelta(days=rng.randrange(HISTORY_DAYS + 60)))
+            start = frame.start + timedelta(minutes=8 * 60 + 15 * rng.randrange(44))
+            service = rng.choice(services + [None])
+            rows.append({"id": uuid_str(), "business_id": business.id, "service_id": service and service.id,
+                         "customer_name": f"Customer {n}", "start_time": start,
+                         "end_time": start + timedelta(minutes=30), "created_at": start - timedelta(days=7),
+                         "status": rng.choices(["completed", "scheduled", "cancelled"], [6, 3, 1])[0]})
+        for i in range(0, len(rows), 5000):
+            db.bulk_insert_mappings(Appointment, rows[i:i + 5000])
+        db.commit()
+        return business.id
+    finally:
+        db.close()
+
+
+def stored_rollups(db, business_id: str):
+    daily = {row.day: [row.bookings, row.cancellations, row.revenue_cents] for row in db.query(DailyRollup).filter(
+        DailyRollup.business_id == business_id)}
+    hourly = {(row.day, row.hour): [row.bookings, row.cancellations] for row in db.query(HourlyRollup).filter(
+        HourlyRollup.business_id == business_id)}
+    return daily, hourly
+
+
+def recomputed_rollups(db, business_id: str, date_from: date | None = None, date_to: date | None = None):
+    """The naive dashboard: read the tenant's appointments (in range) and group them."""
+    zone = business_zones.get(db, business_id)
+    query = db.query(Appointment.start_time, Appointment.status, Service.price_cents).outerjoin(
+        Service, Service.id == Appointment.service_id
+    ).filter(Appointment.business_id == business_id)
+    if date_from is not None:
+        query = query.filter(Appointment.start_time >= day_frame(zone, date_from).start,
+                             Appointment.start_time < day_frame(zone, date_to).end)
+    daily, hourly = analytics.tally(query, zone)
+    return dict(daily), dict(hourly)
+
+
+def compare(db, business_id: str, label: str, problems: list):
+    daily, hourly = stored_rollups(db, business_id)
+    want_daily, want_hourly = recomputed_rollups(db, business_id)
+    db.rollback()
+    bad_days = {d for d in set(daily) | set(want_daily) if daily.get(d) != want_daily.get(d)}
+    bad_hours = {k for k in set(hourly) | set(want_hourly) if hourly.get(k) != want_hourly.get(k)}
+    if bad_days or bad_hours:
+        problem = f"{label}: {len(bad_days)} days / {len(bad_hours)} hours differ from a recompute"
+        if bad_days:
+            day = min(bad_days)
+            problem += f" (first {day}: stored {daily.get(day)}, recomputed {want_daily.get(day)})"
+        problems.append(problem)
+
+
+# ---------------------------------------------------------
+# LIVE TRAFFIC (booking_service and bulk_import, as the routes call them)
+# ---------------------------------------------------------
+def live_traffic(business_id: str, bookings: int, seed_value: int, booked: list):
+    rng = random.Random(seed_value)
+    db = SessionLocal()
+    try:
+        service_ids = [row[0] for row in db.query(Service.id).filter(Service.business_id == business_id)]
+        db.rollback()
+        for _ in range(bookings):
+            day = TODAY + timedelta(days=rng.randrange(-20, 40))
+            start = datetime.combine(day, datetime.min.time()) + timedelta(minutes=6 * 60 + 5 * rng.randrange(200))
+            try:
+                appointment = booking_service.book_appointment(
+                    db, business_id, "Live", "+15145550100", start, 25, service_id=rng.choice(service_ids + [None])
+                )
+            except booking_service.SlotUnavailableError:
+                continue
+            booked.append(appointment.id)
+            if rng.random() < 0.3:
+                victim = rng.choice(booked)
+                booking_service.cancel_appointment(db, victim)
+                if rng.random() < 0.3:
+                    booking_service.cancel_appointment(db, victim)  # cancelling twice counts once
+    finally:
+        db.close()
+
+
+def import_rows(business_id: str, rows: int, rng: random.Random):
+    items = [{
+        "customer_name": f"Imported {n}",
+        "start_time": (datetime.combine(TODAY + timedelta(days=rng.randrange(-300, 90)), datetime.min.time())
+                       + timedelta(minutes=7 * 60 + 10 * rng.randrange(70))).isoformat(),
+        "duration_minutes": "10",
+        "service": rng.choice(["Cut", "Colour", "Consult", ""]),
+        "status": rng.choice(["completed", "scheduled", "cancelled"]),
+    } for n in range(rows)]
+    db = SessionLocal()
+    try:
+        return bulk_import.import_appointments(db, business_id, items)["counts"]
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# DASHBOARD READS
+# ---------------------------------------------------------
+def time_dashboards(business_id: str, days: int, repeat: int = 5):
+    """(ms from rollups, SQL statements, ms recomputing) for the last `days` days."""
+    date_to = TODAY
+    date_from = TODAY - timedelta(days=days - 1)
+    db = SessionLocal()
+    try:
+        timings = []
+        queries = queries_total.snapshot().get((), 0)
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            analytics.daily_rollups(db, business_id, date_from, date_to)
+            analytics.hourly_rollups(db, business_id, date_from, date_to)
+            timings.append(time.perf_counter() - t0)
+        statements = (queries_total.snapshot().get((), 0) - queries) / repeat
+        rollup_ms = sorted(timings)[repeat // 2] * 1000
+
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            recomputed_rollups(db, business_id, date_from, date_to)
+            timings.append(time.perf_counter() - t0)
+        return rollup_ms, statements, sorted(timings)[repeat // 2] * 1000
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="500,10000,100000", help="appointments per seeded tenant")
+    parser.add_argument("--live", type=int, default=200, help="bookings per live-traffic thread")
+    parser.add_argument("--threads", type=int, default=3)
+    parser.add_argument("--import-rows", type=int, default=2000)
+    parser.add_argument("--days-per-chunk", type=int, default=analytics.ANALYTICS_BACKFILL_DAYS)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    Base.metadata.create_all(bind=engine)
+    install_query_hooks()
+    logging.getLogger("reception_ai.performance").setLevel(logging.ERROR)  # threads wait on SQLite's write lock
+    rng = random.Random(25)
+    t0 = time.perf_counter()
+    tenants = [seed_tenant(size, rng) for size in sizes]
+    print(f"seeded {len(tenants)} tenants ({sum(sizes)} appointments) in {time.perf_counter() - t0:.1f}s")
+
+    # 1️⃣ Backfill history
+    db = SessionLocal()
+    try:
+        for size, business_id in zip(sizes, tenants):
+            t0 = time.perf_counter()
+            stats = analytics.backfill_business(db, business_id, days_per_chunk=args.days_per_chunk)
+            print(f"backfill {size:>7} appointments: {stats['chunks']} chunks in "
+                  f"{(time.perf_counter() - t0) * 1000:.0f} ms")
+    finally:
+        db.close()
+
+    # 2️⃣ Live bookings, cancels and an import on the smallest tenant, partly during a second backfill
+    live = tenants[0]
+    booked = []
+    threads = [threading.Thread(target=live_traffic, args=(live, args.live, 100 + n, booked))
+               for n in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    db = SessionLocal()
+    try:
+        analytics.backfill_business(db, live, days_per_chunk=7)
+    finally:
+        db.close()
+    for thread in threads:
+        thread.join()
+    counts = import_rows(live, args.import_rows, rng)
+    print(f"live traffic: {len(booked)} bookings from {args.threads} threads during a backfill, "
+          f"import {counts}")
+
+    problems = []
+    db = SessionLocal()
+    try:
+        for size, business_id in zip(sizes, tenants):
+            compare(db, business_id, f"tenant {size}", problems)
+    finally:
+        db.close()
+
+    # 3️⃣ Dashboard cost: rollups vs reading appointments
+    print(f"{'tenant':>8} {'days':>5} {'rollups ms':>11} {'statements':>11} {'recompute ms':>13}")
+    for size, business_id in zip(sizes, tenants):
+        for days in (30, 365):
+            rollup_ms, statements, recompute_ms = time_dashboards(business_id, days)
+            print(f"{size:>8} {days:>5} {rollup_ms:>11.2f} {statements:>11.0f} {recompute_ms:>13.2f}")
+
+    if problems:
+        print("\n".join(problems), file=sys.stderr)
+        sys.exit(1)
+    print("rollups match a full recompute for every tenant")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Concurrent booking load test.
+
+Fires hundreds of simultaneous bookings at a handful of contested slots,
+then asserts that no two scheduled appointments overlap and reports the
+achieved bookings/sec. Exits non-zero on any double booking.
+
+Run from `ai_phone_system/` (SQLite temp file by default):
+
+    python -m Backend.benchmarks.booking_concurrency_bench --attempts 500 --workers 64
+    DATABASE_URL=postgresql://... python -m Backend.benchmarks.booking_concurrency_bench
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "booking_bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.appointment import Appointment  # noqa: E402
+from Backend.models.business import Business, BusinessHours  # noqa: E402,F401
+from Backend.models.service import Service  # noqa: E402,F401
+from Backend.services import booking_service  # noqa: E402
+
+DAY = datetime(2025, 1, 6, 9, 0)
+
+
+def attempt(business_id: str, start_time: datetime, duration_minutes: int) -> bool:
+    db = SessionLocal()
+    try:
+        booking_service.book_appointment(
+            db,
+            business_id=business_id,
+            customer_name="Load Test",
+            customer_phone="+15550000000",
+            start_time=start_time,
+            duration_minutes=duration_minutes,
+        )
+        return True
+    except booking_service.SlotUnavailableError:
+        return False
+    finally:
+        db.close()
+
+
+def count_overlaps(business_id: str) -> int:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Appointment.start_time, Appointment.end_time)
+            .filter(Appointment.business_id == business_id, Appointment.status == "scheduled")
+            .order_by(Appointment.start_time)
+            .all()
+        )
+    finally:
+        db.close()
+    return sum(1 for prev, cur in zip(rows, rows[1:]) if cur.start_time < prev.end_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--businesses", type=int, default=4)
+    parser.add_argument("--slots", type=int, default=40, help="distinct contested start times per business")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    businesses = [Business(name=f"Bench {i}") for i in range(args.businesses)]
+    db.add_all(businesses)
+    db.commit()
+    business_ids = [b.id for b in businesses]
+    db.close()
+
+    rng = random.Random(7)
+    jobs = [
+        (
+            rng.choice(business_ids),
+            DAY + timedelta(minutes=15 * rng.randrange(args.slots)),
+            rng.choice([15, 30, 45]),
+        )
+        for _ in range(args.attempts)
+    ]
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(lambda job: attempt(*job), jobs))
+    elapsed = time.perf_counter() - t0
+
+    booked = sum(results)
+    overlaps = sum(count_overlaps(b) for b in business_ids)
+
+    print(f"backend         {engine.dialect.name}")
+    print(f"attempts        {args.attempts} ({args.workers} workers)")
+    print(f"booked          {booked}")
+    print(f"rejected        {args.attempts - booked}")
+    print(f"overlaps        {overlaps}")
+    print(f"elapsed         {elapsed:.2f}s")
+    print(f"attempts/sec    {args.attempts / elapsed:.1f}")
+    print(f"bookings/sec    {booked / elapsed:.1f}")
+
+    if overlaps:
+        print("FAIL: double bookings detected", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Bulk import benchmark: CSV appointment import vs. one booking per row.
+
+Generates an onboarding CSV (a year of bookings, a few percent of them
+overlapping), imports it through `bulk_import.import_appointments`, and
+compares against `booking_service.book_appointment` for a sample of the
+same rows, extrapolated to the full file. Checks that the import left no
+overlapping scheduled appointments. Exits non-zero on any overlap.
+
+Run from `ai_phone_system/` (SQLite temp file by default):
+
+    python -m Backend.benchmarks.bulk_import_bench --rows 50000
+    python -m Backend.benchmarks.bulk_import_bench --rows 50000 --resources 4
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "bulk_import_bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.appointment import Appointment  # noqa: E402
+from Backend.models.business import Business  # noqa: E402
+from Backend.models.resource import Resource  # noqa: E402
+from Backend.models.service import Service  # noqa: E402
+from Backend.services import booking_service, bulk_import  # noqa: E402
+
+FIRST_DAY = datetime(2025, 1, 6, 8, 0)
+FIELDS = ["customer_name", "customer_phone", "start_time", "service", "status"]
+
+
+def make_csv(rows: int, seed: int = 17) -> bytes:
+    """Bookings on a 15-minute grid over a year; collisions become conflicts."""
+    rng = random.Random(seed)
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for i in range(rows):
+        start = FIRST_DAY + timedelta(days=rng.randrange(365), minutes=15 * rng.randrange(40))
+        writer.writerow({
+            "customer_name": f"Customer {i}",
+            "customer_phone": f"+1514{rng.randrange(10 ** 7):07d}",
+            "start_time": start.isoformat(timespec="minutes"),
+            "service": rng.choice(["Cut", "Colour"]),
+            "status": "completed" if start < FIRST_DAY + timedelta(days=30) else "scheduled",
+        })
+    return out.getvalue().encode()
+
+
+def new_business(db, resources: int) -> str:
+    business = Business(name="Import Bench", timezone="America/Toronto")
+    db.add(business)
+    db.flush()
+    db.add(Service(business_id=business.id, name="Cut", duration_minutes=30))
+    db.add(Service(business_id=business.id, name="Colour", duration_minutes=15))
+    for n in range(resources):
+        db.add(Resource(business_id=business.id, name=f"Staff {n}"))
+    db.commit()
+    return business.id
+
+
+def count_overlaps(db, business_id: str) -> int:
+    rows = (
+        db.query(Appointment.start_time, Appointment.end_time, Appointment.resource_id)
+        .filter(Appointment.business_id == business_id, Appointment.status == "scheduled")
+        .order_by(Appointment.resource_id, Appointment.start_time)
+        .all()
+    )
+    overlaps = 0
+    for prev, cur in zip(rows, rows[1:]):
+        if prev.resource_id == cur.resource_id and cur.start_time < prev.end_time:
+            overlaps += 1
+    return overlaps
+
+
+def per_row(db, business_id: str, rows, durations) -> float:
+    t0 = time.perf_counter()
+    for row in rows:
+        try:
+            booking_service.book_appointment(
+                db,
+                business_id=business_id,
+                customer_name=row["customer_name"],
+                customer_phone=row["customer_phone"],
+                start_time=datetime.fromisoformat(row["start_time"]),
+                duration_minutes=durations[row["service"]],
+            )
+        except booking_service.SlotUnavailableError:
+            pass
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--resources", type=int, default=0)
+    parser.add_argument("--sample", type=int, default=500, help="rows booked one by one for comparison")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    body = make_csv(args.rows)
+
+    business_id = new_business(db, args.resources)
+    t0 = time.perf_counter()
+    rows = bulk_import.parse_rows(body, "text/csv")
+    parsed = time.perf_counter() - t0
+    summary = bulk_import.import_appointments(db, business_id, rows)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{args.rows} rows, {args.resources or 'no'} resources, chunks of {bulk_import.BULK_CHUNK_SIZE}")
+    print(f"bulk import: {elapsed:.2f} s ({parsed:.2f} s parsing), {args.rows / elapsed:,.0f} rows/s")
+    print(f"  {summary['counts']}")
+
+    sample_business = new_business(db, args.resources)
+    sample = rows[:args.sample]
+    per_row_elapsed = per_row(db, sample_business, sample, {"Cut": 30, "Colour": 15})
+    estimate = per_row_elapsed / len(sample) * args.rows
+    print(f"one booking per row: {len(sample)} rows in {per_row_elapsed:.2f} s, "
+          f"~{estimate:.0f} s for {args.rows} ({estimate / elapsed:.0f}x slower)")
+
+    overlaps = count_overlaps(db, business_id)
+    db.close()
+    if overlaps:
+        print(f"{overlaps} overlapping scheduled appointments after import", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Calendar sync benchmark against the local fake calendar server.
+
+Connects TENANTS businesses to fake calendars and runs the sync worker
+three times: the initial full sync, an incremental sync after a few
+percent of the events changed, and a sync with nothing changed (one 304
+per calendar). Reports requests, bytes and time per pass, then checks
+that the stored busy blocks match the server. Also shows an expired sync
+token falling back to a full sync. Exits non-zero on any mismatch.
+
+Run from `ai_phone_system/` (SQLite temp file by default):
+
+    python -m Backend.benchmarks.calendar_sync_bench --tenants 50 --events 300
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "calendar_sync_bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+from Backend.benchmarks.fake_calendar import FakeCalendarServer, seed  # noqa: E402
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.business import Business  # noqa: E402
+from Backend.models.calendar import CalendarConnection, ExternalBusyBlock  # noqa: E402
+from Backend.services.calender_service import CalendarSyncWorker, GoogleCalendarProvider  # noqa: E402
+
+
+def connect_tenants(tenants: int):
+    db = SessionLocal()
+    try:
+        for i in range(tenants):
+            business = Business(name=f"Calendar Tenant {i}", timezone="America/Toronto")
+            db.add(business)
+            db.flush()
+            db.add(CalendarConnection(business_id=business.id, provider="fake", calendar_id=f"cal-{i}",
+                                      access_token="fake-token"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def mutate(store, tenants: int, events: int, share: float, seed_value: int = 81):
+    """Moves, deletes and adds about `share` of the events."""
+    rng = random.Random(seed_value)
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+    for c in range(tenants):
+        for e in rng.sample(range(events), max(1, int(events * share))):
+            action = rng.random()
+            if action < 0.4:
+                store.delete_event(f"cal-{c}", f"evt-{c}-{e}")
+            else:
+                start = now + timedelta(days=rng.randrange(30), minutes=15 * rng.randrange(96))
+                store.put_event(f"cal-{c}", f"evt-{c}-{e}", start, start + timedelta(minutes=45))
+
+
+def mismatches(store) -> int:
+    db = SessionLocal()
+    try:
+        stored = {}
+        for calendar_id, external_id, start, end in db.query(
+            CalendarConnection.calendar_id, ExternalBusyBlock.external_id,
+            ExternalBusyBlock.start_time, ExternalBusyBlock.end_time,
+        ).join(CalendarConnection, CalendarConnection.id == ExternalBusyBlock.connection_id):
+            stored.setdefault(calendar_id, {})[external_id] = (start.isoformat() + "Z", end.isoformat() + "Z")
+    finally:
+        db.close()
+
+    bad = 0
+    horizon = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    for calendar_id in store.calendars:
+        expected = {k: v for k, v in store.busy(calendar_id).items() if v[1] > horizon}
+        if stored.get(calendar_id, {}) != expected:
+            bad += 1
+    return bad
+
+
+async def timed_pass(label: str, worker: CalendarSyncWorker, server: FakeCalendarServer):
+    requests, sent, changes = server.requests, server.bytes_sent, worker.changes
+    t0 = time.perf_counter()
+    await worker.sync_due()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<14} {elapsed * 1000:>9.0f} ms {server.requests - requests:>9} "
+          f"{(server.bytes_sent - sent) / 1024:>10.0f} KiB {worker.changes - changes:>9}")
+
+
+async def run(args) -> int:
+    server = FakeCalendarServer(rate_limit_every=args.throttle_every)
+    url = server.start()
+    seed(server.store, args.tenants, args.events)
+
+    # interval 0: every connection is due on every pass
+    worker = CalendarSyncWorker(
+        interval_seconds=0,
+        concurrency=args.concurrency,
+        rate_per_second=args.rate,
+        providers={"fake": GoogleCalendarProvider(url, name="fake")},
+    )
+    print(f"{args.tenants} calendars x {args.events} events, concurrency {args.concurrency}, "
+          f"{args.rate:.0f} req/s")
+    print(f"{'pass':<14} {'time':>12} {'requests':>9} {'sent':>14} {'changes':>9}")
+    try:
+        await timed_pass("full", worker, server)
+        mutate(server.store, args.tenants, args.events, args.change_share)
+        await timed_pass("incremental", worker, server)
+        await timed_pass("unchanged", worker, server)
+
+        server.store.expire_tokens("cal-0")
+        mutate(server.store, 1, args.events, args.change_share, seed_value=82)
+        await timed_pass("token expired", worker, server)
+    finally:
+        await worker.stop()
+        server.stop()
+
+    print(f"worker: {worker.stats()}")
+    return mismatches(server.store)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--events", type=int, default=300)
+    parser.add_argument("--change-share", type=float, default=0.03)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=200.0, help="requests per second to the provider")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every Nth request with 429")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    connect_tenants(args.tenants)
+    bad = asyncio.run(run(args))
+    if bad:
+        print(f"{bad} calendars differ from the server after sync", file=sys.stderr)
+        sys.exit(1)
+    print("stored busy blocks match the server")
+
+
+if __name__ == "__main__":
+    main()
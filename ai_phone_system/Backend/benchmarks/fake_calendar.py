@@ -0,0 +1,224 @@
+"""
+Local fake of the Google Calendar events.list API, for offline sync runs.
+
+Serves `GET /calendars/{id}/events` with the parts of Google's protocol
+the sync worker relies on: full listing with `timeMin`/`timeMax`,
+`pageToken` pagination, `syncToken` incremental listing (deleted events
+come back with status "cancelled"), a list ETag honoured through
+`If-None-Match` (304), 410 for expired sync tokens, 401 without a bearer
+token, and optional 429s with Retry-After. Stdlib only.
+
+Run from `ai_phone_system/` and point the "fake" provider at it:
+
+    python -m Backend.benchmarks.fake_calendar --port 8765 --calendars 20 --events 300
+    FAKE_CALENDAR_URL=http://127.0.0.1:8765 uvicorn Backend.main_ai:app
+"""
+import argparse
+import json
+import random
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 250
+
+
+class FakeCalendarStore:
+    """
+    Events per calendar, each stamped with the sequence number of its last
+    change. A sync token is the sequence number the client has seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seq = 0
+        self.calendars = {}  # calendar id -> {event id: event}
+        self.expired_before = {}  # calendar id -> oldest sync token still accepted
+
+    def put_event(self, calendar_id: str, event_id: str, start: datetime, end: datetime, transparent=False):
+        with self._lock:
+            self.seq += 1
+            self.calendars.setdefault(calendar_id, {})[event_id] = {
+                "id": event_id,
+                "status": "confirmed",
+                "start": {"dateTime": start.isoformat() + "Z"},
+                "end": {"dateTime": end.isoformat() + "Z"},
+                "transparency": "transparent" if transparent else "opaque",
+                "seq": self.seq,
+                "_start": start,
+                "_end": end,
+            }
+
+    def delete_event(self, calendar_id: str, event_id: str):
+        with self._lock:
+            event = self.calendars.get(calendar_id, {}).get(event_id)
+            if event is not None:
+                self.seq += 1
+                event.update(status="cancelled", seq=self.seq)
+
+    def expire_tokens(self, calendar_id: str):
+        """The next incremental request for this calendar gets a 410."""
+        with self._lock:
+            self.expired_before[calendar_id] = self.seq + 1
+
+    def busy(self, calendar_id: str):
+        """{event id: (start, end)} of opaque, live events: what sync should store."""
+        with self._lock:
+            events = list(self.calendars.get(calendar_id, {}).values())
+        return {
+            e["id"]: (e["start"]["dateTime"], e["end"]["dateTime"])
+            for e in events
+            if e["status"] != "cancelled" and e["transparency"] != "transparent"
+        }
+
+    def listing(self, calendar_id: str, since: int | None, time_min=None, time_max=None):
+        """(events to return, current sequence) for a full or incremental list."""
+        with self._lock:
+            events = sorted(self.calendars.get(calendar_id, {}).values(), key=lambda e: e["seq"])
+            seq = self.seq
+        if since is None:
+            events = [
+                e for e in events
+                if e["status"] != "cancelled"
+                and (time_min is None or e["_end"] > time_min)
+                and (time_max is None or e["_start"] < time_max)
+            ]
+        else:
+            events = [e for e in events if e["seq"] > since]
+        return events, seq
+
+    def etag(self, calendar_id: str) -> str:
+        with self._lock:
+            events = self.calendars.get(calendar_id, {})
+            return '"%d"' % max((e["seq"] for e in events.values()), default=0)
+
+
+def _parse_time(value: str | None):
+    """Naive UTC of an RFC 3339 query parameter."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+class FakeCalendarServer:
+    def __init__(self, store: FakeCalendarStore | None = None, host: str = "127.0.0.1", port: int = 0,
+                 rate_limit_every: int = 0):
+        self.store = store or FakeCalendarStore()
+        self.rate_limit_every = rate_limit_every  # answer every Nth request with a 429
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    throttled = server.rate_limit_every and server.requests % server.rate_limit_every == 0
+                if throttled:
+                    return self._send(429, {"error": "rateLimitExceeded"}, {"Retry-After": "0.05"})
+                if not self.headers.get("Authorization", "").startswith("Bearer "):
+                    return self._send(401, {"error": "unauthorized"})
+
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/")
+                if len(parts) != 3 or parts[0] != "calendars" or parts[2] != "events":
+                    return self._send(404, {"error": "notFound"})
+                calendar_id = parts[1]
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                store = server.store
+
+                since = int(query["syncToken"]) if "syncToken" in query else None
+                if since is not None and since < store.expired_before.get(calendar_id, 0):
+                    return self._send(410, {"error": "fullSyncRequired"})
+
+                etag = store.etag(calendar_id)
+                if since is not None and "pageToken" not in query and self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    return self._send(304, None, {"ETag": etag})
+
+                # page tokens pin the listing to the sequence of its first page
+                offset, pinned = 0, None
+                if "pageToken" in query:
+                    offset, pinned = map(int, query["pageToken"].split(":"))
+                events, seq = store.listing(
+                    calendar_id, since, _parse_time(query.get("timeMin")), _parse_time(query.get("timeMax"))
+                )
+                seq = pinned if pinned is not None else seq
+                events = [e for e in events if e["seq"] <= seq]
+                page_size = min(int(query.get("maxResults", PAGE_SIZE)), PAGE_SIZE)
+                page = events[offset:offset + page_size]
+
+                body = {"items": [{k: v for k, v in e.items() if k != "seq" and k[0] != "_"} for e in page]}
+                if offset + page_size < len(events):
+                    body["nextPageToken"] = f"{offset + page_size}:{seq}"
+                else:
+                    body["nextSyncToken"] = str(seq)
+                self._send(200, body, {"ETag": etag})
+
+            def _send(self, status, body, headers=None):
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if body is not None:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with server._lock:
+                    server.bytes_sent += len(payload)
+
+        return Handler
+
+
+def seed(store: FakeCalendarStore, calendars: int, events: int, seed_value: int = 18):
+    """Busy events over the next few weeks, on a 15-minute grid."""
+    rng = random.Random(seed_value)
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    for c in range(calendars):
+        for e in range(events):
+            start = today + timedelta(days=rng.randrange(30), minutes=15 * rng.randrange(8 * 4, 20 * 4))
+            store.put_event(f"cal-{c}", f"evt-{c}-{e}", start, start + timedelta(minutes=rng.choice((30, 60, 90))),
+                            transparent=rng.random() < 0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--calendars", type=int, default=10)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    server = FakeCalendarServer(port=args.port)
+    seed(server.store, args.calendars, args.events)
+    print(f"fake calendar on {server.url}: calendars cal-0..cal-{args.calendars - 1}")
+    server._server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
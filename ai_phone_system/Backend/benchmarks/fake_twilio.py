@@ -0,0 +1,145 @@
+"""
+Local fake of Twilio's Messages API, for offline reminder runs.
+
+Serves `POST /2010-04-01/Accounts/{sid}/Messages.json` with the parts of
+Twilio's behaviour the SMS client relies on: HTTP basic auth (401, code
+20003), 400 / code 21211 for numbers that are not E.164, 201 with a
+message SID, and a per-account rate limit answered with 429 / code 20429
+and Retry-After. Can also fail every Nth request with a 500. Records
+every accepted message with the time it arrived. Stdlib only.
+
+Run from `ai_phone_system/` and point the client at it:
+
+    python -m Backend.benchmarks.fake_twilio --port 8766 --rate 30
+    TWILIO_API_URL=http://127.0.0.1:8766 TWILIO_ACCOUNT_SID=ACfake TWILIO_AUTH_TOKEN=secret \\
+        TWILIO_FROM_NUMBER=+15550000000 uvicorn Backend.main_ai:app
+"""
+import argparse
+import base64
+import json
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+E164 = re.compile(r"^\+[1-9]\d{6,14}$")
+
+
+class FakeTwilioServer:
+    def __init__(self, account_sid: str = "ACfake", auth_token: str = "secret", host: str = "127.0.0.1",
+                 port: int = 0, rate_per_second: float = 0, fail_every: int = 0):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.rate_per_second = rate_per_second  # 0: unlimited
+        self.fail_every = fail_every  # answer every Nth request with a 500
+        self.requests = 0
+        self.throttled = 0
+        self.messages = []  # (to, body, received at monotonic)
+        self._window = deque()  # accept times within the last second
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def peak_per_second(self) -> int:
+        """Most messages accepted in any one-second window."""
+        times = sorted(received for _, _, received in self.messages)
+        peak, first = 0, 0
+        for last, received in enumerate(times):
+            while received - times[first] >= 1.0:
+                first += 1
+            peak = max(peak, last - first + 1)
+        return peak
+
+    def _admit(self, now: float) -> bool:
+        if not self.rate_per_second:
+            return True
+        while self._window and now - self._window[0] >= 1.0:
+            self._window.popleft()
+        if len(self._window) >= self.rate_per_second:
+            return False
+        self._window.append(now)
+        return True
+
+    def _handler(self):
+        server = self
+        expected_auth = "Basic " + base64.b64encode(f"{self.account_sid}:{self.auth_token}".encode()).decode()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like api.twilio.com
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+                now = time.monotonic()
+                with server._lock:
+                    server.requests += 1
+                    failed = server.fail_every and server.requests % server.fail_every == 0
+                    admitted = not failed and server._admit(now)
+                    if not failed and not admitted:
+                        server.throttled += 1
+
+                if self.path != f"/2010-04-01/Accounts/{server.account_sid}/Messages.json":
+                    return self._send(404, {"code": 20404, "message": "The requested resource was not found"})
+                if self.headers.get("Authorization") != expected_auth:
+                    return self._send(401, {"code": 20003, "message": "Authenticate"})
+                if failed:
+                    return self._send(500, {"code": 20500, "message": "Internal Server Error"})
+                if not admitted:
+                    return self._send(429, {"code": 20429, "message": "Too Many Requests"}, {"Retry-After": "1"})
+                to = form.get("To", "")
+                if not E164.match(to):
+                    return self._send(400, {"code": 21211, "message": f"'To' number {to} is not a valid phone number"})
+                if not form.get("Body") or not (form.get("From") or form.get("MessagingServiceSid")):
+                    return self._send(400, {"code": 21602, "message": "Message body is required."})
+
+                with server._lock:
+                    server.messages.append((to, form["Body"], now))
+                    sid = "SM%032x" % len(server.messages)
+                self._send(201, {"sid": sid, "status": "queued", "to": to, "body": form["Body"]})
+
+            def _send(self, status, body, headers=None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--rate", type=float, default=0, help="messages per second before 429s (0: unlimited)")
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeTwilioServer(port=args.port, rate_per_second=args.rate, fail_every=args.fail_every)
+    print(f"fake Twilio on {server.url}: account ACfake, token secret")
+    server._server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Cold-start check: what a new worker pays before it can serve a call.
+
+Imports `Backend.main_ai` and builds the app with `create_app()` in fresh
+interpreters under `python -X importtime`, with no DATABASE_URL set.
+Asserts that:
+- import + create_app() stay within `--budget` ms (median of `--runs`);
+- nothing touches the database: no engine is created, no DDL is run;
+- heavy or optional modules (NumPy, PyJWT, httpx, Alembic, DB drivers,
+  Redis) are not imported until a request needs them.
+
+Then migrates a throwaway SQLite database and times startup to ready
+(interpreter start to the end of the lifespan's startup), next to what
+the old import-time `create_all` cost on an up-to-date schema. Prints
+the slowest project modules. Exits non-zero on any failure.
+
+Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.import_time_check
+    python -m Backend.benchmarks.import_time_check --budget 1200 --runs 5
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Loaded lazily by the code that needs them; none may be imported by starting the app
+DEFERRED_MODULES = ("numpy", "jwt", "httpx", "alembic", "redis", "asyncpg", "aiosqlite", "psycopg2")
+
+IMPORT_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import Backend.main_ai as main_ai
+imported = time.perf_counter()
+app = main_ai.create_app()
+built = time.perf_counter()
+from Backend import database
+print(json.dumps({
+    "import_ms": (imported - t0) * 1000,
+    "create_app_ms": (built - imported) * 1000,
+    "engine_created": database._engine is not None or database._async_engine is not None,
+    "deferred_loaded": sorted(set(sys.argv[1:]) & set(sys.modules)),
+}))
+"""
+
+STARTUP_PROBE = """
+import asyncio, json, time
+t0 = time.perf_counter()
+from Backend.main_ai import create_app
+app = create_app()
+
+async def start():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(start())
+from Backend.database import Base, get_engine
+t1 = time.perf_counter()
+Base.metadata.create_all(bind=get_engine())
+print(json.dumps({"ready_ms": (ready - t0) * 1000, "create_all_ms": (time.perf_counter() - t1) * 1000}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def probe_env(**overrides) -> dict:
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    env.update(CALENDAR_SYNC_ENABLED="false", REMINDERS_ENABLED="false", PYTHONWARNINGS="ignore")
+    env.update(overrides)
+    return env
+
+
+def run_probe(code: str, env: dict, *args, importtime: bool = False):
+    """(JSON the probe printed, `-X importtime` lines)."""
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", code, *args]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr[-2000:], file=sys.stderr)
+        sys.exit(f"probe failed with exit code {result.returncode}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr.splitlines()
+
+
+def slowest_modules(lines, prefix: str = "Backend.", limit: int = 8):
+    """[(cumulative ms, self ms, module)] of project modules, slowest first."""
+    rows = []
+    for line in lines:
+        match = IMPORTTIME_LINE.match(line)
+        if match and match.group(4).startswith(prefix):
+            rows.append((int(match.group(2)) / 1000, int(match.group(1)) / 1000, match.group(4)))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=1500.0, help="ms for import + create_app() (median)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    env = probe_env()
+    results, lines = [], []
+    for _ in range(args.runs):
+        result, lines = run_probe(IMPORT_PROBE, env, *DEFERRED_MODULES, importtime=True)
+        results.append(result)
+
+    import_ms = statistics.median(r["import_ms"] for r in results)
+    create_ms = statistics.median(r["create_app_ms"] for r in results)
+    total_ms = statistics.median(r["import_ms"] + r["create_app_ms"] for r in results)
+    print(f"import Backend.main_ai {import_ms:.0f} ms + create_app() {create_ms:.0f} ms = {total_ms:.0f} ms, "
+          f"budget {args.budget:g} ms (median of {args.runs})")
+    print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+    for cumulative, own, module in slowest_modules(lines):
+        print(f"{cumulative:>13.1f} {own:>8.1f}  {module}")
+
+    # startup against a migrated database, as a deploy runs it
+    db_file = os.path.join(tempfile.mkdtemp(), "import_time.db")
+    startup_env = probe_env(DATABASE_URL=f"sqlite:///{db_file}")
+    migrate = subprocess.run([sys.executable, "-c", "from Backend.database import upgrade_schema; upgrade_schema()"],
+                             env=startup_env, capture_output=True, text=True)
+    if migrate.returncode != 0:
+        print(migrate.stderr[-2000:], file=sys.stderr)
+        sys.exit("alembic upgrade head failed")
+    startup, _ = run_probe(STARTUP_PROBE, startup_env)
+    print(f"startup to ready: {startup['ready_ms']:.0f} ms; create_all on the migrated schema "
+          f"(what every worker paid at import before): {startup['create_all_ms']:.1f} ms on SQLite, "
+          "one round-trip per table on a remote database")
+
+    problems = []
+    if total_ms > args.budget:
+        problems.append(f"import + create_app() took {total_ms:.0f} ms, over the {args.budget:g} ms budget")
+    if any(r["engine_created"] for r in results):
+        problems.append("importing or building the app created a database engine")
+    loaded = sorted({module for r in results for module in r["deferred_loaded"]})
+    if loaded:
+        problems.append(f"imported at startup instead of on first use: {', '.join(loaded)}")
+    if problems:
+        print("; ".join(problems), file=sys.stderr)
+        sys.exit(1)
+    print("cold start within budget: no engine, no DDL, no deferred modules loaded")
+
+
+if __name__ == "__main__":
+    main()
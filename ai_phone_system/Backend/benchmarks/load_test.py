@@ -0,0 +1,336 @@
+"""
+Load test: the real app, in-process, under a mixed booking workload.
+
+Seeds tenants with `Backend.benchmarks.seed`, then drives `main_ai.app`
+(lifespan included) over httpx's ASGI transport with `--concurrency`
+clients. Each client loops over a weighted mix of availability lookups,
+bookings, cancellations and appointment listings for random tenants.
+Requests during `--warmup` are not measured.
+
+Reports throughput and p50 / p95 / p99 per endpoint, plus the database
+queries per request recorded by the timing middleware. `--out` writes
+the results as JSON (with the git commit and settings) and `--compare`
+prints the change against an earlier results file.
+
+Run from `ai_phone_system/` (SQLite temp file by default):
+
+    python -m Backend.benchmarks.load_test --tenants 20 --concurrency 50 --seconds 20 --out before.json
+    python -m Backend.benchmarks.load_test --tenants 20 --concurrency 50 --seconds 20 --compare before.json
+
+A 409 from booking is a lost race for the slot, counted as a conflict
+rather than an error.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "load_test.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+os.environ.setdefault("CALENDAR_SYNC_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from Backend.benchmarks.seed import GRID_MINUTES, add_arguments, config_from_args, seed  # noqa: E402
+from Backend.database import engine, upgrade_schema  # noqa: E402
+from Backend.main_ai import app  # noqa: E402
+from Backend.utils.instrumentation import request_queries  # noqa: E402
+
+DEFAULT_MIX = "availability=60,list=20,book=15,cancel=5"
+ROUTE_NAMES = {
+    "availability": "get_availability",
+    "list": "list_appointments",
+    "book": "book_appointment",
+    "cancel": "cancel_appointment",
+}
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTE_NAMES:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}; expected {', '.join(ROUTE_NAMES)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def git_commit():
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=here, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain"], cwd=here, capture_output=True,
+                                    text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+# ---------------------------------------------------------
+# WORKLOAD
+# ---------------------------------------------------------
+class Workload:
+    """Builds one request per operation for a tenant; None when there is nothing to do."""
+
+    def __init__(self, future_days: int, rng: random.Random):
+        self.future_days = max(1, future_days)
+        self.rng = rng
+        self.paths = {op: app.url_path_for(name) for op, name in ROUTE_NAMES.items()}
+        self.today = datetime.utcnow().date()
+
+    def _open_day(self, tenant):
+        while True:
+            day = self.today + timedelta(days=self.rng.randrange(1, self.future_days + 1))
+            if day.weekday() in tenant.open_days:
+                return day
+
+    def availability(self, tenant):
+        params = {
+            "date": self._open_day(tenant).isoformat(),
+            "service_id": self.rng.choice(list(tenant.services)),
+        }
+        return "GET", self.paths["availability"], params, {"Authorization": f"Bearer {tenant.token}"}
+
+    def list(self, tenant):
+        params = {
+            "business_id": tenant.business_id,
+            "date_from": self.today.isoformat(),
+            "date_to": (self.today + timedelta(days=7)).isoformat(),
+            "limit": 50,
+        }
+        return "GET", self.paths["list"], params, None
+
+    def book(self, tenant):
+        service_id = self.rng.choice(list(tenant.services))
+        minutes = tenant.services[service_id]
+        slots = (tenant.close_hour - tenant.open_hour) * 60 // GRID_MINUTES - minutes // GRID_MINUTES
+        start = datetime.combine(self._open_day(tenant), datetime.min.time()) + timedelta(
+            hours=tenant.open_hour, minutes=GRID_MINUTES * self.rng.randrange(max(1, slots + 1))
+        )
+        params = {
+            "business_id": tenant.business_id,
+            "customer_name": f"Load {self.rng.randrange(10 ** 6)}",
+            "customer_phone": f"+1438{self.rng.randrange(10 ** 7):07d}",
+            "start_time": start.isoformat(timespec="minutes"),  # business-local wall time
+            "duration_minutes": minutes,
+            "service_id": service_id,
+        }
+        return "POST", self.paths["book"], params, None
+
+    def cancel(self, tenant):
+        if not tenant.upcoming:
+            return None
+        appointment_id = tenant.upcoming.pop(self.rng.randrange(len(tenant.upcoming)))
+        return "POST", self.paths["cancel"], {"appointment_id": appointment_id}, None
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {op: [] for op in ROUTE_NAMES}
+        self.ok = dict.fromkeys(ROUTE_NAMES, 0)
+        self.conflicts = dict.fromkeys(ROUTE_NAMES, 0)
+        self.errors = dict.fromkeys(ROUTE_NAMES, 0)
+        self.error_samples = []
+
+    def record(self, op: str, status: int, seconds: float, body: str):
+        self.latencies[op].append(seconds)
+        if status < 400:
+            self.ok[op] += 1
+        elif op == "book" and status == 409:
+            self.conflicts[op] += 1
+        else:
+            self.errors[op] += 1
+            if len(self.error_samples) < 5:
+                self.error_samples.append(f"{op} {status}: {body[:200]}")
+
+
+async def drive(args, tenants) -> tuple:
+    mix = args.mix
+    ops, weights = list(mix), list(mix.values())
+    recorder = Recorder()
+    measuring = False
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+
+            async def worker(n):
+                rng = random.Random(args.seed * 1000 + n)
+                workload = Workload(args.future_days, rng)
+                while not stop.is_set():
+                    op = rng.choices(ops, weights)[0]
+                    tenant = rng.choice(tenants)
+                    request = getattr(workload, op)(tenant)
+                    if request is None:
+                        await asyncio.sleep(0)
+                        continue
+                    method, path, params, headers = request
+                    t0 = time.perf_counter()
+                    response = await client.request(method, path, params=params, headers=headers)
+                    elapsed = time.perf_counter() - t0
+                    if measuring:
+                        recorder.record(op, response.status_code, elapsed, response.text)
+                    if op == "book" and response.status_code == 200:
+                        tenant.upcoming.append(response.json()["appointment_id"])
+
+            stop = asyncio.Event()
+            tasks = [asyncio.create_task(worker(n)) for n in range(args.concurrency)]
+            await asyncio.sleep(args.warmup)
+            measuring = True
+            queries_before = request_queries.snapshot()
+            t0 = time.perf_counter()
+            await asyncio.sleep(args.seconds)
+            measuring = False
+            elapsed = time.perf_counter() - t0
+            stop.set()
+            await asyncio.gather(*tasks)
+
+    return recorder, elapsed, queries_before, request_queries.snapshot()
+
+
+# ---------------------------------------------------------
+# RESULTS
+# ---------------------------------------------------------
+def queries_per_request(before, after) -> dict:
+    """Mean queries per request for each (method, route), over the measured window."""
+    result = {}
+    for (method, route), series in after.items():
+        previous = before.get((method, route), {"count": 0, "sum": 0.0})
+        count = series["count"] - previous["count"]
+        if count:
+            result[f"{method} {route}"] = round((series["sum"] - previous["sum"]) / count, 2)
+    return result
+
+
+def summarize(args, recorder: Recorder, elapsed: float, queries: dict) -> dict:
+    endpoints = {}
+    for op in ROUTE_NAMES:
+        latencies = recorder.latencies[op]
+        if not latencies:
+            continue
+        endpoints[op] = {
+            "requests": len(latencies),
+            "ok": recorder.ok[op],
+            "conflicts": recorder.conflicts[op],
+            "errors": recorder.errors[op],
+            "throughput_rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+            "max_ms": round(max(latencies) * 1000, 2),
+        }
+
+    all_latencies = [s for op in ROUTE_NAMES for s in recorder.latencies[op]]
+    commit, dirty = git_commit()
+    settings = {k: v for k, v in vars(args).items() if k not in ("out", "compare")}
+    return {
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "settings": settings,
+        },
+        "total": {
+            "requests": len(all_latencies),
+            "errors": sum(recorder.errors.values()),
+            "seconds": round(elapsed, 2),
+            "throughput_rps": round(len(all_latencies) / elapsed, 1),
+            "p50_ms": round(percentile(all_latencies, 50) * 1000, 2) if all_latencies else None,
+            "p95_ms": round(percentile(all_latencies, 95) * 1000, 2) if all_latencies else None,
+            "p99_ms": round(percentile(all_latencies, 99) * 1000, 2) if all_latencies else None,
+        },
+        "endpoints": endpoints,
+        "db_queries_per_request": queries,
+    }
+
+
+def print_results(results: dict):
+    print(f"{'endpoint':<13} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'409':>6} {'errors':>7}")
+    for op, row in results["endpoints"].items():
+        print(f"{op:<13} {row['requests']:>7} {row['throughput_rps']:>8.1f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['conflicts']:>6} {row['errors']:>7}")
+    total = results["total"]
+    if total["requests"]:
+        print(f"{'total':<13} {total['requests']:>7} {total['throughput_rps']:>8.1f} {total['p50_ms']:>8.1f} "
+              f"{total['p95_ms']:>8.1f} {total['p99_ms']:>8.1f} {'':>6} {total['errors']:>7}")
+    print("db queries per request:")
+    for route, mean in sorted(results["db_queries_per_request"].items()):
+        print(f"  {route:<40} {mean:>6.2f}")
+
+
+def print_comparison(results: dict, baseline: dict):
+    meta = baseline.get("meta", {})
+    print(f"vs {meta.get('commit') or 'baseline'} ({meta.get('started_at', '?')}):")
+    print(f"{'endpoint':<13} {'req/s':>16} {'p95 ms':>16} {'p99 ms':>16}")
+
+    def delta(new, old):
+        if not old:
+            return f"{new:>8.1f}        "
+        return f"{new:>8.1f} {(new - old) / old * 100:>+6.1f}%"
+
+    rows = dict(results["endpoints"], total=results["total"])
+    old_rows = dict(baseline.get("endpoints", {}), total=baseline.get("total", {}))
+    for op, row in rows.items():
+        old = old_rows.get(op)
+        if not old or not row.get("requests"):
+            continue
+        print(f"{op:<13} {delta(row['throughput_rps'], old.get('throughput_rps'))} "
+              f"{delta(row['p95_ms'], old.get('p95_ms'))} {delta(row['p99_ms'], old.get('p99_ms'))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--seconds", type=float, default=20.0, help="measured duration")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="results JSON of an earlier run to compare against")
+    args = parser.parse_args()
+
+    upgrade_schema()  # the app no longer creates tables; migrations do
+    t0 = time.perf_counter()
+    tenants = seed(config_from_args(args))
+    upcoming = sum(len(t.upcoming) for t in tenants)
+    print(f"seeded {len(tenants)} tenants ({upcoming} upcoming appointments) in {time.perf_counter() - t0:.1f}s; "
+          f"{args.concurrency} clients for {args.seconds:g}s on {engine.dialect.name}")
+
+    recorder, elapsed, before, after = asyncio.run(drive(args, tenants))
+    results = summarize(args, recorder, elapsed, queries_per_request(before, after))
+    print_results(results)
+    for sample in recorder.error_samples:
+        print(f"  {sample}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Load test for the Twilio Media Streams WebSocket handler.
+
+Replays a call's frame stream (a recording, or a synthesised call with
+speech bursts and line noise) into `twilio_media_stream` for N
+simultaneous calls, paced at the real 20 ms per frame. Each call runs
+through the route itself with an in-memory WebSocket. Reports process
+CPU per call, event-loop lag, utterances found by the VAD against the
+bursts in the audio, and dropped samples. With --echo every utterance
+is played back, which exercises resampling and μ-law encoding too.
+
+Also times μ-law decode + frame energy per 20 ms frame, in pure Python
+against the batched NumPy path.
+
+Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.media_stream_load --calls 200 --seconds 30
+    python -m Backend.benchmarks.media_stream_load --record /tmp/call.jsonl --seconds 60
+    python -m Backend.benchmarks.media_stream_load --recording /tmp/call.jsonl --calls 300 --echo
+
+A recording is one Twilio message (JSON) per line, as received on the socket.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import numpy as np  # noqa: E402
+from fastapi import WebSocketDisconnect  # noqa: E402
+
+from Backend.routes.twilio import twilio_media_stream  # noqa: E402
+from Backend.services.audio import TWILIO_FRAME_SAMPLES, TWILIO_SAMPLE_RATE, ULAW_DECODE, ulaw_encode  # noqa: E402
+from Backend.services.media_stream import MEDIA_BATCH_FRAMES, media_streams  # noqa: E402
+
+FRAME_SECONDS = TWILIO_FRAME_SAMPLES / TWILIO_SAMPLE_RATE
+
+
+# ---------------------------------------------------------
+# CALL AUDIO
+# ---------------------------------------------------------
+def synthesize(seconds: float, seed: int = 22):
+    """
+    (μ-law bytes, speech bursts) of a caller: voiced bursts of 0.8-2.5 s
+    (harmonics of a wandering pitch, syllable-rate envelope) separated by
+    0.6-1.5 s of line noise.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * TWILIO_SAMPLE_RATE)
+    audio = rng.normal(0, 12, total)  # about -68 dBFS line noise
+    bursts = 0
+    t = rng.uniform(0.3, 1.0)
+    while True:
+        length = rng.uniform(0.8, 2.5)
+        start, end = int(t * TWILIO_SAMPLE_RATE), int((t + length) * TWILIO_SAMPLE_RATE)
+        if end >= total:
+            break
+        n = np.arange(end - start) / TWILIO_SAMPLE_RATE
+        pitch = rng.uniform(100, 220) * (1 + 0.05 * np.sin(2 * np.pi * 0.7 * n))
+        phase = 2 * np.pi * np.cumsum(pitch) / TWILIO_SAMPLE_RATE
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(3, 5) * n) ** 2
+        audio[start:end] += 3000 * voiced * envelope
+        bursts += 1
+        t += length + rng.uniform(0.6, 1.5)
+    return ulaw_encode(np.clip(audio, -32768, 32767).astype(np.int16)), bursts
+
+
+def call_messages(payload: bytes):
+    """Twilio messages for one call (stream sid filled in per call)."""
+    messages = [{"event": "connected", "protocol": "Call", "version": "1.0.0"}, {
+        "event": "start",
+        "start": {
+            "streamSid": "{stream}",
+            "callSid": "CA-load",
+            "tracks": ["inbound"],
+            "customParameters": {"business_id": "load-test"},
+            "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": TWILIO_SAMPLE_RATE, "channels": 1},
+        },
+    }]
+    for chunk, i in enumerate(range(0, len(payload) - TWILIO_FRAME_SAMPLES + 1, TWILIO_FRAME_SAMPLES), start=1):
+        messages.append({
+            "event": "media",
+            "streamSid": "{stream}",
+            "media": {"track": "inbound", "chunk": str(chunk), "timestamp": str(int(chunk * 20)),
+                      "payload": base64.b64encode(payload[i:i + TWILIO_FRAME_SAMPLES]).decode()},
+        })
+    messages.append({"event": "stop", "streamSid": "{stream}", "stop": {"callSid": "CA-load"}})
+    return [json.dumps(m) for m in messages]
+
+
+def load_recording(path: str):
+    with open(path) as f:
+        messages = [line.strip() for line in f if line.strip()]
+    for i, line in enumerate(messages):
+        message = json.loads(line)
+        if message.get("event") == "start":
+            message["start"]["streamSid"] = "{stream}"
+            messages[i] = json.dumps(message)
+    return messages
+
+
+# ---------------------------------------------------------
+# IN-MEMORY WEBSOCKET
+# ---------------------------------------------------------
+class ReplaySocket:
+    """Feeds a recorded call to the route at 20 ms per media frame."""
+
+    def __init__(self, messages, stream_sid: str, realtime: bool, lags: list):
+        self.messages = [m.replace("{stream}", stream_sid) for m in messages]
+        self.realtime = realtime
+        self.lags = lags
+        self.sent = 0
+        self._index = 0
+        self._frame = 0
+        self._started = None
+
+    async def accept(self):
+        self._started = time.perf_counter()
+
+    async def receive_text(self):
+        if self._index >= len(self.messages):
+            raise WebSocketDisconnect(code=1000)
+        message = self.messages[self._index]
+        self._index += 1
+        if '"event": "media"' in message:
+            self._frame += 1
+            if self.realtime:
+                due = self._started + self._frame * FRAME_SECONDS
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.lags.append(max(0.0, time.perf_counter() - due))
+            elif self._frame % MEDIA_BATCH_FRAMES == 0:
+                await asyncio.sleep(0)
+        return message
+
+    async def send_text(self, message: str):
+        self.sent += 1
+
+
+async def echo(session, samples):
+    await session.play(samples)
+
+
+async def run_calls(messages, calls: int, realtime: bool, stagger: float):
+    lags = []
+    sockets = [ReplaySocket(messages, f"MZ{n:06d}", realtime, lags) for n in range(calls)]
+
+    async def one_call(n, socket):
+        await asyncio.sleep(stagger * n / max(1, calls))
+        await twilio_media_stream(socket)
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(one_call(n, s) for n, s in enumerate(sockets)))
+    return time.process_time() - cpu, time.perf_counter() - wall, lags, sum(s.sent for s in sockets)
+
+
+# ---------------------------------------------------------
+# PER-FRAME MICRO-BENCHMARK
+# ---------------------------------------------------------
+def python_frame(payload: bytes, table):
+    samples = [table[b] for b in payload]
+    rms = math.sqrt(sum(s * s for s in samples) / len(samples))
+    return 20 * math.log10(max(rms, 1.0) / 32768)
+
+
+def numpy_batch(payloads):
+    samples = ULAW_DECODE[np.frombuffer(b"".join(payloads), dtype=np.uint8)]
+    x = samples.reshape(len(payloads), TWILIO_FRAME_SAMPLES).astype(np.float32)
+    return 20 * np.log10(np.maximum(np.sqrt(np.mean(x * x, axis=1)), 1.0) / 32768)
+
+
+def frame_microbench(payload: bytes, frames: int = 5000):
+    chunks = [payload[i:i + TWILIO_FRAME_SAMPLES] for i in range(0, frames * TWILIO_FRAME_SAMPLES,
+                                                                 TWILIO_FRAME_SAMPLES)]
+    chunks = [c for c in chunks if len(c) == TWILIO_FRAME_SAMPLES]
+    table = ULAW_DECODE.tolist()
+    t0 = time.perf_counter()
+    for chunk in chunks:
+        python_frame(chunk, table)
+    python_us = (time.perf_counter() - t0) / len(chunks) * 1e6
+    t0 = time.perf_counter()
+    for i in range(0, len(chunks), MEDIA_BATCH_FRAMES):
+        numpy_batch(chunks[i:i + MEDIA_BATCH_FRAMES])
+    numpy_us = (time.perf_counter() - t0) / len(chunks) * 1e6
+    return python_us, numpy_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=20.0, help="length of the synthesised call")
+    parser.add_argument("--recording", help="replay this JSONL recording instead of synthesising")
+    parser.add_argument("--record", help="write the synthesised call as a JSONL recording and exit")
+    parser.add_argument("--echo", action="store_true", help="play every utterance back to the caller")
+    parser.add_argument("--fast", action="store_true", help="no 20 ms pacing: measure raw throughput")
+    parser.add_argument("--stagger", type=float, default=1.0, help="seconds over which calls connect")
+    args = parser.parse_args()
+
+    payload, bursts = synthesize(args.seconds)
+    if args.record:
+        with open(args.record, "w") as f:
+            f.write("\n".join(call_messages(payload)) + "\n")
+        print(f"wrote {args.record}: {args.seconds:g}s, {bursts} speech bursts")
+        return
+    messages = load_recording(args.recording) if args.recording else call_messages(payload)
+    frames = sum('"event": "media"' in m for m in messages)
+    audio_seconds = frames * FRAME_SECONDS
+
+    python_us, numpy_us = frame_microbench(payload)
+    print(f"decode + level per 20 ms frame: pure Python {python_us:.1f} us, "
+          f"NumPy batches of {MEDIA_BATCH_FRAMES} {numpy_us:.1f} us ({python_us / numpy_us:.0f}x)")
+
+    media_streams.on_utterance = echo if args.echo else None
+    cpu, wall, lags, sent = asyncio.run(run_calls(messages, args.calls, not args.fast, args.stagger))
+    stats = media_streams.stats()
+
+    cpu_per_audio_second = cpu / (args.calls * audio_seconds)
+    print(f"{args.calls} calls x {audio_seconds:.1f}s audio ({frames} frames each), "
+          f"{'as fast as possible' if args.fast else 'real-time pacing'}")
+    print(f"wall {wall:.1f}s, process CPU {cpu:.2f}s")
+    print(f"CPU per call: {cpu_per_audio_second * 1000:.2f} ms per audio second "
+          f"({cpu_per_audio_second * 100:.2f}% of a core) -> ~{1 / cpu_per_audio_second:.0f} calls per core")
+    print(f"inbound: {stats['frames'] / wall:,.0f} frames/s, batch work {stats['batch_seconds'] * 1000:.0f} ms "
+          f"total, {stats['dropped_samples']} samples dropped")
+    if lags:
+        lags.sort()
+        print(f"event-loop lag per frame: p50 {lags[len(lags) // 2] * 1000:.2f} ms, "
+              f"p99 {lags[int(len(lags) * 0.99)] * 1000:.2f} ms, max {lags[-1] * 1000:.2f} ms")
+    print(f"utterances: {stats['utterances']} ({stats['utterances'] / args.calls:.1f} per call"
+          + (f", {bursts} speech bursts in the audio)" if not args.recording else ")"))
+    if args.echo:
+        print(f"outbound messages: {sent}")
+
+    if not args.recording and stats["utterances"] != bursts * args.calls:
+        print(f"VAD found {stats['utterances']} utterances, expected {bursts * args.calls}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
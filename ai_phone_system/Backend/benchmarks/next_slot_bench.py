@@ -0,0 +1,149 @@
+"""
+"Next available slot" benchmark for tenants booked solid for weeks.
+
+Every tenant is fully booked (per resource) for its first `--booked-weeks`
+weeks, then has a few openings. Compares asking day by day
+(`get_available_slots` until N slots are found, what the agent did
+before) with `next_available_slots`, counting SQL statements with the
+query hooks. Checks that both return the same slots and that a tenant
+booked past the horizon gives up at the cap. Exits non-zero on any
+mismatch.
+
+Run from `ai_phone_system/` (SQLite temp file by default):
+
+    python -m Backend.benchmarks.next_slot_bench --tenants 20 --booked-weeks 6 --count 3
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, time as time_type, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "next_slot_bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.appointment import Appointment  # noqa: E402
+from Backend.models.business import Business, BusinessHours  # noqa: E402
+from Backend.models.resource import Resource  # noqa: E402
+from Backend.models.service import Service  # noqa: E402
+from Backend.services.availability_service import (  # noqa: E402
+    NEXT_SLOT_HORIZON_DAYS,
+    get_available_slots,
+    next_available_slots,
+)
+from Backend.services.timezones import get_zone, to_utc  # noqa: E402
+from Backend.utils.instrumentation import install_query_hooks, queries_total  # noqa: E402
+
+FIRST_DAY = datetime(2025, 3, 3)  # a Monday; Toronto springs forward on the 9th
+
+
+def seed(tenants: int, staff: int, booked_days: int, seed_value: int = 21):
+    """Hours Mon-Sat 9-17, every resource booked back to back for `booked_days`, then sparse."""
+    rng = random.Random(seed_value)
+    zone = get_zone("America/Toronto")
+    db = SessionLocal()
+    handles = []
+    try:
+        for n in range(tenants):
+            business = Business(name=f"Solid Tenant {n}", timezone="America/Toronto")
+            db.add(business)
+            db.flush()
+            db.add_all(BusinessHours(business_id=business.id, day_of_week=weekday,
+                                     open_time=time_type(9), close_time=time_type(17)) for weekday in range(6))
+            service = Service(business_id=business.id, name="Cut", duration_minutes=30)
+            db.add(service)
+            resources = [Resource(business_id=business.id, name=f"Staff {i}") for i in range(staff)]
+            db.add_all(resources)
+            db.flush()
+
+            rows = []
+            for offset in range(booked_days + 28):
+                day = FIRST_DAY + timedelta(days=offset)
+                booked_solid = offset < booked_days
+                for resource in resources or [None]:
+                    cursor = day.replace(hour=9)
+                    while cursor < day.replace(hour=17):
+                        if booked_solid or rng.random() < 0.7:
+                            start = to_utc(cursor, zone)
+                            rows.append({"business_id": business.id, "service_id": service.id,
+                                         "resource_id": resource.id if resource else None,
+                                         "start_time": start, "end_time": start + timedelta(minutes=60),
+                                         "status": "scheduled"})
+                        cursor += timedelta(minutes=60)
+            db.bulk_insert_mappings(Appointment, rows)
+            handles.append((business.id, service.id))
+        db.commit()
+    finally:
+        db.close()
+    return handles
+
+
+def day_by_day(db, business_id: str, service_id: str, count: int, horizon_days: int):
+    """The old way: one availability lookup per day until `count` slots."""
+    found = []
+    for offset in range(horizon_days):
+        day = FIRST_DAY + timedelta(days=offset)
+        for start, _ in get_available_slots(db, business_id, day, 30, service_id=service_id):
+            found.append((day.date().isoformat(), start))
+            if len(found) == count:
+                return found
+    return found
+
+
+def measure(label: str, fn, handles):
+    db = SessionLocal()
+    try:
+        queries = queries_total.snapshot().get((), 0)
+        t0 = time.perf_counter()
+        results = [fn(db, business_id, service_id) for business_id, service_id in handles]
+        elapsed = time.perf_counter() - t0
+        queries = queries_total.snapshot().get((), 0) - queries
+    finally:
+        db.close()
+    print(f"{label:<14} {elapsed / len(handles) * 1000:>10.2f} ms {queries / len(handles):>12.1f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--staff", type=int, default=2, help="resources per tenant (0: single resource)")
+    parser.add_argument("--booked-weeks", type=int, default=6)
+    parser.add_argument("--count", type=int, default=3)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    install_query_hooks()
+    handles = seed(args.tenants, args.staff, args.booked_weeks * 7)
+    horizon = NEXT_SLOT_HORIZON_DAYS
+
+    print(f"{args.tenants} tenants booked solid for {args.booked_weeks} weeks, first {args.count} slots")
+    print(f"{'method':<14} {'per tenant':>13} {'queries':>12}")
+    old = measure("day by day", lambda db, b, s: day_by_day(db, b, s, args.count, horizon), handles)
+    new = measure("next available", lambda db, b, s: next_available_slots(
+        db, b, s, args.count, after=FIRST_DAY, horizon_days=horizon), handles)
+
+    mismatches = sum(
+        expected != [(slot["date"], slot["start"]) for slot in result["slots"]]
+        for expected, result in zip(old, new)
+    )
+
+    # booked past the horizon: stops at the cap with nothing found
+    short = measure("capped search", lambda db, b, s: next_available_slots(
+        db, b, s, args.count, after=FIRST_DAY, horizon_days=args.booked_weeks * 7 - 1), handles[:1])
+    if short[0]["slots"] or short[0]["complete"]:
+        print(f"capped search found slots inside a fully booked horizon: {short[0]}", file=sys.stderr)
+        mismatches += 1
+
+    if mismatches:
+        print(f"{mismatches} tenants differ between the two methods", file=sys.stderr)
+        sys.exit(1)
+    print(f"first slot: {new[0]['slots'][0]['start_time'] if new[0]['slots'] else None}; results match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+EXPLAIN QUERY PLAN check for the availability, booking, call-routing, reminder and dashboard hot paths.
+
+Builds a throwaway SQLite database from the models, seeds it, and asserts
+that every hot query is answered with an index search instead of a full
+table scan. Exits non-zero on any regression.
+
+Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.query_plan_check
+"""
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, time, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "query_plan.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+from sqlalchemy import func, text  # noqa: E402
+from sqlalchemy.dialects import sqlite  # noqa: E402
+
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.analytics import DailyRollup, HourlyRollup  # noqa: E402
+from Backend.models.appointment import Appointment  # noqa: E402
+from Backend.models.business import Business, BusinessClosure, BusinessHours, BusinessPhoneNumber  # noqa: E402
+from Backend.models.calendar import ExternalBusyBlock  # noqa: E402
+from Backend.models.resource import Resource  # noqa: E402
+from Backend.models.service import Service  # noqa: E402
+from Backend.services.booking_service import _overlap_query  # noqa: E402
+from Backend.services.reminders import window_query  # noqa: E402
+
+NAMED = sqlite.dialect(paramstyle="named")
+DAY = datetime(2025, 1, 6)
+
+
+def seed(db, tenants=20, appointments_per_tenant=500):
+    rng = random.Random(3)
+    for i in range(tenants):
+        business = Business(name=f"Tenant {i}")
+        db.add(business)
+        db.flush()
+        db.add(BusinessPhoneNumber(business_id=business.id, number=f"+1514555{i:04d}", kind="primary"))
+        for weekday in range(7):
+            db.add(BusinessHours(business_id=business.id, day_of_week=weekday,
+                                 open_time=time(9), close_time=time(17)))
+        db.add(Service(business_id=business.id, name="Cut", duration_minutes=30))
+        staff = [Resource(business_id=business.id, name=f"Staff {n}") for n in range(3)]
+        db.add_all(staff)
+        db.flush()
+        for _ in range(appointments_per_tenant):
+            start = DAY + timedelta(days=rng.randrange(365), minutes=15 * rng.randrange(32))
+            db.add(Appointment(business_id=business.id, start_time=start,
+                               end_time=start + timedelta(minutes=30),
+                               resource_id=rng.choice(staff).id,
+                               status=rng.choice(["scheduled", "scheduled", "cancelled"])))
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+
+def plan(db, query):
+    compiled = query.statement.compile(dialect=NAMED, compile_kwargs={"render_postcompile": True})
+    rows = db.execute(text("EXPLAIN QUERY PLAN " + str(compiled)), compiled.params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    seed(db)
+
+    business_id = db.query(Business.id).first()[0]
+    service_id = db.query(Service.id).first()[0]
+    resource_id = db.query(Resource.id).filter(Resource.business_id == business_id).first()[0]
+    day_start, day_end = DAY, DAY + timedelta(days=1)
+
+    queries = {
+        "hours for one weekday": db.query(BusinessHours).filter(
+            BusinessHours.business_id == business_id,
+            BusinessHours.day_of_week == 0,
+        ),
+        "weekly hours": db.query(BusinessHours).filter(
+            BusinessHours.business_id == business_id,
+        ),
+        "schedule closures": db.query(BusinessClosure).filter(
+            BusinessClosure.business_id == business_id,
+            BusinessClosure.end_date >= DAY.date(),
+        ),
+        "service lookup": db.query(Service).filter(
+            Service.id == service_id,
+            Service.business_id == business_id,
+        ),
+        "services for range": db.query(Service).filter(
+            Service.business_id == business_id,
+            Service.id.in_([service_id]),
+        ),
+        "day appointments": db.query(Appointment).filter(
+            Appointment.business_id == business_id,
+            Appointment.status == "scheduled",
+            Appointment.start_time >= day_start,
+            Appointment.start_time <= day_end,
+        ),
+        "range appointments": db.query(Appointment.start_time, Appointment.end_time).filter(
+            Appointment.business_id == business_id,
+            Appointment.status == "scheduled",
+            Appointment.start_time < day_end + timedelta(days=6),
+            Appointment.end_time > day_start,
+        ),
+        "external busy blocks": db.query(ExternalBusyBlock.start_time, ExternalBusyBlock.end_time).filter(
+            ExternalBusyBlock.business_id == business_id,
+            ExternalBusyBlock.start_time < day_end,
+            ExternalBusyBlock.end_time > day_start,
+        ),
+        "inbound number routing": db.query(BusinessPhoneNumber.business_id).filter(
+            BusinessPhoneNumber.number == "+15145550007",
+        ),
+        "booking conflict": _overlap_query(db, business_id, day_start, day_start + timedelta(minutes=30)),
+        "resource day load": db.query(Appointment.resource_id).filter(
+            Appointment.business_id == business_id,
+            Appointment.resource_id.in_([resource_id]),
+            Appointment.status == "scheduled",
+            Appointment.start_time >= day_start - timedelta(hours=12),
+            Appointment.start_time < day_start + timedelta(hours=12),
+        ),
+        "resource pool": db.query(Resource.id).filter(
+            Resource.business_id == business_id,
+            Resource.active.is_(True),
+        ),
+        "reminder window": window_query(db, day_start, day_start + timedelta(hours=1), day_start),
+        "dashboard days": db.query(DailyRollup).filter(
+            DailyRollup.business_id == business_id,
+            DailyRollup.day >= DAY.date(),
+            DailyRollup.day <= DAY.date() + timedelta(days=30),
+        ),
+        "dashboard hours": db.query(HourlyRollup.hour, func.sum(HourlyRollup.bookings)).filter(
+            HourlyRollup.business_id == business_id,
+            HourlyRollup.day >= DAY.date(),
+            HourlyRollup.day <= DAY.date() + timedelta(days=30),
+        ).group_by(HourlyRollup.hour),
+    }
+
+    failures = 0
+    for name, query in queries.items():
+        details = plan(db, query)
+        full_scans = [d for d in details if d.startswith("SCAN") and "USING" not in d]
+        status = "FAIL" if full_scans else "ok"
+        failures += bool(full_scans)
+        print(f"[{status:>4}] {name}")
+        for detail in details:
+            print(f"         {detail}")
+
+    db.close()
+    if failures:
+        print(f"{failures} hot queries fall back to full table scans", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+SMS reminder benchmark against the local fake Twilio server.
+
+Seeds a large appointments table (mostly weeks ahead) and compares what
+a per-minute cron scan reads with the scheduler's indexed window load.
+Then adds `--due` reminders falling due over the next `--spread` seconds
+and runs the real scheduler against the fake server, which rate-limits
+(429) and fails some requests (500). While it runs, some appointments
+are cancelled and new ones booked through booking_service, so the
+hooks are exercised. Some phone numbers are invalid and must be
+rejected, not retried.
+
+Checks:
+- every live reminder arrived exactly once;
+- nothing went to a cancelled appointment or an invalid number;
+- the client stayed under the server's rate limit.
+
+Reports how late reminders went out. Exits non-zero on any mismatch.
+
+Run from `ai_phone_system/` (SQLite temp file by default):
+
+    python -m Backend.benchmarks.reminder_bench --appointments 200000 --due 400 --spread 15
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "reminder_bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+from starlette.concurrency import run_in_threadpool  # noqa: E402
+
+from Backend.benchmarks.fake_twilio import FakeTwilioServer  # noqa: E402
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.appointment import Appointment, uuid_str  # noqa: E402
+from Backend.models.business import Business  # noqa: E402
+from Backend.services import booking_service  # noqa: E402
+from Backend.services.reminders import (  # noqa: E402
+    REMINDER_LEAD_HOURS,
+    ReminderScheduler,
+    load_window,
+    reminder_due,
+)
+from Backend.services.twilio_service import TwilioSmsClient  # noqa: E402
+from Backend.utils.instrumentation import install_query_hooks, queries_total  # noqa: E402
+
+LEAD = timedelta(hours=REMINDER_LEAD_HOURS)
+
+
+def phone(n: int) -> str:
+    return f"+1555{n:07d}"
+
+
+def seed_backlog(appointments: int, invalid_share: float, now: datetime, seed_value: int = 23):
+    """The bulk of the table: appointments over the next two months, some cancelled."""
+    rng = random.Random(seed_value)
+    db = SessionLocal()
+    try:
+        business = Business(name="Reminder Clinic", timezone="America/Toronto")
+        db.add(business)
+        db.flush()
+        rows = []
+        for n in range(appointments):
+            start = now + LEAD + timedelta(hours=2, minutes=rng.randrange(60 * 24 * 60))
+            rows.append({"id": uuid_str(), "business_id": business.id, "customer_name": f"Customer {n}",
+                         "customer_phone": phone(100_000 + n) if rng.random() >= invalid_share else "555-0100",
+                         "start_time": start, "end_time": start + timedelta(minutes=30),
+                         "status": "scheduled" if rng.random() < 0.9 else "cancelled", "created_at": now})
+        for i in range(0, len(rows), 5000):
+            db.bulk_insert_mappings(Appointment, rows[i:i + 5000])
+        db.commit()
+        return business.id
+    finally:
+        db.close()
+
+
+def seed_due(business_id: str, due: int, spread: float, invalid_share: float, seed_value: int = 24):
+    """
+    ({phone: appointment id} of the reminders expected to go out, ids of
+    the `due` appointments whose reminders fall due over the next
+    `spread` seconds, one empty business per booking made during the run).
+    """
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        rows, expected = [], {}
+        for n in range(due):
+            start = now + LEAD + timedelta(seconds=rng.uniform(1, spread))
+            number = phone(n) if rng.random() >= invalid_share else f"555-{n:07d}"
+            rows.append({"id": uuid_str(), "business_id": business_id, "customer_name": f"Due {n}",
+                         "customer_phone": number, "start_time": start, "end_time": start + timedelta(minutes=30),
+                         "status": "scheduled", "created_at": now})
+            if number.startswith("+"):
+                expected[number] = rows[-1]["id"]
+        db.bulk_insert_mappings(Appointment, rows)
+        late = [Business(name=f"Walk-in {n}", timezone="America/Toronto") for n in range(due // 20)]
+        db.add_all(late)
+        db.commit()
+        return expected, [row["id"] for row in rows], [b.id for b in late]
+    finally:
+        db.close()
+
+
+def compare_scans(now: datetime, hours: float):
+    """What a per-minute cron would read vs one indexed load of the next `hours` of reminders."""
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        everything = db.query(Appointment.id, Appointment.start_time, Appointment.status,
+                              Appointment.reminder_sent_at).all()
+        due = [row for row in everything if row.status == "scheduled" and row.reminder_sent_at is None
+               and reminder_due(row.start_time) < now + timedelta(hours=hours)]
+        cron = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        window = load_window(db, None, now + timedelta(hours=hours), now)
+        indexed = time.perf_counter() - t0
+    finally:
+        db.close()
+    print(f"{'scan':<16} {'rows read':>10} {'due':>6} {'ms':>8}")
+    print(f"{'cron (table)':<16} {len(everything):>10} {len(due):>6} {cron * 1000:>8.1f}")
+    print(f"{'indexed window':<16} {len(window):>10} {len(window):>6} {indexed * 1000:>8.1f}")
+
+
+async def run(args, expected, due_ids, late_businesses, server):
+    client = TwilioSmsClient(account_sid=server.account_sid, auth_token=server.auth_token,
+                             from_number="+15550000000", base_url=server.url,
+                             rate_per_second=args.rate, concurrency=args.concurrency)
+    scheduler = ReminderScheduler(client=client, tick_seconds=0.1, retry_minutes=2 / 60)
+    rng = random.Random(7)
+    started = (datetime.utcnow(), time.monotonic())
+    scheduler.start()
+    try:
+        # while it runs: cancel some due appointments, book some new ones due soon
+        cancelled = set()
+        for appointment_id in rng.sample(due_ids, len(due_ids) // 20):
+            db = SessionLocal()
+            try:
+                appointment = await run_in_threadpool(booking_service.cancel_appointment, db, appointment_id)
+            finally:
+                db.close()
+            cancelled.add(appointment.customer_phone)
+        for n, business_id in enumerate(late_businesses):
+            number = phone(9_000_000 + n)
+            start = datetime.utcnow() + LEAD + timedelta(seconds=rng.uniform(1, args.spread))
+            db = SessionLocal()
+            try:
+                appointment = await run_in_threadpool(
+                    booking_service.book_appointment, db, business_id, f"Late {n}", number,
+                    start.replace(tzinfo=timezone.utc), 15,
+                )
+            finally:
+                db.close()
+            expected[number] = appointment.id
+        for number in cancelled:
+            expected.pop(number, None)
+
+        deadline = time.monotonic() + args.spread + 60
+        while time.monotonic() < deadline:
+            if set(expected) <= {to for to, _, _ in server.messages}:
+                break
+            await asyncio.sleep(0.2)
+        await asyncio.sleep(1)  # anything still arriving would be a duplicate
+    finally:
+        await scheduler.stop()
+    return scheduler, cancelled, started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--appointments", type=int, default=100_000)
+    parser.add_argument("--due", type=int, default=300, help="reminders falling due during the run")
+    parser.add_argument("--spread", type=float, default=10.0, help="seconds over which they fall due")
+    parser.add_argument("--rate", type=float, default=40, help="client messages per second")
+    parser.add_argument("--server-rate", type=float, default=45, help="fake server limit before 429s")
+    parser.add_argument("--fail-every", type=int, default=25, help="fake server 500 on every Nth request")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--invalid-share", type=float, default=0.02)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    install_query_hooks()
+    logging.getLogger("reception_ai.reminders").setLevel(logging.ERROR)  # rejections are expected
+    now = datetime.utcnow()
+    t0 = time.perf_counter()
+    business_id = seed_backlog(args.appointments, args.invalid_share, now)
+    print(f"seeded {args.appointments} appointments in {time.perf_counter() - t0:.1f}s")
+    compare_scans(now, hours=3)
+
+    expected, due_ids, late_businesses = seed_due(business_id, args.due, args.spread, args.invalid_share)
+
+    server = FakeTwilioServer(rate_per_second=args.server_rate, fail_every=args.fail_every)
+    server.start()
+    queries = queries_total.snapshot().get((), 0)
+    try:
+        scheduler, cancelled, started = asyncio.run(run(args, expected, due_ids, late_businesses, server))
+    finally:
+        server.stop()
+    queries = queries_total.snapshot().get((), 0) - queries
+
+    stats = scheduler.stats()
+    received = {}
+    for to, _, at in server.messages:
+        received.setdefault(to, []).append(at)
+    duplicates = sum(len(times) - 1 for times in received.values())
+    missing = set(expected) - set(received)
+    unexpected = set(received) - set(expected)
+
+    print(f"sent {stats['sent']}, rejected {stats['rejected']}, retried {stats['retried']}, "
+          f"{stats['loads']} window loads ({stats['loaded']} rows), {stats['batches']} batches")
+    print(f"twilio: {server.requests} requests, {server.throttled} throttled (429), "
+          f"peak {server.peak_per_second()}/s against a limit of {args.server_rate:g}/s; "
+          f"{queries} SQL statements in total")
+
+    # lateness: arrival (the fake server's monotonic clock) vs due
+    started_at, started_monotonic = started
+    db = SessionLocal()
+    try:
+        starts = dict(db.query(Appointment.customer_phone, Appointment.start_time).filter(
+            Appointment.customer_phone.in_(list(received))))
+    finally:
+        db.close()
+    late = sorted(
+        max(0.0, times[0] - started_monotonic - (reminder_due(starts[to]) - started_at).total_seconds())
+        for to, times in received.items() if to in starts
+    )
+    if late:
+        print(f"sent after due: p50 {late[len(late) // 2]:.2f}s, p99 {late[int(len(late) * 0.99)]:.2f}s, "
+              f"max {late[-1]:.2f}s")
+
+    problems = []
+    if missing:
+        problems.append(f"{len(missing)} reminders never arrived")
+    if unexpected:
+        problems.append(f"{len(unexpected & cancelled)} cancelled / {len(unexpected - cancelled)} other "
+                        "numbers got a reminder they should not have")
+    if duplicates:
+        problems.append(f"{duplicates} duplicate reminders")
+    if server.throttled > server.requests // 10:
+        problems.append("client kept hitting the server's rate limit")
+    if problems:
+        print("; ".join(problems), file=sys.stderr)
+        sys.exit(1)
+    print(f"{len(expected)} reminders delivered exactly once, {len(cancelled)} cancelled ones skipped")
+
+
+if __name__ == "__main__":
+    main()
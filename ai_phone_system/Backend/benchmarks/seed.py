@@ -0,0 +1,217 @@
+"""
+Seeds a database with benchmark tenants: opening hours, services, staff
+and appointment history.
+
+Deterministic for a given `--seed`, so two runs (or two commits) load the
+same data. Appointment history is laid out per resource without overlaps,
+so the seeded rows also satisfy the Postgres exclusion constraints.
+Writes go through `bulk_insert_mappings` in chunks; seeding a few hundred
+thousand appointments takes seconds rather than minutes.
+
+Run from `ai_phone_system/` against any DATABASE_URL (tables must exist,
+or pass --create-tables):
+
+    DATABASE_URL=sqlite:///bench.db python -m Backend.benchmarks.seed --tenants 50 --create-tables
+"""
+import argparse
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as time_type, timedelta
+
+from Backend.database import Base, SessionLocal, engine
+from Backend.models.appointment import Appointment
+from Backend.models.business import Business, BusinessHours
+from Backend.models.resource import Resource, ServiceResource
+from Backend.models.service import Service
+from Backend.services.timezones import get_zone, to_utc
+from Backend.utils.auth import create_access_token
+
+TIMEZONES = ("America/Toronto", "America/Vancouver", "Europe/London", "Europe/Paris", "Australia/Sydney")
+SERVICE_MENU = (("Cut", 30), ("Beard", 15), ("Colour", 90), ("Treatment", 60), ("Consultation", 45))
+INSERT_CHUNK = 5000
+GRID_MINUTES = 15
+
+
+@dataclass
+class SeedConfig:
+    tenants: int = 20
+    services: int = 3  # per tenant, from SERVICE_MENU
+    staff: int = 2  # per tenant; 0 books each tenant as a single resource
+    history_days: int = 90  # past days with completed / cancelled appointments
+    future_days: int = 30  # days ahead with scheduled appointments
+    occupancy: float = 0.5  # share of open grid slots that start an appointment walk
+    open_hour: int = 9
+    close_hour: int = 18
+    seed: int = 20
+
+
+@dataclass
+class Tenant:
+    business_id: str
+    token: str
+    timezone: str
+    services: dict = field(default_factory=dict)  # service id -> duration minutes
+    open_days: tuple = ()  # weekdays with opening hours
+    open_hour: int = 9
+    close_hour: int = 18
+    upcoming: list = field(default_factory=list)  # ids of seeded scheduled appointments
+
+
+def _new_id(rng) -> str:
+    # ids from the seeded generator too, so reruns produce identical rows
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _flush(db, model, rows):
+    for i in range(0, len(rows), INSERT_CHUNK):
+        db.bulk_insert_mappings(model, rows[i:i + INSERT_CHUNK])
+    rows.clear()
+
+
+def _day_appointments(rng, config: SeedConfig, tenant: Tenant, day: date, service_ids):
+    """(local start, duration, service id) of one resource's day, back to back or with gaps."""
+    cursor = datetime.combine(day, time_type(config.open_hour))
+    close = datetime.combine(day, time_type(config.close_hour))
+    while cursor < close:
+        service_id = rng.choice(service_ids)
+        minutes = tenant.services[service_id]
+        if rng.random() < config.occupancy and cursor + timedelta(minutes=minutes) <= close:
+            yield cursor, minutes, service_id
+            cursor += timedelta(minutes=minutes)
+        else:
+            cursor += timedelta(minutes=GRID_MINUTES)
+
+
+def seed(config: SeedConfig, today: date | None = None) -> list:
+    """Creates `config.tenants` businesses and returns their `Tenant` handles."""
+    rng = random.Random(config.seed)
+    today = today or datetime.utcnow().date()
+    first_day = today - timedelta(days=config.history_days)
+    tenants = []
+    db = SessionLocal()
+    try:
+        for n in range(config.tenants):
+            # 1️⃣ Business, weekly hours (closed one or two days), services, staff
+            tenant = Tenant(
+                business_id=_new_id(rng),
+                token="",
+                timezone=TIMEZONES[n % len(TIMEZONES)],
+                open_hour=config.open_hour,
+                close_hour=config.close_hour,
+            )
+            tenant.token = create_access_token({"business_id": tenant.business_id})
+            closed = {6} if n % 2 else {0, 6}
+            tenant.open_days = tuple(d for d in range(7) if d not in closed)
+
+            db.bulk_insert_mappings(Business, [{
+                "id": tenant.business_id, "name": f"Bench Tenant {n}", "timezone": tenant.timezone,
+            }])
+            db.bulk_insert_mappings(BusinessHours, [
+                {"business_id": tenant.business_id, "day_of_week": weekday,
+                 "open_time": time_type(config.open_hour), "close_time": time_type(config.close_hour)}
+                for weekday in tenant.open_days
+            ])
+            for name, minutes in SERVICE_MENU[:max(1, config.services)]:
+                tenant.services[_new_id(rng)] = minutes
+            db.bulk_insert_mappings(Service, [
+                {"id": service_id, "business_id": tenant.business_id, "name": name, "duration_minutes": minutes}
+                for (name, minutes), service_id in zip(SERVICE_MENU, tenant.services)
+            ])
+            staff = [_new_id(rng) for _ in range(config.staff)]
+            db.bulk_insert_mappings(Resource, [
+                {"id": resource_id, "business_id": tenant.business_id, "name": f"Staff {i}", "active": True}
+                for i, resource_id in enumerate(staff)
+            ])
+            eligible = {resource_id: list(tenant.services) for resource_id in staff or [None]}
+            if len(staff) > 1:
+                # the longest service needs the senior staff member
+                longest = max(tenant.services, key=tenant.services.get)
+                db.bulk_insert_mappings(ServiceResource, [{"service_id": longest, "resource_id": staff[0]}])
+                for resource_id in staff[1:]:
+                    eligible[resource_id].remove(longest)
+
+            # 2️⃣ Appointment history, laid out per resource so nothing overlaps
+            zone = get_zone(tenant.timezone)
+            rows = []
+            for offset in range(config.history_days + config.future_days):
+                day = first_day + timedelta(days=offset)
+                if day.weekday() not in tenant.open_days:
+                    continue
+                for resource_id, service_ids in eligible.items():
+                    for local_start, minutes, service_id in _day_appointments(rng, config, tenant, day, service_ids):
+                        start = to_utc(local_start, zone)
+                        if day < today:
+                            status = "cancelled" if rng.random() < 0.1 else "completed"
+                        else:
+                            status = "cancelled" if rng.random() < 0.05 else "scheduled"
+                        row = {
+                            "id": _new_id(rng),
+                            "business_id": tenant.business_id,
+                            "service_id": service_id,
+                            "resource_id": resource_id,
+                            "customer_name": f"Customer {rng.randrange(10 ** 5)}",
+                            "customer_phone": f"+1514{rng.randrange(10 ** 7):07d}",
+                            "start_time": start,
+                            "end_time": start + timedelta(minutes=minutes),
+                            "status": status,
+                            "created_at": start - timedelta(days=rng.randrange(1, 30)),
+                        }
+                        rows.append(row)
+                        if status == "scheduled":
+                            tenant.upcoming.append(row["id"])
+                if len(rows) >= INSERT_CHUNK:
+                    _flush(db, Appointment, rows)
+            _flush(db, Appointment, rows)
+            db.commit()
+            tenants.append(tenant)
+    finally:
+        db.close()
+    return tenants
+
+
+def config_from_args(args) -> SeedConfig:
+    return SeedConfig(
+        tenants=args.tenants,
+        services=args.services,
+        staff=args.staff,
+        history_days=args.history_days,
+        future_days=args.future_days,
+        occupancy=args.occupancy,
+        seed=args.seed,
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    defaults = SeedConfig()
+    parser.add_argument("--tenants", type=int, default=defaults.tenants)
+    parser.add_argument("--services", type=int, default=defaults.services, help="services per tenant")
+    parser.add_argument("--staff", type=int, default=defaults.staff, help="resources per tenant (0: none)")
+    parser.add_argument("--history-days", type=int, default=defaults.history_days)
+    parser.add_argument("--future-days", type=int, default=defaults.future_days)
+    parser.add_argument("--occupancy", type=float, default=defaults.occupancy)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--create-tables", action="store_true", help="create_all before seeding")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        parser.error("set DATABASE_URL to the database to seed")
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+
+    t0 = time.perf_counter()
+    tenants = seed(config_from_args(args))
+    upcoming = sum(len(t.upcoming) for t in tenants)
+    print(f"seeded {len(tenants)} tenants ({upcoming} upcoming appointments) "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
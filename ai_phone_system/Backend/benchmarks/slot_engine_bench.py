@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: legacy slot scan vs. the interval-sweep slot engine.
+
+Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.slot_engine_bench
+"""
+import random
+import time
+from datetime import datetime, timedelta, time as time_type
+from types import SimpleNamespace
+
+from Backend.services.slot_engine import busy_intervals, free_slots, format_slots, to_minute
+
+DAY = datetime(2025, 1, 6)
+OPEN = time_type(0, 0)
+CLOSE = time_type(23, 45)
+DURATION = 30
+INCREMENT = 5
+BUFFER = 5
+SIZES = [0, 10, 50, 100, 200, 500]
+
+
+def legacy_slots(date, hours, appointments, duration, increment, buffer):
+    """The original O(slots x appointments) scan, kept verbatim for comparison."""
+    start_dt = datetime.combine(date.date(), hours.open_time)
+    end_dt = datetime.combine(date.date(), hours.close_time)
+
+    booked_slots = [
+        (appt.start_time - timedelta(minutes=buffer),
+         appt.end_time + timedelta(minutes=buffer))
+        for appt in appointments
+    ]
+    booked_slots.sort()
+
+    slots = []
+    current = start_dt
+    while current + timedelta(minutes=duration) <= end_dt:
+        slot_end = current + timedelta(minutes=duration)
+        overlap = any(not (slot_end <= bs or current >= be) for bs, be in booked_slots)
+        if not overlap:
+            slots.append((current.strftime("%H:%M"), slot_end.strftime("%H:%M")))
+        current += timedelta(minutes=increment)
+    return slots
+
+
+def engine_slots(date, hours, appointments, duration, increment, buffer):
+    day_start = datetime.combine(date.date(), datetime.min.time())
+    return format_slots(free_slots(
+        to_minute(datetime.combine(date.date(), hours.open_time), day_start, round_up=True),
+        to_minute(datetime.combine(date.date(), hours.close_time), day_start),
+        busy_intervals(appointments, day_start, buffer),
+        duration,
+        increment,
+    ))
+
+
+def synthetic_day(n, rng):
+    """`n` short bookings scattered over the day; overlaps are allowed on purpose."""
+    appointments = []
+    for _ in range(n):
+        start = DAY + timedelta(minutes=rng.randrange(0, 23 * 60, 5))
+        appointments.append(SimpleNamespace(
+            start_time=start,
+            end_time=start + timedelta(minutes=rng.choice([1, 2, 3, 5])),
+        ))
+    return appointments
+
+
+def best_of(fn, args, repeat=5, number=20):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn(*args)
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def main():
+    rng = random.Random(42)
+    hours = SimpleNamespace(open_time=OPEN, close_time=CLOSE)
+
+    print(f"{'appointments':>12} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for n in SIZES:
+        appointments = synthetic_day(n, rng)
+        args = (DAY, hours, appointments, DURATION, INCREMENT, BUFFER)
+
+        assert legacy_slots(*args) == engine_slots(*args), f"slot mismatch at n={n}"
+
+        legacy = best_of(legacy_slots, args)
+        engine = best_of(engine_slots, args)
+        print(f"{n:>12} {legacy * 1000:>10.3f} {engine * 1000:>10.3f} {legacy / engine:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Load benchmark: sync (threadpool) vs. async (AsyncSession) routes.
+
+Builds two in-process apps with the same availability and listing routes,
+drives each with N concurrent clients over ASGI and reports requests/sec
+and latency percentiles. The availability cache is disabled so every
+request reaches the database.
+
+Run from `ai_phone_system/` (SQLite + aiosqlite temp file by default):
+
+    python -m Backend.benchmarks.sync_async_bench --clients 200 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, time as time_type, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "sync_async_bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+os.environ.setdefault("AVAILABILITY_CACHE_MAX_ENTRIES", "0")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.appointment import Appointment  # noqa: E402
+from Backend.models.business import Business, BusinessHours  # noqa: E402
+from Backend.models.service import Service  # noqa: E402
+from Backend.routes import appointments, appointments_async, availability, availability_async  # noqa: E402
+from Backend.utils.auth import create_access_token  # noqa: E402
+
+DAY = datetime(2025, 1, 6)
+
+
+def build_app(use_async: bool) -> FastAPI:
+    app = FastAPI()
+    if use_async:
+        app.include_router(availability_async.router)
+        app.include_router(appointments_async.router)
+    else:
+        app.include_router(availability.router)
+        app.include_router(appointments.router)
+    return app
+
+
+def seed(appointments_per_day: int = 20):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    business = Business(name="Bench Salon")
+    db.add(business)
+    db.flush()
+    for weekday in range(7):
+        db.add(BusinessHours(business_id=business.id, day_of_week=weekday,
+                             open_time=time_type(9), close_time=time_type(18)))
+    service = Service(business_id=business.id, name="Cut", duration_minutes=30)
+    db.add(service)
+    for i in range(appointments_per_day):
+        start = DAY + timedelta(hours=9, minutes=25 * i)
+        db.add(Appointment(business_id=business.id, start_time=start,
+                           end_time=start + timedelta(minutes=20), status="scheduled"))
+    db.commit()
+    ids = business.id, service.id
+    db.close()
+    return ids
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def drive(app: FastAPI, business_id: str, service_id: str, clients: int, seconds: float):
+    headers = {"Authorization": f"Bearer {create_access_token({'business_id': business_id})}"}
+    requests = [
+        ("/availability/", {"date": DAY.strftime("%Y-%m-%d"), "service_id": service_id}),
+        ("/appointments/", {"business_id": business_id}),
+    ]
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+
+        async def worker(n):
+            nonlocal errors
+            i = n
+            while time.perf_counter() < deadline:
+                path, params = requests[i % len(requests)]
+                t0 = time.perf_counter()
+                response = await client.get(path, params=params)
+                latencies.append(time.perf_counter() - t0)
+                errors += response.status_code != 200
+                i += 1
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+        elapsed = time.perf_counter() - t0
+
+    return len(latencies) / elapsed, latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    business_id, service_id = seed()
+
+    print(f"{'mode':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode, use_async in (("sync", False), ("async", True)):
+        rps, latencies, errors = asyncio.run(
+            drive(build_app(use_async), business_id, service_id, args.clients, args.seconds)
+        )
+        print(
+            f"{mode:>6} {rps:>9.1f} {percentile(latencies, 50) * 1000:>8.1f} "
+            f"{percentile(latencies, 95) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: naive (UTC) slot computation vs. zone-aware day frames.
+
+Computes a month of slots the way `get_availability_range` does after its
+queries: the naive path passes no frame (the pre-timezone behaviour), the
+zone-aware paths build the month's frames first, cold (frame cache
+cleared every round) and warm.
+
+Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.timezone_bench
+"""
+import os
+import random
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+# pure computation; the models only need some engine to import
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from Backend.services.availability_service import slots_for_day  # noqa: E402
+from Backend.services.timezones import day_frame, day_frames, get_zone  # noqa: E402
+
+FIRST_DAY = date(2025, 3, 1)  # March: contains the US and EU spring-forward days
+DAYS = 31
+OPEN_INTERVALS = [(8 * 60, 20 * 60)]
+DURATION = 30
+ROUNDS = 200
+ZONES = ["UTC", "America/New_York", "Europe/Paris", "Australia/Lord_Howe"]
+
+
+def month_of_bookings(zone, per_day=20, seed=14):
+    """Same local-time workload in every zone: bookings from 08:00 wall time."""
+    rng = random.Random(seed)
+    by_day = {}
+    for offset in range(DAYS):
+        day = FIRST_DAY + timedelta(days=offset)
+        start = day_frame(zone, day).start + timedelta(hours=8)
+        by_day[day] = [
+            SimpleNamespace(
+                start_time=start + timedelta(minutes=rng.randrange(0, 12 * 60, 15)),
+                end_time=start + timedelta(minutes=rng.randrange(0, 12 * 60, 15) + 30),
+            )
+            for _ in range(per_day)
+        ]
+    return by_day
+
+
+def naive_month(bookings):
+    return [
+        slots_for_day(day, OPEN_INTERVALS, appointments, DURATION)
+        for day, appointments in bookings.items()
+    ]
+
+
+def zoned_month(zone, bookings):
+    last_day = FIRST_DAY + timedelta(days=DAYS - 1)
+    return [
+        slots_for_day(frame.day, OPEN_INTERVALS, bookings[frame.day], DURATION, frame=frame)
+        for frame in day_frames(zone, FIRST_DAY, last_day)
+    ]
+
+
+def timed(fn, *args, before=None):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    naive = timed(naive_month, month_of_bookings(get_zone("UTC")))
+    print(f"{'path':<28} {'ms / month':>11} {'vs naive':>9}")
+    print(f"{'naive':<28} {naive * 1000:>11.3f} {1.0:>8.2f}x")
+    for name in ZONES:
+        zone = get_zone(name)
+        bookings = month_of_bookings(zone)
+        for label, before in (("cold", day_frame.cache_clear), ("warm", None)):
+            elapsed = timed(zoned_month, zone, bookings, before=before)
+            print(f"{name + ' ' + label:<28} {elapsed * 1000:>11.3f} {elapsed / naive:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
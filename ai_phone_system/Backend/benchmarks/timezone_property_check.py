@@ -0,0 +1,218 @@
+"""
+Randomised property checks for timezone-aware slot computation.
+
+Draws zones (including ones with DST, half-hour offsets and midnight
+transitions), days around their transitions, business hours and bookings,
+and checks every slot against zoneinfo and a brute-force reference:
+
+- day frames tile time: each frame ends where the next one starts, and
+  its length is 24h minus the DST jump
+- slot labels are the wall time zoneinfo gives for the slot's instant;
+  skipped wall times are never offered
+- every slot lasts exactly the service duration in real time and is
+  clear of every booking (plus buffer)
+- the slot set equals a minute-by-minute scan of the open interval,
+  opening at the first instant the clock reaches the opening time
+- in UTC the result is identical to the naive (frame-less) path
+
+Exits non-zero on the first counterexample. Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.timezone_property_check --cases 2000
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from types import SimpleNamespace
+
+# pure computation; the models only need some engine to import
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from Backend.services.availability_service import slots_for_day  # noqa: E402
+from Backend.services.timezones import UTC, day_frame, get_zone, to_local, to_utc  # noqa: E402
+
+ZONES = [
+    "UTC",
+    "America/New_York",
+    "America/Los_Angeles",
+    "America/Santiago",  # transitions at midnight
+    "America/St_Johns",  # -03:30
+    "Europe/London",
+    "Europe/Paris",
+    "Australia/Lord_Howe",  # 30-minute DST jump
+    "Asia/Kolkata",
+    "Pacific/Chatham",  # +12:45
+]
+
+
+def transition_days(zone, year):
+    """Local days on which the zone's UTC offset changes."""
+    days = []
+    day = date(year, 1, 1)
+    while day.year == year:
+        frame = day_frame(zone, day)
+        if frame.transition is not None:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def draw_case(rng, transitions):
+    name = rng.choice(ZONES)
+    zone = get_zone(name)
+    if transitions[name] and rng.random() < 0.7:
+        day = rng.choice(transitions[name]) + timedelta(days=rng.choice([-1, 0, 0, 0, 1]))
+    else:
+        day = date(2025, 1, 1) + timedelta(days=rng.randrange(365))
+
+    open_minute = rng.randrange(0, 12 * 60, 15)
+    close_minute = rng.randrange(open_minute + 15, 24 * 60, 15)
+    hours = SimpleNamespace(
+        open_time=time(open_minute // 60, open_minute % 60),
+        close_time=time(close_minute // 60, close_minute % 60),
+    )
+
+    frame = day_frame(zone, day)
+    appointments = []
+    for _ in range(rng.randrange(0, 12)):
+        start = frame.start + timedelta(minutes=rng.randrange(-120, 26 * 60))
+        appointments.append(SimpleNamespace(
+            start_time=start,
+            end_time=start + timedelta(minutes=rng.choice([15, 20, 30, 45, 60, 90])),
+        ))
+
+    return {
+        "name": name,
+        "zone": zone,
+        "day": day,
+        "hours": hours,
+        "appointments": appointments,
+        "duration": rng.choice([15, 30, 45, 60, 90]),
+        "increment": rng.choice([5, 10, 15, 30]),
+        "buffer": rng.choice([0, 5, 10]),
+    }
+
+
+def wall_text(dt: datetime) -> str:
+    return dt.strftime("%H:%M")
+
+
+@lru_cache(maxsize=None)
+def wall_minutes(zone, day):
+    """Wall minute (since local midnight) at each real minute of the day, via zoneinfo."""
+    start = day_frame(zone, day).start
+    midnight = datetime.combine(day, time())
+    return [
+        (to_local(start + timedelta(minutes=r), zone) - midnight) // timedelta(minutes=1)
+        for r in range(26 * 60)
+    ]
+
+
+def reference_slots(case, frame):
+    """
+    Minute-by-minute scan over real time, with wall times from zoneinfo.
+
+    Opening starts at the first instant the wall clock shows the opening
+    time (or the first instant after it, when DST skips it); closing is
+    the last instant the clock shows the closing time.
+    """
+    hours = case["hours"]
+    walls = wall_minutes(case["zone"], case["day"])
+    open_wall = hours.open_time.hour * 60 + hours.open_time.minute
+    close_wall = hours.close_time.hour * 60 + hours.close_time.minute
+    open_r = next(r for r, wall in enumerate(walls) if wall >= open_wall)
+    exact_close = [r for r, wall in enumerate(walls) if wall == close_wall]
+    close_r = exact_close[-1] if exact_close else next(r for r, wall in enumerate(walls) if wall > close_wall)
+
+    start_of = lambda r: frame.start + timedelta(minutes=r)  # noqa: E731
+    busy = [
+        (a.start_time - timedelta(minutes=case["buffer"]), a.end_time + timedelta(minutes=case["buffer"]))
+        for a in case["appointments"]
+    ]
+    slots = []
+    r = open_r
+    while r + case["duration"] <= close_r:
+        start, end = start_of(r), start_of(r + case["duration"])
+        if all(end <= b_start or start >= b_end for b_start, b_end in busy):
+            slots.append((start, end))
+        r += case["increment"]
+    return slots
+
+
+def check(case):
+    zone, day = case["zone"], case["day"]
+    frame = day_frame(zone, day)
+    following = day_frame(zone, day + timedelta(days=1))
+
+    # frames tile time
+    assert frame.end == following.start, "frames do not tile"
+    length = (frame.end - frame.start) // timedelta(minutes=1)
+    assert length == 24 * 60 - frame.delta, f"day length {length} with delta {frame.delta}"
+    first_wall = to_local(frame.start, zone)
+    assert first_wall.date() == day, "frame starts on the wrong local day"
+    if first_wall.time() != time():
+        # only when DST skips midnight itself
+        assert frame.transition == 0, f"frame starts at {first_wall.time()}"
+
+    hours = case["hours"]
+    open_intervals = [(
+        hours.open_time.hour * 60 + hours.open_time.minute,
+        hours.close_time.hour * 60 + hours.close_time.minute,
+    )]
+    slots = slots_for_day(
+        day, open_intervals, case["appointments"], case["duration"],
+        slot_increment_minutes=case["increment"], buffer_minutes=case["buffer"], frame=frame,
+    )
+    expected = reference_slots(case, frame)
+    assert len(slots) == len(expected), f"{len(slots)} slots, reference has {len(expected)}"
+
+    for (start_label, end_label), (start_utc, end_utc) in zip(slots, expected):
+        for label, instant in ((start_label, start_utc), (end_label, end_utc)):
+            local = to_local(instant, zone)
+            assert label[:5] == wall_text(local), f"{label} != {wall_text(local)} at {instant}Z"
+            if len(label) > 5:
+                # offset-tagged labels must round-trip to the exact instant
+                aware = datetime.fromisoformat(f"{day.isoformat()}T{label}")
+                assert to_utc(aware, zone) == instant, f"{label} does not identify {instant}Z"
+        assert end_utc - start_utc == timedelta(minutes=case["duration"])
+
+    if case["name"] == "UTC":
+        naive = slots_for_day(
+            day, open_intervals, case["appointments"], case["duration"],
+            slot_increment_minutes=case["increment"], buffer_minutes=case["buffer"],
+        )
+        assert naive == slots, "UTC frame differs from the naive path"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=14)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    transitions = {name: transition_days(get_zone(name), 2025) for name in ZONES}
+
+    for i in range(args.cases):
+        case = draw_case(rng, transitions)
+        try:
+            check(case)
+        except AssertionError as exc:
+            print(f"case {i} failed: {exc}", file=sys.stderr)
+            print(
+                f"  zone={case['name']} day={case['day']} hours={case['hours']} "
+                f"duration={case['duration']} increment={case['increment']} buffer={case['buffer']}",
+                file=sys.stderr,
+            )
+            for appt in case["appointments"]:
+                print(f"  booking {appt.start_time}Z - {appt.end_time}Z", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"{args.cases} cases passed across {len(ZONES)} zones "
+          f"({sum(map(len, transitions.values()))} transition days)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Time-to-first-byte benchmark for POST /twilio/voice.
+
+Seeds businesses with phone numbers and posts Twilio-style form bodies to
+the voice webhook in-process, with the TwiML cache cold (cleared before
+every request) and warm.
+
+Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.twiml_bench --requests 2000 --tenants 500
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "twiml_bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models import appointment, service  # noqa: E402,F401
+from Backend.models.business import Business, BusinessPhoneNumber  # noqa: E402
+from Backend.routes import twilio  # noqa: E402
+from Backend.services.twiml_service import twiml_cache  # noqa: E402
+
+
+def seed(tenants: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    numbers = [f"+1514555{i:04d}" for i in range(tenants)]
+    for i, number in enumerate(numbers):
+        business = Business(name=f"Salon {i}", phone_number=number, stream_url="wss://media.example.com/stream")
+        db.add(business)
+        db.flush()
+        db.add(BusinessPhoneNumber(business_id=business.id, number=number, kind="primary"))
+    db.commit()
+    db.close()
+    return numbers
+
+
+async def measure(numbers, requests: int, cold: bool):
+    app = FastAPI()
+    app.include_router(twilio.router, prefix="/twilio")
+    ttfb = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(requests):
+            if cold:
+                twiml_cache.clear()
+            form = {"CallSid": f"CA{i:032d}", "From": "+15145550000", "To": numbers[i % len(numbers)]}
+            t0 = time.perf_counter()
+            async with client.stream("POST", "/twilio/voice", data=form) as response:
+                async for _ in response.aiter_bytes():
+                    ttfb.append(time.perf_counter() - t0)
+                    break
+    ttfb.sort()
+    return ttfb[len(ttfb) // 2], ttfb[int(len(ttfb) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tenants", type=int, default=500)
+    args = parser.parse_args()
+
+    numbers = seed(args.tenants)
+    print(f"{'cache':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, cold in (("cold", True), ("warm", False)):
+        p50, p99 = asyncio.run(measure(numbers, args.requests, cold))
+        print(f"{label:>6} {p50 * 1000:>8.3f} {p99 * 1000:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
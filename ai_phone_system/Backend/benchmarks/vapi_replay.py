@@ -0,0 +1,109 @@
+"""
+Replay harness for recorded Vapi webhook payloads.
+
+Seeds a throwaway SQLite database, feeds every JSON fixture in
+`fixtures/vapi/` (in file name order) through the in-process tool-call
+dispatcher, checks the results and prints per-tool latency.
+
+Fixtures may use {{business_id}}, {{service_id}} and {{appointment_id}}
+placeholders; the last booked appointment id is carried forward. Fixtures
+whose name contains "_error" must produce an error result, every other
+tool call must succeed. Exits non-zero on any mismatch.
+
+Run from `ai_phone_system/`:
+
+    python -m Backend.benchmarks.vapi_replay --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import time
+from pathlib import Path
+
+if not os.getenv("DATABASE_URL"):
+    _db_file = os.path.join(tempfile.mkdtemp(), "vapi_replay.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+
+from Backend.database import Base, SessionLocal, engine  # noqa: E402
+from Backend.models.appointment import Appointment  # noqa: E402,F401
+from Backend.models.business import Business, BusinessHours  # noqa: E402
+from Backend.models.service import Service  # noqa: E402
+from Backend.services import vapi_service  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures" / "vapi"
+
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    business = Business(name="Replay Salon")
+    db.add(business)
+    db.flush()
+    for weekday in range(7):
+        db.add(BusinessHours(business_id=business.id, day_of_week=weekday,
+                             open_time=time(9), close_time=time(17)))
+    service = Service(business_id=business.id, name="Haircut", duration_minutes=30)
+    db.add(service)
+    db.commit()
+    context = {"business_id": business.id, "service_id": service.id, "appointment_id": ""}
+    db.close()
+    return context
+
+
+def render(raw: str, context: dict) -> dict:
+    for key, value in context.items():
+        raw = raw.replace("{{" + key + "}}", value)
+    return json.loads(raw)
+
+
+def tool_results(response: dict):
+    if "result" in response:
+        return [json.loads(response["result"])]
+    return [json.loads(r["result"]) for r in response["results"]]
+
+
+async def replay(fixtures, context, repeat: int) -> int:
+    failures = 0
+    for i in range(repeat):
+        for path in fixtures:
+            response = await vapi_service.dispatch(render(path.read_text(), context))
+            if response is None:
+                if i == 0:
+                    print(f"[  ok] {path.name}: acknowledged")
+                continue
+
+            for result in tool_results(response):
+                if "appointment_id" in result and result.get("status") == "booked":
+                    context["appointment_id"] = result["appointment_id"]
+
+                ok = ("error" in result) == ("_error" in path.name)
+                failures += not ok
+                if i == 0 or not ok:
+                    print(f"[{'ok' if ok else 'FAIL':>4}] {path.name}: {result}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1, help="replay the whole sequence N times")
+    args = parser.parse_args()
+
+    fixtures = sorted(FIXTURES.glob("*.json"))
+    failures = asyncio.run(replay(fixtures, seed(), args.repeat))
+
+    print(f"\n{'tool':<20} {'calls':>6} {'mean ms':>8} {'<=50ms':>7} {'<=100ms':>8}")
+    for tool, series in sorted(vapi_service.tool_latency.snapshot().items()):
+        mean_ms = series["sum"] / series["count"] * 1000
+        print(f"{tool:<20} {series['count']:>6} {mean_ms:>8.2f} "
+              f"{series['buckets'][0.05]:>7} {series['buckets'][0.1]:>8}")
+
+    if failures:
+        print(f"{failures} replayed tool calls did not match expectations", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,137 @@ import os
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pool tuning (ignored for SQLite, which manages its own connections)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+
+# Async driver used for each sync URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        # SQLite connections are shared across the threadpool FastAPI runs sync routes in
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+
+def async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+# ---------------------------------------------------------
+# ENGINE (created on first use, not at import: importing models or the
+# app needs no DATABASE_URL and opens nothing)
+# ---------------------------------------------------------
+_engine = None
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that creates the engine when the first session is opened."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None and "bind" not in local_kw:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        url = os.getenv("DATABASE_URL") or DATABASE_URL
+        if not url:
+            raise RuntimeError("DATABASE_URL is not set")
+        _engine = create_engine(url, **engine_options(url))
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def dispose_engine():
+    """Closes pooled connections (app shutdown); the next use starts a fresh pool."""
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+
+
+def __getattr__(name):
+    # `from Backend.database import engine` still works; it creates the engine on access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def upgrade_schema(revision: str = "head"):
+    """`alembic upgrade head` in-process, for DB_MIGRATE_ON_STARTUP."""
+    from alembic import command
+    from alembic.config import Config
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = Config(os.path.join(root, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(root, "Backend", "migrations"))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, revision)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ---------------------------------------------------------
+# ASYNC ENGINE (created on first use; needs aiosqlite / asyncpg)
+# ---------------------------------------------------------
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = os.getenv("DATABASE_URL") or DATABASE_URL
+        if not url:
+            raise RuntimeError("DATABASE_URL is not set")
+        options = engine_options(url)
+        options.pop("connect_args", None)  # aiosqlite has no thread affinity
+        _async_engine = create_async_engine(async_url(url), **options)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+def async_session():
+    """A new AsyncSession for work outside request dependencies (streamed bodies)."""
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+
+async def get_async_db():
+    async with async_session() as db:
+        yield db
@@ -1,50 +1,129 @@
 # main_ai.py
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from database import engine, Base
-from routes import twilio, vapi, appointments, business, availability, auth
+from Backend.database import SessionLocal, dispose_async_engine, dispose_engine, get_engine, upgrade_schema
+from Backend.services.calender_service import CALENDAR_SYNC_ENABLED, calendar_sync
+from Backend.services.call_event_queue import call_event_queue
+from Backend.services.phone_routing import phone_router
+from Backend.services.reminders import REMINDERS_ENABLED, reminder_scheduler
+from Backend.utils.instrumentation import TimingMiddleware, install_query_hooks
 
-# ---------------------------------------------------------
-# Create database tables
-# ---------------------------------------------------------
-# Make sure your models are imported somewhere so SQLAlchemy sees them
-Base.metadata.create_all(bind=engine)
+# Serve availability/booking/listing from AsyncSession handlers (needs aiosqlite / asyncpg)
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "false").lower() in ("1", "true", "yes")
 
-# ---------------------------------------------------------
-# APP
-# ---------------------------------------------------------
-app = FastAPI(title="Reception AI", version="0.1.0")
+# The schema is managed by Alembic (`alembic upgrade head`, run from `ai_phone_system/`).
+# Set for single-process dev setups to upgrade on startup instead; never with several workers.
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "false").lower() in ("1", "true", "yes")
 
-# ---------------------------------------------------------
-# CORS
-# ---------------------------------------------------------
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # tighten later
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
 # ---------------------------------------------------------
-# ROUTERS
+# LIFESPAN (engine, schema, caches, background workers)
 # ---------------------------------------------------------
-app.include_router(twilio.router, prefix="/twilio", tags=["Twilio"])
-app.include_router(vapi.router, prefix="/vapi", tags=["Vapi"])
-app.include_router(appointments.router, prefix="/appointments", tags=["Appointments"])
-app.include_router(business.router, prefix="/businesses", tags=["Businesses"])
-app.include_router(availability.router, prefix="/availability", tags=["Availability"])
-app.include_router(auth.router, prefix="/auth", tags=["Auth"])
-app.include_router(services.router, prefix="/services", tags=["Services"])
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 1️⃣ Engine: created here, not at import, so importing the app opens nothing
+    get_engine()
+    if DB_MIGRATE_ON_STARTUP:
+        await run_in_threadpool(upgrade_schema)
+
+    # 2️⃣ Inbound calls route from memory; load every number -> business once
+    db = SessionLocal()
+    try:
+        phone_router.warm(db)
+    finally:
+        db.close()
+
+    # 3️⃣ Background workers
+    call_event_queue.start()
+    # External calendars are synced in the background, never per request
+    if CALENDAR_SYNC_ENABLED:
+        calendar_sync.start()
+    # SMS reminders: only the next hour of due reminders is held in memory
+    if REMINDERS_ENABLED:
+        reminder_scheduler.start()
+    yield
+    await reminder_scheduler.stop()
+    await calendar_sync.stop()
+    await call_event_queue.stop()
+    dispose_engine()
+    await dispose_async_engine()
+
 
 # ---------------------------------------------------------
-# HEALTH CHECK
+# APP FACTORY
 # ---------------------------------------------------------
-@app.get("/")
-def root():
-    return {"status": "ok", "message": "Reception AI backend running"}
+def create_app(use_async_db: bool = USE_ASYNC_DB) -> FastAPI:
+    """
+    Builds the app. `uvicorn --factory Backend.main_ai:create_app` calls it
+    once per worker; `Backend.main_ai:app` builds it on first access.
+    """
+    from Backend.routes import twilio, vapi, business, auth, calls, resources, imports, calendars, analytics, metrics
+    from Backend.routes import sevice as services
+
+    if use_async_db:
+        from Backend.routes import appointments_async as appointments
+        from Backend.routes import availability_async as availability
+    else:
+        from Backend.routes import appointments, availability
+
+    app = FastAPI(title="Reception AI", version="0.1.0", lifespan=lifespan)
+
+    # ---------------------------------------------------------
+    # INSTRUMENTATION (per-route latency, queries per request, slow queries)
+    # ---------------------------------------------------------
+    install_query_hooks()
+    app.add_middleware(TimingMiddleware)
+
+    # ---------------------------------------------------------
+    # CORS
+    # ---------------------------------------------------------
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # tighten later
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # ---------------------------------------------------------
+    # ROUTERS
+    # ---------------------------------------------------------
+    app.include_router(twilio.router, prefix="/twilio", tags=["Twilio"])
+    app.include_router(vapi.router, prefix="/vapi", tags=["Vapi"])
+    app.include_router(appointments.router, prefix="/appointments", tags=["Appointments"])
+    app.include_router(business.router, prefix="/businesses", tags=["Businesses"])
+    app.include_router(availability.router, prefix="/availability", tags=["Availability"])
+    app.include_router(auth.router, prefix="/auth", tags=["Auth"])
+    app.include_router(services.router, prefix="/services", tags=["Services"])
+    app.include_router(calls.router, tags=["Calls"])
+    app.include_router(resources.router, tags=["Resources"])
+    app.include_router(imports.router, tags=["Imports"])
+    app.include_router(calendars.router, tags=["Calendars"])
+    app.include_router(analytics.router, tags=["Analytics"])
+    app.include_router(metrics.router)
+
+    # ---------------------------------------------------------
+    # HEALTH CHECK
+    # ---------------------------------------------------------
+    @app.get("/")
+    def root():
+        return {"status": "ok", "message": "Reception AI backend running"}
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    return app
+
 
-@app.get("/health")
-def health():
-    return {"status": "healthy"}
\ No newline at end of file
+def __getattr__(name):
+    # `uvicorn Backend.main_ai:app` keeps working: the app is built on first access and kept
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,42 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from Backend.database import Base, get_engine
+from Backend.models import analytics, appointment, business, calendar, call, resource, service  # noqa: F401
+
+config = context.config
+# run from the app (DB_MIGRATE_ON_STARTUP): keep the server's logging as it is
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    engine = get_engine()
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=engine.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with get_engine().connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
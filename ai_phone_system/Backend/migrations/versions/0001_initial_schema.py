@@ -0,0 +1,73 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-06
+
+Matches the tables `Base.metadata.create_all` produced before migrations
+were introduced. Databases created that way should be stamped rather
+than upgraded: `alembic stamp 0001`. The Postgres overlap constraint
+below is skipped by stamping; 0015 adds it to such databases.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "businesses",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("phone_number", sa.String(), nullable=True),
+        sa.Column("timezone", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "business_hours",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("day_of_week", sa.Integer(), nullable=False),
+        sa.Column("open_time", sa.Time(), nullable=False),
+        sa.Column("close_time", sa.Time(), nullable=False),
+    )
+    op.create_table(
+        "services",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("price_cents", sa.Integer(), nullable=True),
+    )
+    op.create_table(
+        "appointments",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("customer_name", sa.String(), nullable=True),
+        sa.Column("customer_phone", sa.String(), nullable=True),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_appointments_business_id", "appointments", ["business_id"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            "ALTER TABLE appointments ADD CONSTRAINT appointments_no_overlap "
+            "EXCLUDE USING gist (business_id WITH =, tsrange(start_time, end_time) WITH &&) "
+            "WHERE (status = 'scheduled')"
+        )
+
+
+def downgrade():
+    op.drop_table("appointments")
+    op.drop_table("services")
+    op.drop_table("business_hours")
+    op.drop_table("businesses")
@@ -0,0 +1,42 @@
+"""hot-path composite indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-06
+
+- appointments (business_id, status, start_time, end_time): availability and
+  conflict queries filter on business + status and range on start_time;
+  end_time makes the slot query index-only. Supersedes the single-column
+  business_id index.
+- business_hours (business_id, day_of_week)
+- services (business_id)
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_appointments_business_status_time",
+        "appointments",
+        ["business_id", "status", "start_time", "end_time"],
+    )
+    op.drop_index("ix_appointments_business_id", table_name="appointments")
+    op.create_index(
+        "ix_business_hours_business_day",
+        "business_hours",
+        ["business_id", "day_of_week"],
+    )
+    op.create_index("ix_services_business_id", "services", ["business_id"])
+
+
+def downgrade():
+    op.drop_index("ix_services_business_id", table_name="services")
+    op.drop_index("ix_business_hours_business_day", table_name="business_hours")
+    op.create_index("ix_appointments_business_id", "appointments", ["business_id"])
+    op.drop_index("ix_appointments_business_status_time", table_name="appointments")
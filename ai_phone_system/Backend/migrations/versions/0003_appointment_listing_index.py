@@ -0,0 +1,29 @@
+"""appointment listing index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-06
+
+appointments (business_id, start_time, id) backs the keyset-paginated
+listing and export, which order by (start_time, id) with or without a
+status filter.
+"""
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_appointments_business_start_id",
+        "appointments",
+        ["business_id", "start_time", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_appointments_business_start_id", table_name="appointments")
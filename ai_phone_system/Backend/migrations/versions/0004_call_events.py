@@ -0,0 +1,34 @@
+"""call events table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-01-06
+
+Raw Vapi webhook events, batch-inserted by the background event queue.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "call_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("call_id", sa.String(), nullable=True),
+        sa.Column("business_id", sa.String(), nullable=True),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("received_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_call_events_call_received", "call_events", ["call_id", "received_at"])
+    op.create_index("ix_call_events_business_id", "call_events", ["business_id"])
+
+
+def downgrade():
+    op.drop_table("call_events")
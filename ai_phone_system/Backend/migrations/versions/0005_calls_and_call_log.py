@@ -0,0 +1,62 @@
+"""calls and compressed call log
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-01-06
+
+- calls: one row per finished call, transcript stored zlib-compressed,
+  indexed on (business_id, started_at) for per-day range reads.
+- call_log_chunks: append-only compressed JSON-lines of a call's webhook
+  events, written in bulk at hangup.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "calls",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("vapi_call_id", sa.String(), nullable=True, unique=True),
+        sa.Column("twilio_call_sid", sa.String(), nullable=True),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=True),
+        sa.Column("appointment_id", sa.String(), sa.ForeignKey("appointments.id"), nullable=True),
+        sa.Column("from_number", sa.String(), nullable=True),
+        sa.Column("to_number", sa.String(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("ended_at", sa.DateTime(), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=True),
+        sa.Column("outcome", sa.String(), nullable=True),
+        sa.Column("ended_reason", sa.String(), nullable=True),
+        sa.Column("transcript", sa.LargeBinary(), nullable=True),
+        sa.Column("transcript_codec", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_calls_business_started", "calls", ["business_id", "started_at"])
+    op.create_index("ix_calls_twilio_call_sid", "calls", ["twilio_call_sid"])
+
+    op.create_table(
+        "call_log_chunks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("call_id", sa.String(), sa.ForeignKey("calls.id"), nullable=False),
+        sa.Column("business_id", sa.String(), nullable=True),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("first_at", sa.DateTime(), nullable=False),
+        sa.Column("last_at", sa.DateTime(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("codec", sa.String(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+    )
+    op.create_index("ix_call_log_chunks_call_id", "call_log_chunks", ["call_id"])
+    op.create_index("ix_call_log_chunks_business_first", "call_log_chunks", ["business_id", "first_at"])
+
+
+def downgrade():
+    op.drop_table("call_log_chunks")
+    op.drop_table("calls")
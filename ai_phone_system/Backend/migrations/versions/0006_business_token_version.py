@@ -0,0 +1,27 @@
+"""business token version
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-06
+
+businesses.token_version is embedded in access tokens as `ver`; bumping it
+revokes every token issued before.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("businesses") as batch:
+        batch.add_column(sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    with op.batch_alter_table("businesses") as batch:
+        batch.drop_column("token_version")
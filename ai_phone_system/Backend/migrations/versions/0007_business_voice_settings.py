@@ -0,0 +1,33 @@
+"""business voice settings and phone number index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-01-06
+
+Per-business greeting, voice and media stream target for the answering
+TwiML, plus an index on businesses.phone_number for the inbound lookup.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("businesses") as batch:
+        batch.add_column(sa.Column("greeting", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("voice", sa.String(), nullable=True))
+        batch.add_column(sa.Column("stream_url", sa.String(), nullable=True))
+    op.create_index("ix_businesses_phone_number", "businesses", ["phone_number"])
+
+
+def downgrade():
+    op.drop_index("ix_businesses_phone_number", table_name="businesses")
+    with op.batch_alter_table("businesses") as batch:
+        batch.drop_column("stream_url")
+        batch.drop_column("voice")
+        batch.drop_column("greeting")
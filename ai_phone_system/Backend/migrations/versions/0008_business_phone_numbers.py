@@ -0,0 +1,94 @@
+"""business phone numbers
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-01-06
+
+business_phone_numbers maps every E.164 number a business answers on
+(primary, forwarded, ported) to it, unique on number. Existing
+businesses.phone_number values are normalised and copied over; numbers
+that fail to parse or are shared by several businesses are left out of
+routing (the first business keeps a shared number) but stay stored as
+they were, and the skipped business ids are logged.
+"""
+import logging
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from Backend.utils.phone import try_normalize_e164
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade():
+    numbers = op.create_table(
+        "business_phone_numbers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("number", sa.String(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_business_phone_numbers_number", "business_phone_numbers", ["number"], unique=True)
+    op.create_index("ix_business_phone_numbers_business_id", "business_phone_numbers", ["business_id"])
+
+    conn = op.get_bind()
+    businesses = sa.table(
+        "businesses",
+        sa.column("id", sa.String()),
+        sa.column("phone_number", sa.String()),
+        sa.column("created_at", sa.DateTime()),
+    )
+    rows = conn.execute(
+        sa.select(businesses.c.id, businesses.c.phone_number)
+        .where(businesses.c.phone_number.isnot(None))
+        .order_by(businesses.c.created_at)
+    ).all()
+
+    seen = set()
+    inserts = []
+    unparsed = []
+    shared = []
+    for business_id, raw in rows:
+        number = try_normalize_e164(raw)
+        if number is None:
+            unparsed.append(business_id)
+            continue
+        if number in seen:
+            shared.append(business_id)
+            continue
+        seen.add(number)
+        inserts.append({
+            "business_id": business_id,
+            "number": number,
+            "kind": "primary",
+            "created_at": datetime.utcnow(),
+        })
+        if number != raw:
+            conn.execute(
+                businesses.update().where(businesses.c.id == business_id).values(phone_number=number)
+            )
+    if inserts:
+        op.bulk_insert(numbers, inserts)
+    if unparsed:
+        logger.warning("phone_number not routed, cannot be parsed: businesses %s", ", ".join(unparsed))
+    if shared:
+        logger.warning("phone_number not routed, already used by another business: businesses %s",
+                       ", ".join(shared))
+
+    op.drop_index("ix_businesses_phone_number", table_name="businesses")
+
+
+def downgrade():
+    op.create_index("ix_businesses_phone_number", "businesses", ["phone_number"])
+    op.drop_index("ix_business_phone_numbers_business_id", table_name="business_phone_numbers")
+    op.drop_index("ix_business_phone_numbers_number", table_name="business_phone_numbers")
+    op.drop_table("business_phone_numbers")
@@ -0,0 +1,132 @@
+"""store appointment times in UTC
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-01-06
+
+Appointment start/end times were stored as naive wall time of whatever
+the client sent. They are now naive UTC and availability is computed in
+the business's timezone, so existing rows of businesses outside UTC are
+converted from their local wall time, one UPDATE per timezone. On
+Postgres the overlap constraint is dropped for the conversion and
+re-created after it. Ambiguous wall times resolve to their first
+occurrence (Postgres: the offset in force after the transition).
+"""
+from datetime import timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+businesses = sa.table(
+    "businesses",
+    sa.column("id", sa.String()),
+    sa.column("timezone", sa.String()),
+)
+appointments = sa.table(
+    "appointments",
+    sa.column("id", sa.String()),
+    sa.column("business_id", sa.String()),
+    sa.column("start_time", sa.DateTime()),
+    sa.column("end_time", sa.DateTime()),
+)
+
+
+def _to_utc(dt, zone):
+    return dt.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _to_local(dt, zone):
+    return dt.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None)
+
+
+# (constraint, definition as of this revision); per-row updates could trip them halfway through
+CONSTRAINTS = (
+    ("appointments_no_overlap",
+     "EXCLUDE USING gist (business_id WITH =, tsrange(start_time, end_time) WITH &&) "
+     "WHERE (status = 'scheduled')"),
+)
+
+# wall time in :zone <-> naive UTC, in one statement per timezone
+PG_TO_UTC = "(({column} AT TIME ZONE :zone) AT TIME ZONE 'UTC')"
+PG_TO_LOCAL = "(({column} AT TIME ZONE 'UTC') AT TIME ZONE :zone)"
+
+
+def _tenant_zones(conn):
+    """Distinct non-UTC timezones that actually exist."""
+    names = conn.execute(
+        sa.select(businesses.c.timezone).distinct().where(
+            businesses.c.timezone.isnot(None),
+            businesses.c.timezone != "UTC",
+        )
+    ).scalars().all()
+    zones = []
+    for name in names:
+        try:
+            zones.append((name, ZoneInfo(name)))
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+    return zones
+
+
+def _convert_postgres(conn, zones, expression):
+    existing = set(conn.execute(sa.text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = 'appointments'::regclass"
+    )).scalars())
+    dropped = [(name, definition) for name, definition in CONSTRAINTS if name in existing]
+    for name, _ in dropped:
+        op.execute(f"ALTER TABLE appointments DROP CONSTRAINT {name}")
+
+    for name, _ in zones:
+        conn.execute(
+            sa.text(
+                f"UPDATE appointments SET start_time = {expression.format(column='appointments.start_time')}, "
+                f"end_time = {expression.format(column='appointments.end_time')} "
+                "FROM businesses WHERE businesses.id = appointments.business_id AND businesses.timezone = :zone"
+            ),
+            {"zone": name},
+        )
+
+    for name, definition in dropped:
+        op.execute(f"ALTER TABLE appointments ADD CONSTRAINT {name} {definition}")
+
+
+def _convert_rows(conn, zones, convert):
+    """Databases without timezone support: one executemany per timezone."""
+    statement = appointments.update().where(appointments.c.id == sa.bindparam("row_id")).values(
+        start_time=sa.bindparam("new_start"), end_time=sa.bindparam("new_end")
+    )
+    for name, zone in zones:
+        rows = conn.execute(
+            sa.select(appointments.c.id, appointments.c.start_time, appointments.c.end_time)
+            .join_from(appointments, businesses, businesses.c.id == appointments.c.business_id)
+            .where(businesses.c.timezone == name)
+        ).all()
+        if rows:
+            conn.execute(statement, [
+                {"row_id": row_id, "new_start": convert(start_time, zone), "new_end": convert(end_time, zone)}
+                for row_id, start_time, end_time in rows
+            ])
+
+
+def _convert(convert, pg_expression):
+    conn = op.get_bind()
+    zones = _tenant_zones(conn)
+    if conn.dialect.name == "postgresql":
+        _convert_postgres(conn, zones, pg_expression)
+    else:
+        _convert_rows(conn, zones, convert)
+
+
+def upgrade():
+    _convert(_to_utc, PG_TO_UTC)
+
+
+def downgrade():
+    _convert(_to_local, PG_TO_LOCAL)
@@ -0,0 +1,37 @@
+"""business closures
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-01-06
+
+Holidays and closures, whole days or a time window on each day of an
+inclusive date range. Read with the weekly hours when a business's
+schedule is compiled, filtered on (business_id, end_date).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "business_closures",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=True),
+        sa.Column("end_time", sa.Time(), nullable=True),
+        sa.Column("reason", sa.String(), nullable=True),
+    )
+    op.create_index("ix_business_closures_business_end", "business_closures", ["business_id", "end_date"])
+
+
+def downgrade():
+    op.drop_index("ix_business_closures_business_end", table_name="business_closures")
+    op.drop_table("business_closures")
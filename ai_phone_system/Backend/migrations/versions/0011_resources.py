@@ -0,0 +1,85 @@
+"""resources and service eligibility
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2025-01-06
+
+- resources: staff, rooms or equipment an appointment occupies.
+- service_resources: which resources can perform which service.
+- appointments.resource_id / service_id, indexed on (resource_id, start_time).
+- Postgres: the business-wide no-overlap constraint now only covers
+  unassigned appointments; assigned ones must not overlap per resource.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "resources",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False, server_default="staff"),
+        sa.Column("active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_resources_business_id", "resources", ["business_id"])
+
+    op.create_table(
+        "service_resources",
+        sa.Column("service_id", sa.String(), sa.ForeignKey("services.id"), primary_key=True),
+        sa.Column("resource_id", sa.String(), sa.ForeignKey("resources.id"), primary_key=True),
+    )
+    op.create_index("ix_service_resources_resource_id", "service_resources", ["resource_id"])
+
+    # named: SQLite's batch mode recreates the table and cannot add anonymous constraints
+    with op.batch_alter_table("appointments") as batch:
+        batch.add_column(sa.Column(
+            "service_id", sa.String(), sa.ForeignKey("services.id", name="fk_appointments_service_id"), nullable=True
+        ))
+        batch.add_column(sa.Column(
+            "resource_id", sa.String(), sa.ForeignKey("resources.id", name="fk_appointments_resource_id"),
+            nullable=True,
+        ))
+    op.create_index("ix_appointments_resource_time", "appointments", ["resource_id", "start_time"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")  # missing on databases stamped at 0001
+        op.execute("ALTER TABLE appointments DROP CONSTRAINT IF EXISTS appointments_no_overlap")
+        op.execute(
+            "ALTER TABLE appointments ADD CONSTRAINT appointments_no_overlap "
+            "EXCLUDE USING gist (business_id WITH =, tsrange(start_time, end_time) WITH &&) "
+            "WHERE (status = 'scheduled' AND resource_id IS NULL)"
+        )
+        op.execute(
+            "ALTER TABLE appointments ADD CONSTRAINT appointments_resource_no_overlap "
+            "EXCLUDE USING gist (resource_id WITH =, tsrange(start_time, end_time) WITH &&) "
+            "WHERE (status = 'scheduled' AND resource_id IS NOT NULL)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE appointments DROP CONSTRAINT IF EXISTS appointments_resource_no_overlap")
+        op.execute("ALTER TABLE appointments DROP CONSTRAINT IF EXISTS appointments_no_overlap")
+        op.execute(
+            "ALTER TABLE appointments ADD CONSTRAINT appointments_no_overlap "
+            "EXCLUDE USING gist (business_id WITH =, tsrange(start_time, end_time) WITH &&) "
+            "WHERE (status = 'scheduled')"
+        )
+
+    op.drop_index("ix_appointments_resource_time", table_name="appointments")
+    with op.batch_alter_table("appointments") as batch:
+        batch.drop_column("resource_id")
+        batch.drop_column("service_id")
+    op.drop_index("ix_service_resources_resource_id", table_name="service_resources")
+    op.drop_table("service_resources")
+    op.drop_index("ix_resources_business_id", table_name="resources")
+    op.drop_table("resources")
@@ -0,0 +1,64 @@
+"""external calendar sync
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2025-01-06
+
+- calendar_connections: connected Google / Outlook calendars with their
+  incremental sync token and list ETag.
+- external_busy_blocks: their busy events, read with appointments when
+  slots are computed, indexed on (business_id, start_time, end_time).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "calendar_connections",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("resource_id", sa.String(), sa.ForeignKey("resources.id"), nullable=True),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("calendar_id", sa.String(), nullable=False, server_default="primary"),
+        sa.Column("access_token", sa.String(), nullable=True),
+        sa.Column("refresh_token", sa.String(), nullable=True),
+        sa.Column("sync_token", sa.String(), nullable=True),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_calendar_connections_business_id", "calendar_connections", ["business_id"])
+
+    op.create_table(
+        "external_busy_blocks",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("connection_id", sa.String(), sa.ForeignKey("calendar_connections.id"), nullable=False),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("resource_id", sa.String(), sa.ForeignKey("resources.id"), nullable=True),
+        sa.Column("external_id", sa.String(), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("connection_id", "external_id", name="uq_external_busy_blocks_event"),
+    )
+    op.create_index(
+        "ix_external_busy_blocks_business_time",
+        "external_busy_blocks",
+        ["business_id", "start_time", "end_time"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_external_busy_blocks_business_time", table_name="external_busy_blocks")
+    op.drop_table("external_busy_blocks")
+    op.drop_index("ix_calendar_connections_business_id", table_name="calendar_connections")
+    op.drop_table("calendar_connections")
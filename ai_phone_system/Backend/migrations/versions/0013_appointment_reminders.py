@@ -0,0 +1,34 @@
+"""appointment reminders
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2025-01-13
+
+- appointments.reminder_sent_at: when the SMS reminder was claimed for
+  sending (NULL: not sent yet).
+- ix_appointments_reminder_due on (status, reminder_sent_at, start_time):
+  the reminder scheduler loads the next window of unsent reminders with
+  one range scan instead of reading the whole table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("appointments", sa.Column("reminder_sent_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_appointments_reminder_due",
+        "appointments",
+        ["status", "reminder_sent_at", "start_time"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_appointments_reminder_due", table_name="appointments")
+    op.drop_column("appointments", "reminder_sent_at")
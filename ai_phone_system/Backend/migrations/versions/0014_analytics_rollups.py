@@ -0,0 +1,49 @@
+"""analytics rollups
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2025-01-20
+
+- analytics_daily: bookings, cancellations and revenue per business and
+  local day, keyed (business_id, day).
+- analytics_hourly: bookings and cancellations per business, local day
+  and hour, keyed (business_id, day, hour).
+
+Dashboards read these by primary-key range instead of grouping the
+appointments table. Fill them from existing appointments once after
+upgrading, from `ai_phone_system/`:
+
+    python -m Backend.services.analytics
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "analytics_daily",
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("bookings", sa.Integer(), nullable=False),
+        sa.Column("cancellations", sa.Integer(), nullable=False),
+        sa.Column("revenue_cents", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "analytics_hourly",
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("hour", sa.Integer(), primary_key=True),
+        sa.Column("bookings", sa.Integer(), nullable=False),
+        sa.Column("cancellations", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("analytics_hourly")
+    op.drop_table("analytics_daily")
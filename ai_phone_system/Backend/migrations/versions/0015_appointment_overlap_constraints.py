@@ -0,0 +1,49 @@
+"""appointment overlap constraints for stamped databases
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2025-01-21
+
+Databases created before migrations and stamped at 0001 never ran its
+body, so on Postgres they can lack btree_gist and the
+appointments_no_overlap / appointments_resource_no_overlap exclusion
+constraints. Both are added here if missing; databases that already
+have them are left untouched. Other databases have no exclusion
+constraints and nothing to do.
+"""
+from alembic import op
+
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+# same definitions as 0011
+CONSTRAINTS = (
+    ("appointments_no_overlap",
+     "EXCLUDE USING gist (business_id WITH =, tsrange(start_time, end_time) WITH &&) "
+     "WHERE (status = 'scheduled' AND resource_id IS NULL)"),
+    ("appointments_resource_no_overlap",
+     "EXCLUDE USING gist (resource_id WITH =, tsrange(start_time, end_time) WITH &&) "
+     "WHERE (status = 'scheduled' AND resource_id IS NOT NULL)"),
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    for name, definition in CONSTRAINTS:
+        op.execute(
+            "DO $$ BEGIN "
+            "IF NOT EXISTS (SELECT 1 FROM pg_constraint "
+            f"WHERE conname = '{name}' AND conrelid = 'appointments'::regclass) THEN "
+            f"ALTER TABLE appointments ADD CONSTRAINT {name} {definition}; "
+            "END IF; END $$"
+        )
+
+
+def downgrade():
+    # fresh databases got these from 0001 / 0011; dropping them here would strip those too
+    pass
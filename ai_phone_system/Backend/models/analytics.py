@@ -0,0 +1,39 @@
+from sqlalchemy import Column, String, Date, Integer, ForeignKey
+
+from Backend.database import Base
+
+
+class DailyRollup(Base):
+    """
+    Appointments of one business on one local day (by start time).
+
+    Kept current by the booking, cancel and import paths in the same
+    transaction as the appointment write; `services/analytics.py`
+    backfills history. `bookings` counts every appointment on the day,
+    cancelled ones included; `revenue_cents` sums the service price of
+    those not cancelled.
+    """
+    __tablename__ = "analytics_daily"
+
+    business_id = Column(String, ForeignKey("businesses.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    bookings = Column(Integer, nullable=False, default=0)
+    cancellations = Column(Integer, nullable=False, default=0)
+    revenue_cents = Column(Integer, nullable=False, default=0)
+
+
+class HourlyRollup(Base):
+    """
+    Appointments of one business starting in one local hour of one day.
+
+    Only hours with appointments have a row.
+    """
+    __tablename__ = "analytics_hourly"
+
+    business_id = Column(String, ForeignKey("businesses.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True)  # 0-23, local wall clock
+
+    bookings = Column(Integer, nullable=False, default=0)
+    cancellations = Column(Integer, nullable=False, default=0)
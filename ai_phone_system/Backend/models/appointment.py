@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 from Backend.database import Base
+from Backend.models import resource, service  # noqa: F401  (tables referenced by foreign keys)
 
 
 def uuid_str():
@@ -11,10 +12,22 @@ def uuid_str():
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # availability + conflict lookups: equality on business/status, range on time
+        Index("ix_appointments_business_status_time", "business_id", "status", "start_time", "end_time"),
+        # keyset-paginated listing ordered by (start_time, id)
+        Index("ix_appointments_business_start_id", "business_id", "start_time", "id"),
+        # per-resource conflict checks
+        Index("ix_appointments_resource_time", "resource_id", "start_time"),
+        # reminder scheduler: unsent reminders of scheduled appointments by start time
+        Index("ix_appointments_reminder_due", "status", "reminder_sent_at", "start_time"),
+    )
 
     id = Column(String, primary_key=True, default=uuid_str)
 
-    business_id = Column(String, ForeignKey("businesses.id"), nullable=False, index=True)
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=False)
+    service_id = Column(String, ForeignKey("services.id"), nullable=True)
+    resource_id = Column(String, ForeignKey("resources.id"), nullable=True)  # None: whole business
 
     customer_name = Column(String, nullable=True)
     customer_phone = Column(String, nullable=True)
@@ -24,7 +37,38 @@ class Appointment(Base):
 
     status = Column(String, default="scheduled")  # scheduled, cancelled, completed
 
+    reminder_sent_at = Column(DateTime, nullable=True)  # set when the SMS reminder is claimed for sending
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # relationship back to Business
-    business = relationship("Business", back_populates="appointments")
\ No newline at end of file
+    business = relationship("Business", back_populates="appointments")
+
+
+# ---------------------------------------------------------
+# Postgres: reject overlapping scheduled appointments at the DB level
+# (per resource; unassigned appointments per business)
+# ---------------------------------------------------------
+event.listen(
+    Appointment.__table__,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Appointment.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE appointments ADD CONSTRAINT appointments_no_overlap "
+        "EXCLUDE USING gist (business_id WITH =, tsrange(start_time, end_time) WITH &&) "
+        "WHERE (status = 'scheduled' AND resource_id IS NULL)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Appointment.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE appointments ADD CONSTRAINT appointments_resource_no_overlap "
+        "EXCLUDE USING gist (resource_id WITH =, tsrange(start_time, end_time) WITH &&) "
+        "WHERE (status = 'scheduled' AND resource_id IS NOT NULL)"
+    ).execute_if(dialect="postgresql"),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Time, Integer, ForeignKey
+from sqlalchemy import Column, String, Date, DateTime, Time, Integer, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -16,9 +16,16 @@ class Business(Base):
     id = Column(String, primary_key=True, default=uuid_str)
 
     name = Column(String, nullable=False)
-    phone_number = Column(String, nullable=True)
+    phone_number = Column(String, nullable=True)  # primary number (E.164); routing uses BusinessPhoneNumber
     timezone = Column(String, default="UTC")
 
+    # Voice answering settings
+    greeting = Column(Text, nullable=True)
+    voice = Column(String, default="alice")
+    stream_url = Column(String, nullable=True)  # wss:// target for <Connect><Stream>
+
+    token_version = Column(Integer, default=0, nullable=False)  # bump to revoke issued tokens
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     hours = relationship(
@@ -39,9 +46,24 @@ class Business(Base):
         cascade="all, delete-orphan"
     )
 
+    phone_numbers = relationship(
+        "BusinessPhoneNumber",
+        back_populates="business",
+        cascade="all, delete-orphan"
+    )
+
+    closures = relationship(
+        "BusinessClosure",
+        back_populates="business",
+        cascade="all, delete-orphan"
+    )
+
 
 class BusinessHours(Base):
     __tablename__ = "business_hours"
+    __table_args__ = (
+        Index("ix_business_hours_business_day", "business_id", "day_of_week"),
+    )
 
     id = Column(Integer, primary_key=True)
     business_id = Column(String, ForeignKey("businesses.id"), nullable=False)
@@ -50,4 +72,43 @@ class BusinessHours(Base):
     open_time = Column(Time, nullable=False)
     close_time = Column(Time, nullable=False)
 
-    business = relationship("Business", back_populates="hours")
\ No newline at end of file
+    business = relationship("Business", back_populates="hours")
+
+
+class BusinessClosure(Base):
+    """
+    Holiday or closure: whole days, or a time window on each day of the range.
+    """
+    __tablename__ = "business_closures"
+    __table_args__ = (
+        Index("ix_business_closures_business_end", "business_id", "end_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=False)
+
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)  # inclusive
+    start_time = Column(Time, nullable=True)  # both None = closed all day
+    end_time = Column(Time, nullable=True)
+
+    reason = Column(String, nullable=True)
+
+    business = relationship("Business", back_populates="closures")
+
+
+class BusinessPhoneNumber(Base):
+    """
+    A number inbound calls for a business arrive on (primary, forwarded, ported...).
+    """
+    __tablename__ = "business_phone_numbers"
+
+    id = Column(Integer, primary_key=True)
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=False, index=True)
+
+    number = Column(String, nullable=False, unique=True, index=True)  # E.164, e.g. +15145550123
+    kind = Column(String, nullable=False, default="primary")  # primary, forwarded, ported
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    business = relationship("Business", back_populates="phone_numbers")
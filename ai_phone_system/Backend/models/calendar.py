@@ -0,0 +1,61 @@
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, UniqueConstraint
+from datetime import datetime
+import uuid
+
+from Backend.database import Base
+
+
+def uuid_str():
+    return str(uuid.uuid4())
+
+
+class CalendarConnection(Base):
+    """
+    An external calendar (Google, Outlook) whose busy time blocks booking.
+
+    With `resource_id` the calendar belongs to one staff member and only
+    blocks them; without, it blocks the whole business.
+    """
+    __tablename__ = "calendar_connections"
+
+    id = Column(String, primary_key=True, default=uuid_str)
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=False, index=True)
+    resource_id = Column(String, ForeignKey("resources.id"), nullable=True)
+
+    provider = Column(String, nullable=False)  # google, outlook, fake
+    calendar_id = Column(String, nullable=False, default="primary")
+    access_token = Column(String, nullable=True)
+    refresh_token = Column(String, nullable=True)
+
+    # incremental sync state: provider sync/delta token and the list ETag
+    sync_token = Column(String, nullable=True)
+    etag = Column(String, nullable=True)
+
+    active = Column(Boolean, nullable=False, default=True)
+    last_synced_at = Column(DateTime, nullable=True)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ExternalBusyBlock(Base):
+    """
+    One busy event of a connected calendar, in naive UTC like appointments.
+
+    Read next to scheduled appointments when slots are computed.
+    """
+    __tablename__ = "external_busy_blocks"
+    __table_args__ = (
+        UniqueConstraint("connection_id", "external_id", name="uq_external_busy_blocks_event"),
+        # availability reads blocks per business and time range
+        Index("ix_external_busy_blocks_business_time", "business_id", "start_time", "end_time"),
+    )
+
+    id = Column(String, primary_key=True, default=uuid_str)
+    connection_id = Column(String, ForeignKey("calendar_connections.id"), nullable=False)
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=False)
+    resource_id = Column(String, ForeignKey("resources.id"), nullable=True)  # None: whole business
+
+    external_id = Column(String, nullable=False)  # provider event id
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
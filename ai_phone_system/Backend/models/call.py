@@ -0,0 +1,89 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, LargeBinary, ForeignKey, Index
+from datetime import datetime
+import uuid
+
+from Backend.database import Base
+
+
+def uuid_str():
+    return str(uuid.uuid4())
+
+
+class Call(Base):
+    """
+    One row per finished call, written at hangup.
+    """
+    __tablename__ = "calls"
+    __table_args__ = (
+        # dashboards and billing read calls per business and day
+        Index("ix_calls_business_started", "business_id", "started_at"),
+    )
+
+    id = Column(String, primary_key=True, default=uuid_str)
+
+    vapi_call_id = Column(String, nullable=True, unique=True)
+    twilio_call_sid = Column(String, nullable=True, index=True)
+
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=True)
+    appointment_id = Column(String, ForeignKey("appointments.id"), nullable=True)
+
+    from_number = Column(String, nullable=True)
+    to_number = Column(String, nullable=True)
+
+    started_at = Column(DateTime, nullable=False)
+    ended_at = Column(DateTime, nullable=True)
+    duration_seconds = Column(Integer, nullable=True)
+
+    outcome = Column(String, nullable=True)  # booked, cancelled, no_booking, ...
+    ended_reason = Column(String, nullable=True)
+
+    transcript = Column(LargeBinary, nullable=True)  # compressed UTF-8 text
+    transcript_codec = Column(String, default="zlib")
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CallLogChunk(Base):
+    """
+    Append-only, compressed JSON-lines chunk of a call's webhook events.
+    """
+    __tablename__ = "call_log_chunks"
+    __table_args__ = (
+        Index("ix_call_log_chunks_business_first", "business_id", "first_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    call_id = Column(String, ForeignKey("calls.id"), nullable=False, index=True)
+    business_id = Column(String, nullable=True)
+    seq = Column(Integer, nullable=False, default=0)
+
+    first_at = Column(DateTime, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+    event_count = Column(Integer, nullable=False)
+
+    codec = Column(String, nullable=False, default="zlib")
+    data = Column(LargeBinary, nullable=False)
+
+
+class CallEvent(Base):
+    """
+    Raw webhook event (status update, transcript, end-of-call report...) for a call.
+
+    Only events that cannot be tied to a call land here; call events are
+    buffered and written as `CallLogChunk`s at hangup.
+    """
+    __tablename__ = "call_events"
+    __table_args__ = (
+        Index("ix_call_events_call_received", "call_id", "received_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    call_id = Column(String, nullable=True)  # Vapi call id
+    business_id = Column(String, nullable=True, index=True)
+
+    event_type = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # raw JSON body
+
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
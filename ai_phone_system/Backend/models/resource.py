@@ -0,0 +1,39 @@
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from datetime import datetime
+import uuid
+
+from Backend.database import Base
+
+
+def uuid_str():
+    return str(uuid.uuid4())
+
+
+class Resource(Base):
+    """
+    Something an appointment occupies: a stylist, a chair, a room...
+
+    A business without resources books as a single resource.
+    """
+    __tablename__ = "resources"
+
+    id = Column(String, primary_key=True, default=uuid_str)
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=False, index=True)
+
+    name = Column(String, nullable=False)
+    kind = Column(String, nullable=False, default="staff")  # staff, room, equipment
+    active = Column(Boolean, nullable=False, default=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ServiceResource(Base):
+    """
+    Eligibility: `resource_id` can perform `service_id`.
+
+    A service with no rows can be performed by every active resource.
+    """
+    __tablename__ = "service_resources"
+
+    service_id = Column(String, ForeignKey("services.id"), primary_key=True)
+    resource_id = Column(String, ForeignKey("resources.id"), primary_key=True, index=True)
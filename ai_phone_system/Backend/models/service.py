@@ -13,7 +13,7 @@ class Service(Base):
     __tablename__ = "services"
 
     id = Column(String, primary_key=True, default=uuid_str)
-    business_id = Column(String, ForeignKey("businesses.id"), nullable=False)
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=False, index=True)
 
     name = Column(String, nullable=False)
     duration_minutes = Column(Integer, nullable=False)
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import date
+
+from Backend.database import get_db
+from Backend.services.analytics import ANALYTICS_MAX_DAYS, daily_rollups, hourly_rollups
+from Backend.utils.auth import get_current_business_id
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+def _check_range(date_from: date, date_to: date | None) -> date:
+    date_to = date_to or date_from
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if (date_to - date_from).days + 1 > ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {ANALYTICS_MAX_DAYS} days")
+    return date_to
+
+
+# ---------------------------------------------------------
+# BOOKINGS, CANCELLATIONS AND REVENUE PER DAY
+# ---------------------------------------------------------
+@router.get("/daily")
+def get_daily(
+    date_from: date,
+    date_to: date | None = None,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    date_to = _check_range(date_from, date_to)
+    days = daily_rollups(db, business_id, date_from, date_to)
+    bookings = sum(d["bookings"] for d in days)
+    cancellations = sum(d["cancellations"] for d in days)
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "days": days,
+        "totals": {
+            "bookings": bookings,
+            "cancellations": cancellations,
+            "cancellation_rate": round(cancellations / bookings, 4) if bookings else 0.0,
+            "revenue_cents": sum(d["revenue_cents"] for d in days),
+        },
+    }
+
+
+# ---------------------------------------------------------
+# BUSIEST HOURS (local time)
+# ---------------------------------------------------------
+@router.get("/hours")
+def get_hours(
+    date_from: date,
+    date_to: date | None = None,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    date_to = _check_range(date_from, date_to)
+    hours = hourly_rollups(db, business_id, date_from, date_to)
+    for h in hours:
+        h["kept"] = h["bookings"] - h["cancellations"]
+    busiest = max(hours, key=lambda h: h["kept"])
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "hours": hours,
+        "busiest_hour": busiest["hour"] if busiest["kept"] else None,
+    }
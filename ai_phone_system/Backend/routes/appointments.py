@@ -1,14 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from typing import List
 
-from Backend.database import get_db
-from Backend.models.appointment import Appointment
+from Backend.database import SessionLocal, get_db
 from Backend.models.business import Business
+from Backend.services import booking_service
+from Backend.services.appointment_listing import (
+    DEFAULT_PAGE_SIZE,
+    EXPORT_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    csv_lines,
+    listing_query,
+    ndjson_lines,
+    page_from_rows,
+)
+from Backend.services.timezones import business_zones, to_aware
 
 router = APIRouter(prefix="/appointments", tags=["Appointments"])
 
 
+class AppointmentOut(BaseModel):
+    id: str
+    customer_name: str | None
+    customer_phone: str | None
+    start_time: datetime
+    end_time: datetime
+    status: str | None
+    created_at: datetime | None
+
+
+class AppointmentPage(BaseModel):
+    items: List[AppointmentOut]
+    next_cursor: str | None
+
+
 # ---------------------------------------------------------
 # CREATE APPOINTMENT (BOOK)
 # ---------------------------------------------------------
@@ -19,6 +48,8 @@ def book_appointment(
     customer_phone: str,
     start_time: datetime,
     duration_minutes: int = 30,
+    service_id: str | None = None,
+    resource_id: str | None = None,
     db: Session = Depends(get_db),
 ):
     # 1️⃣ Validate business
@@ -26,61 +57,86 @@ def book_appointment(
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
 
-    end_time = start_time + timedelta(minutes=duration_minutes)
-
-    # 2️⃣ Check conflicts
-    conflict = (
-        db.query(Appointment)
-        .filter(
-            Appointment.business_id == business_id,
-            Appointment.start_time < end_time,
-            Appointment.end_time > start_time,
-            Appointment.status == "scheduled",
+    # 2️⃣ Check conflicts and create appointment under a per-business lock
+    try:
+        appointment = booking_service.book_appointment(
+            db,
+            business_id=business_id,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            start_time=start_time,
+            duration_minutes=duration_minutes,
+            service_id=service_id,
+            resource_id=resource_id,
         )
-        .first()
-    )
-
-    if conflict:
+    except booking_service.SlotUnavailableError:
         raise HTTPException(status_code=409, detail="Time slot not available")
+    except booking_service.IneligibleResourceError:
+        raise HTTPException(status_code=400, detail="No eligible resource for this service")
 
-    # 3️⃣ Create appointment
-    appointment = Appointment(
-        business_id=business_id,
-        customer_name=customer_name,
-        customer_phone=customer_phone,
-        start_time=start_time,
-        end_time=end_time,
-        status="scheduled",
-    )
-
-    db.add(appointment)
-    db.commit()
-    db.refresh(appointment)
-
+    zone = business_zones.get(db, business_id)
     return {
         "status": "booked",
         "appointment_id": appointment.id,
-        "start_time": appointment.start_time,
-        "end_time": appointment.end_time,
+        "resource_id": appointment.resource_id,
+        "start_time": to_aware(appointment.start_time, zone),
+        "end_time": to_aware(appointment.end_time, zone),
     }
 
 
 # ---------------------------------------------------------
 # LIST APPOINTMENTS FOR A BUSINESS
 # ---------------------------------------------------------
-@router.get("/")
+@router.get("/", response_model=AppointmentPage)
 def list_appointments(
     business_id: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
 ):
-    appointments = (
-        db.query(Appointment)
-        .filter(Appointment.business_id == business_id)
-        .order_by(Appointment.start_time)
-        .all()
-    )
+    zone = business_zones.get(db, business_id)
+    try:
+        query = listing_query(business_id, zone, date_from, date_to, status, cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    return appointments
+    rows = db.execute(query.limit(limit + 1)).all()
+    return page_from_rows(rows, limit, zone)
+
+
+# ---------------------------------------------------------
+# EXPORT APPOINTMENTS (NDJSON / CSV STREAM)
+# ---------------------------------------------------------
+@router.get("/export")
+def export_appointments(
+    business_id: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+):
+    def stream():
+        # own session: the response body outlives the request dependencies
+        db = SessionLocal()
+        try:
+            zone = business_zones.get(db, business_id)
+            query = listing_query(business_id, zone, date_from, date_to, status)
+            rows = db.execute(
+                query.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+            )
+            yield from (csv_lines(rows, zone) if export_format == "csv" else ndjson_lines(rows, zone))
+        finally:
+            db.close()
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="appointments.{export_format}"'},
+    )
 
 
 # ---------------------------------------------------------
@@ -88,17 +144,12 @@ def list_appointments(
 # ---------------------------------------------------------
 @router.post("/cancel")
 def cancel_appointment(
-    appointment_id: int,
+    appointment_id: str,
     db: Session = Depends(get_db),
 ):
-    appointment = db.query(Appointment).filter(
-        Appointment.id == appointment_id
-    ).first()
+    appointment = booking_service.cancel_appointment(db, appointment_id)
 
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
 
-    appointment.status = "cancelled"
-    db.commit()
-
     return {"status": "cancelled"}
\ No newline at end of file
@@ -0,0 +1,160 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from datetime import date, datetime
+
+from Backend.database import async_session, get_async_db
+from Backend.models.business import Business
+from Backend.routes.appointments import AppointmentPage
+from Backend.services import booking_service
+from Backend.services.appointment_listing import (
+    DEFAULT_PAGE_SIZE,
+    EXPORT_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    csv_lines,
+    listing_query,
+    ndjson_lines,
+    page_from_rows,
+)
+from Backend.services.timezones import business_zones, to_aware
+
+# Same paths and responses as routes/appointments.py, served from an AsyncSession
+router = APIRouter(prefix="/appointments", tags=["Appointments"])
+
+
+# ---------------------------------------------------------
+# CREATE APPOINTMENT (BOOK)
+# ---------------------------------------------------------
+@router.post("/book")
+async def book_appointment(
+    business_id: str,
+    customer_name: str,
+    customer_phone: str,
+    start_time: datetime,
+    duration_minutes: int = 30,
+    service_id: str | None = None,
+    resource_id: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # 1️⃣ Validate business
+    business = await db.get(Business, business_id)
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    # 2️⃣ Same locking booking path as the sync route, run on the async connection
+    def book(session):
+        appointment = booking_service.book_appointment(
+            session,
+            business_id=business_id,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            start_time=start_time,
+            duration_minutes=duration_minutes,
+            service_id=service_id,
+            resource_id=resource_id,
+            notify=False,
+        )
+        return appointment, business_zones.get(session, business_id)
+
+    try:
+        appointment, zone = await db.run_sync(book)
+    except booking_service.SlotUnavailableError:
+        raise HTTPException(status_code=409, detail="Time slot not available")
+    except booking_service.IneligibleResourceError:
+        raise HTTPException(status_code=400, detail="No eligible resource for this service")
+
+    # 3️⃣ Cache invalidation and reminder off the event loop
+    await run_in_threadpool(booking_service.after_booking, appointment, zone)
+    return {
+        "status": "booked",
+        "appointment_id": appointment.id,
+        "resource_id": appointment.resource_id,
+        "start_time": to_aware(appointment.start_time, zone),
+        "end_time": to_aware(appointment.end_time, zone),
+    }
+
+
+# ---------------------------------------------------------
+# LIST APPOINTMENTS FOR A BUSINESS
+# ---------------------------------------------------------
+@router.get("/", response_model=AppointmentPage)
+async def list_appointments(
+    business_id: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    zone = await db.run_sync(lambda session: business_zones.get(session, business_id))
+    try:
+        query = listing_query(business_id, zone, date_from, date_to, status, cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    return page_from_rows(rows, limit, zone)
+
+
+# ---------------------------------------------------------
+# EXPORT APPOINTMENTS (NDJSON / CSV STREAM)
+# ---------------------------------------------------------
+@router.get("/export")
+async def export_appointments(
+    business_id: str,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+):
+    async def stream():
+        # own session: the response body outlives the request dependencies
+        async with async_session() as db:
+            zone = await db.run_sync(lambda session: business_zones.get(session, business_id))
+            query = listing_query(business_id, zone, date_from, date_to, status)
+            result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            first = True
+            async for rows in result.partitions():
+                if export_format == "csv":
+                    lines = csv_lines(rows, zone, header=first)
+                else:
+                    lines = ndjson_lines(rows, zone)
+                for line in lines:
+                    yield line
+                first = False
+            if first and export_format == "csv":
+                for line in csv_lines([], zone):  # header only
+                    yield line
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="appointments.{export_format}"'},
+    )
+
+
+# ---------------------------------------------------------
+# CANCEL APPOINTMENT
+# ---------------------------------------------------------
+@router.post("/cancel")
+async def cancel_appointment(
+    appointment_id: str,
+    db: AsyncSession = Depends(get_async_db),
+):
+    def cancel(session):
+        appointment = booking_service.cancel_appointment(session, appointment_id, notify=False)
+        if appointment is None:
+            return None, None
+        return appointment, business_zones.get(session, appointment.business_id)
+
+    appointment, zone = await db.run_sync(cancel)
+
+    if not appointment:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+
+    await run_in_threadpool(booking_service.after_cancellation, appointment, zone)
+    return {"status": "cancelled"}
@@ -1,25 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-import jwt
-import os
 
 from Backend.database import get_db
 from Backend.models.business import Business
+from Backend.services.phone_routing import PhoneNumberTakenError, publish_numbers, set_primary_number
+from Backend.services.timezones import UnknownTimezoneError, get_zone
+from Backend.utils.phone import InvalidPhoneNumberError
+from Backend.utils.auth import create_access_token, get_current_business_id, revoke_tokens
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-SECRET_KEY = os.getenv("JWT_SECRET", "dev_secret")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_DAYS = 30
-
-
-def create_access_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
 
 @router.post("/register")
 def register_business(
@@ -28,22 +18,51 @@ def register_business(
     timezone: str = "UTC",
     db: Session = Depends(get_db),
 ):
+    try:
+        get_zone(timezone)
+    except UnknownTimezoneError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
     business = Business(
         name=name,
-        phone_number=phone_number,
         timezone=timezone,
     )
 
     db.add(business)
+    db.flush()
+    try:
+        set_primary_number(db, business, phone_number)
+    except InvalidPhoneNumberError as exc:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(exc))
+    except PhoneNumberTakenError as exc:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(exc))
     db.commit()
     db.refresh(business)
+    publish_numbers(db, business.id)
 
     token = create_access_token({
         "business_id": business.id
-    })
+    }, token_version=business.token_version)
 
     return {
         "business_id": business.id,
         "access_token": token,
         "token_type": "bearer",
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/revoke")
+def revoke_business_tokens(
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    # Every token issued so far stops working; hand back a fresh one
+    version = revoke_tokens(db, business_id)
+
+    return {
+        "business_id": business_id,
+        "access_token": create_access_token({"business_id": business_id}, token_version=version),
+        "token_type": "bearer",
+    }
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import List
 
 from Backend.database import get_db
 from Backend.utils.auth import get_current_business_id
-from Backend.models.business import BusinessHours
-from Backend.models.service import Service
-from Backend.models.appointment import Appointment
-from Backend.services.availability_service import get_available_slots
+from Backend.services.availability_cache import availability_cache
+from Backend.services.availability_service import (
+    MAX_NEXT_SLOTS,
+    MAX_RANGE_DAYS,
+    NEXT_SLOT_HORIZON_DAYS,
+    get_availability_range,
+    next_available_slots,
+)
 
 router = APIRouter(prefix="/availability", tags=["Availability"])
 
@@ -21,45 +26,106 @@ def get_availability(
 ):
     # Validate date format
     try:
-        requested_date = datetime.strptime(date, "%Y-%m-%d")
+        requested_date = datetime.strptime(date, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
 
-    day_of_week = requested_date.weekday()
+    # One-day range: cache-aware, computed in the business's timezone
+    days = get_availability_range(
+        db, business_id, requested_date, requested_date, [service_id], cache=availability_cache
+    )
+    return single_day_response(date, service_id, days)
 
-    business_hours = db.query(BusinessHours).filter(
-        BusinessHours.business_id == business_id,
-        BusinessHours.day_of_week == day_of_week,
-    ).first()
 
-    if not business_hours:
-        return {"available_slots": []}
+@router.get("/range")
+def get_availability_for_range(
+    date_from: str,
+    date_to: str,
+    service_ids: List[str] = Query(...),
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    start, end = parse_date_range(date_from, date_to)
+    days = get_availability_range(db, business_id, start, end, service_ids, cache=availability_cache)
+    return range_response(date_from, date_to, service_ids, days)
 
-    service = db.query(Service).filter(
-        Service.id == service_id,
-        Service.business_id == business_id,
-    ).first()
 
-    if not service:
+@router.get("/next")
+def get_next_available(
+    service_id: str,
+    count: int = Query(3, ge=1, le=MAX_NEXT_SLOTS),
+    after: datetime | None = None,
+    earliest: str | None = None,
+    latest: str | None = None,
+    weekdays: List[int] | None = Query(None),
+    horizon_days: int = Query(NEXT_SLOT_HORIZON_DAYS, ge=1, le=NEXT_SLOT_HORIZON_DAYS),
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    # Earliest `count` slots from now (or `after`), optionally within a daily window / weekdays
+    window = parse_time_window(earliest, latest, weekdays)
+    result = next_available_slots(
+        db, business_id, service_id, count, after, *window, horizon_days=horizon_days
+    )
+    if result is None:
         raise HTTPException(status_code=404, detail="Service not found")
+    return result
 
-    start_of_day = datetime.combine(requested_date.date(), datetime.min.time())
-    end_of_day = datetime.combine(requested_date.date(), datetime.max.time())
 
-    appointments = db.query(Appointment).filter(
-        Appointment.business_id == business_id,
-        Appointment.start_time >= start_of_day,
-        Appointment.start_time <= end_of_day,
-    ).all()
+def parse_time_window(earliest: str | None, latest: str | None, weekdays: List[int] | None):
+    """("HH:MM", "HH:MM", weekdays) -> (earliest minute, latest minute, weekdays)."""
+    minutes = []
+    for value in (earliest, latest):
+        if value is None:
+            minutes.append(None)
+            continue
+        try:
+            parsed = datetime.strptime(value, "%H:%M")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid time format, expected HH:MM")
+        minutes.append(parsed.hour * 60 + parsed.minute)
+    if minutes[0] is not None and minutes[1] is not None and minutes[1] <= minutes[0]:
+        raise HTTPException(status_code=400, detail="latest must be after earliest")
+    if weekdays and any(not 0 <= day <= 6 for day in weekdays):
+        raise HTTPException(status_code=400, detail="weekdays must be 0 (Mon) to 6 (Sun)")
+    return minutes[0], minutes[1], weekdays
 
-    slots = get_available_slots(
-        business_hours=business_hours,
-        appointments=appointments,
-        service_duration_minutes=service.duration_minutes,
-    )
+
+def parse_date_range(date_from: str, date_to: str):
+    # Validate date format
+    try:
+        start = datetime.strptime(date_from, "%Y-%m-%d").date()
+        end = datetime.strptime(date_to, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+
+    if end < start:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_RANGE_DAYS} days")
+    return start, end
+
+
+def range_response(date_from: str, date_to: str, service_ids: List[str], days):
+    found = set(days[0]["services"]) if days else set()
+    missing = [sid for sid in service_ids if sid not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Service not found: {', '.join(missing)}")
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "service_ids": service_ids,
+        "days": days,
+    }
+
+
+def single_day_response(date: str, service_id: str, days):
+    if service_id not in days[0]["services"]:
+        raise HTTPException(status_code=404, detail="Service not found")
 
     return {
         "date": date,
         "service_id": service_id,
-        "available_slots": slots,
-    }
\ No newline at end of file
+        "available_slots": days[0]["services"][service_id],
+    }
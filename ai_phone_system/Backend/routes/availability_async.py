@@ -0,0 +1,94 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime
+from typing import List
+
+from Backend.database import get_async_db
+from Backend.utils.auth import get_current_business_id_async
+from Backend.routes.availability import parse_date_range, parse_time_window, range_response, single_day_response
+from Backend.services.availability_cache import availability_cache
+from Backend.services.availability_service import (
+    MAX_NEXT_SLOTS,
+    NEXT_SLOT_HORIZON_DAYS,
+    busy_rows,
+    next_slot_search,
+    range_lookup,
+)
+
+# Same paths and responses as routes/availability.py, served from an AsyncSession.
+# Only queries run inside `run_sync`; cache calls and slot sweeps go to the threadpool.
+router = APIRouter(prefix="/availability", tags=["Availability"])
+
+
+async def _busy_rows(db: AsyncSession, business_id: str, span):
+    return await db.run_sync(lambda session: list(busy_rows(session, business_id, *span)))
+
+
+async def _availability_range(db: AsyncSession, business_id: str, date_from, date_to, service_ids):
+    lookup = await db.run_sync(
+        lambda session: range_lookup(
+            session, business_id, date_from, date_to, service_ids, cache=availability_cache
+        )
+    )
+    span = await run_in_threadpool(lookup.serve_cached)
+    if span is not None:
+        rows = await _busy_rows(db, business_id, span)
+        await run_in_threadpool(lookup.compute, rows)
+    return lookup.days()
+
+
+@router.get("/")
+async def get_availability(
+    date: str,
+    service_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str = Depends(get_current_business_id_async),
+):
+    # Validate date format
+    try:
+        requested_date = datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+
+    days = await _availability_range(db, business_id, requested_date, requested_date, [service_id])
+    return single_day_response(date, service_id, days)
+
+
+@router.get("/range")
+async def get_availability_for_range(
+    date_from: str,
+    date_to: str,
+    service_ids: List[str] = Query(...),
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str = Depends(get_current_business_id_async),
+):
+    start, end = parse_date_range(date_from, date_to)
+    days = await _availability_range(db, business_id, start, end, service_ids)
+    return range_response(date_from, date_to, service_ids, days)
+
+
+@router.get("/next")
+async def get_next_available(
+    service_id: str,
+    count: int = Query(3, ge=1, le=MAX_NEXT_SLOTS),
+    after: datetime | None = None,
+    earliest: str | None = None,
+    latest: str | None = None,
+    weekdays: List[int] | None = Query(None),
+    horizon_days: int = Query(NEXT_SLOT_HORIZON_DAYS, ge=1, le=NEXT_SLOT_HORIZON_DAYS),
+    db: AsyncSession = Depends(get_async_db),
+    business_id: str = Depends(get_current_business_id_async),
+):
+    window = parse_time_window(earliest, latest, weekdays)
+    search = await db.run_sync(
+        lambda session: next_slot_search(
+            session, business_id, service_id, count, after, *window, horizon_days=horizon_days
+        )
+    )
+    if search is None:
+        raise HTTPException(status_code=404, detail="Service not found")
+    while (span := search.next_span()) is not None:
+        rows = await _busy_rows(db, business_id, span)
+        await run_in_threadpool(search.sweep, rows)
+    return search.result()
@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from datetime import time
+from datetime import date, datetime, time
 from typing import List
 
 from Backend.database import get_db
-from Backend.models.business import Business, BusinessHours
+from Backend.models.business import Business, BusinessClosure, BusinessHours
 from Backend.utils.auth import get_current_business_id  # we’ll add this next
+from Backend.services.availability_cache import availability_cache
+from Backend.services.twiml_service import twiml_cache
+from Backend.services import phone_routing
+from Backend.services.schedule import schedule_cache
+from Backend.services.timezones import UnknownTimezoneError, business_zones, get_zone
+from Backend.utils.phone import InvalidPhoneNumberError
 
 router = APIRouter(prefix="/business", tags=["Business"])
 
@@ -17,11 +23,33 @@ from pydantic import BaseModel
 
 
 class HoursIn(BaseModel):
-    day_of_week: int  # 0 = Monday, 6 = Sunday
+    day_of_week: int  # 0 = Monday, 6 = Sunday; repeat a day for split shifts
     open_time: time
     close_time: time
 
 
+class ClosureIn(BaseModel):
+    start_date: date
+    end_date: date | None = None  # defaults to start_date
+    start_time: time | None = None  # omit both times to close all day
+    end_time: time | None = None
+    reason: str | None = None
+
+
+class SettingsIn(BaseModel):
+    name: str | None = None
+    phone_number: str | None = None
+    timezone: str | None = None
+    greeting: str | None = None
+    voice: str | None = None
+    stream_url: str | None = None
+
+
+class PhoneNumberIn(BaseModel):
+    number: str
+    kind: str = "forwarded"  # forwarded, ported
+
+
 # -----------------------------
 # SET BUSINESS HOURS
 # -----------------------------
@@ -35,6 +63,19 @@ def set_business_hours(
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
 
+    for h in hours:
+        if not 0 <= h.day_of_week <= 6:
+            raise HTTPException(status_code=400, detail="day_of_week must be between 0 (Monday) and 6 (Sunday)")
+        if h.close_time <= h.open_time:
+            raise HTTPException(status_code=400, detail="close_time must be after open_time")
+
+    # Weekdays whose hours change (old rows removed, new rows added)
+    changed_days = {
+        day for (day,) in db.query(BusinessHours.day_of_week).filter(
+            BusinessHours.business_id == business_id
+        )
+    } | {h.day_of_week for h in hours}
+
     # Clear existing hours
     db.query(BusinessHours).filter(
         BusinessHours.business_id == business_id
@@ -52,6 +93,9 @@ def set_business_hours(
         )
 
     db.commit()
+    schedule_cache.invalidate(business_id)
+    for day in changed_days:
+        availability_cache.invalidate_weekday(business_id, day)
     return {"status": "ok", "message": "Business hours saved"}
 
 
@@ -65,7 +109,7 @@ def get_business_hours(
 ):
     hours = db.query(BusinessHours).filter(
         BusinessHours.business_id == business_id
-    ).all()
+    ).order_by(BusinessHours.day_of_week, BusinessHours.open_time).all()
 
     return [
         {
@@ -74,4 +118,189 @@ def get_business_hours(
             "close_time": h.close_time,
         }
         for h in hours
-    ]
\ No newline at end of file
+    ]
+
+
+# -----------------------------
+# HOLIDAYS / CLOSURES
+# -----------------------------
+@router.post("/closures", status_code=201)
+def add_closure(
+    closure: ClosureIn,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    end_date = closure.end_date or closure.start_date
+    if end_date < closure.start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (closure.start_time is None) != (closure.end_time is None):
+        raise HTTPException(status_code=400, detail="Give both start_time and end_time, or neither")
+    if closure.start_time is not None and closure.end_time <= closure.start_time:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+
+    row = BusinessClosure(
+        business_id=business_id,
+        start_date=closure.start_date,
+        end_date=end_date,
+        start_time=closure.start_time,
+        end_time=closure.end_time,
+        reason=closure.reason,
+    )
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+
+    schedule_cache.invalidate(business_id)
+    availability_cache.invalidate_interval(
+        business_id,
+        datetime.combine(row.start_date, time.min),
+        datetime.combine(row.end_date, time.min),
+    )
+    return closure_out(row)
+
+
+@router.get("/closures")
+def list_closures(
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    rows = db.query(BusinessClosure).filter(
+        BusinessClosure.business_id == business_id,
+        BusinessClosure.end_date >= date.today(),
+    ).order_by(BusinessClosure.start_date).all()
+    return [closure_out(row) for row in rows]
+
+
+@router.delete("/closures/{closure_id}")
+def remove_closure(
+    closure_id: int,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    row = db.query(BusinessClosure).filter(
+        BusinessClosure.id == closure_id,
+        BusinessClosure.business_id == business_id,
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Closure not found")
+
+    start_date, end_date = row.start_date, row.end_date
+    db.delete(row)
+    db.commit()
+
+    schedule_cache.invalidate(business_id)
+    availability_cache.invalidate_interval(
+        business_id,
+        datetime.combine(start_date, time.min),
+        datetime.combine(end_date, time.min),
+    )
+    return {"status": "ok"}
+
+
+def closure_out(row: BusinessClosure):
+    return {
+        "id": row.id,
+        "start_date": row.start_date,
+        "end_date": row.end_date,
+        "start_time": row.start_time,
+        "end_time": row.end_time,
+        "reason": row.reason,
+    }
+
+
+# -----------------------------
+# UPDATE VOICE / PHONE SETTINGS
+# -----------------------------
+@router.patch("/settings")
+def update_business_settings(
+    settings: SettingsIn,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    business = db.query(Business).filter(Business.id == business_id).first()
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
+
+    values = settings.model_dump(exclude_unset=True)
+    try:
+        if "timezone" in values:
+            get_zone(values["timezone"])
+        if "phone_number" in values:
+            phone_routing.set_primary_number(db, business, values.pop("phone_number"))
+    except (InvalidPhoneNumberError, UnknownTimezoneError) as exc:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(exc))
+    except phone_routing.PhoneNumberTakenError as exc:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(exc))
+
+    timezone_changed = "timezone" in values and values["timezone"] != business.timezone
+    for field, value in values.items():
+        setattr(business, field, value)
+
+    db.commit()
+    phone_routing.publish_numbers(db, business_id)
+    # rendered greetings embed these settings
+    twiml_cache.invalidate_business(business_id)
+    if timezone_changed:
+        # every cached day was computed in the old zone
+        business_zones.invalidate(business_id)
+        availability_cache.invalidate_business(business_id)
+
+    return {
+        "status": "ok",
+        "settings": {
+            "name": business.name,
+            "phone_number": business.phone_number,
+            "timezone": business.timezone,
+            "greeting": business.greeting,
+            "voice": business.voice,
+            "stream_url": business.stream_url,
+        },
+    }
+
+
+# -----------------------------
+# PHONE NUMBERS (forwarded / ported)
+# -----------------------------
+@router.get("/phone-numbers")
+def list_phone_numbers(
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    return [
+        {"number": row.number, "kind": row.kind}
+        for row in phone_routing.list_numbers(db, business_id)
+    ]
+
+
+@router.post("/phone-numbers")
+def add_phone_number(
+    phone: PhoneNumberIn,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    if phone.kind == "primary":
+        raise HTTPException(status_code=400, detail="Set the primary number through /business/settings")
+    try:
+        row = phone_routing.add_number(db, business_id, phone.number, phone.kind)
+    except InvalidPhoneNumberError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except phone_routing.PhoneNumberTakenError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return {"status": "ok", "number": row.number, "kind": row.kind}
+
+
+@router.delete("/phone-numbers/{number}")
+def remove_phone_number(
+    number: str,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    try:
+        removed = phone_routing.remove_number(db, business_id, number)
+    except InvalidPhoneNumberError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if not removed:
+        raise HTTPException(status_code=404, detail="Phone number not found")
+    return {"status": "ok"}
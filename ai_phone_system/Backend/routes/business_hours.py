@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from Backend.database import get_db
 from Backend.models.business import BusinessHours
+from Backend.services.availability_cache import availability_cache
+from Backend.services.schedule import schedule_cache
 from pydantic import BaseModel
 from datetime import time
 
@@ -39,6 +41,9 @@ def create_business_hours(payload: BusinessHoursCreate, db: Session = Depends(ge
     db.add(bh)
     db.commit()
     db.refresh(bh)
+    # another row on the same weekday is a split shift
+    schedule_cache.invalidate(bh.business_id)
+    availability_cache.invalidate_weekday(bh.business_id, bh.day_of_week)
 
     return {"success": True, "business_hours": {
         "id": bh.id,
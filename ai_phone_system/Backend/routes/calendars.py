@@ -0,0 +1,128 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+
+from Backend.database import SessionLocal, get_db
+from Backend.models.calendar import CalendarConnection
+from Backend.models.resource import Resource
+from Backend.utils.auth import get_current_business_id, get_current_business_id_async
+from Backend.services.calender_service import PROVIDERS, calendar_sync, delete_connection
+
+router = APIRouter(prefix="/calendars", tags=["Calendars"])
+
+
+class CalendarIn(BaseModel):
+    provider: str  # google, outlook
+    calendar_id: str = "primary"
+    access_token: str
+    refresh_token: str | None = None
+    resource_id: str | None = None  # a staff member's own calendar
+
+
+class CalendarOut(BaseModel):
+    id: str
+    provider: str
+    calendar_id: str
+    resource_id: str | None
+    active: bool
+    last_synced_at: datetime | None
+    last_error: str | None
+
+    class Config:
+        orm_mode = True
+
+
+def _get_connection(db: Session, business_id: str, connection_id: str) -> CalendarConnection:
+    connection = db.query(CalendarConnection).filter(
+        CalendarConnection.id == connection_id,
+        CalendarConnection.business_id == business_id,
+    ).first()
+    if not connection:
+        raise HTTPException(status_code=404, detail="Calendar not found")
+    return connection
+
+
+def _create_connection(business_id: str, payload: CalendarIn) -> str:
+    db = SessionLocal()
+    try:
+        if payload.resource_id:
+            owner = db.query(Resource.id).filter(
+                Resource.id == payload.resource_id,
+                Resource.business_id == business_id,
+            ).first()
+            if not owner:
+                raise HTTPException(status_code=404, detail="Resource not found")
+
+        connection = CalendarConnection(
+            business_id=business_id,
+            provider=payload.provider,
+            calendar_id=payload.calendar_id,
+            access_token=payload.access_token,
+            refresh_token=payload.refresh_token,
+            resource_id=payload.resource_id,
+            last_synced_at=datetime.utcnow(),  # claimed: the first sync runs inline, not in the worker
+        )
+        db.add(connection)
+        db.commit()
+        return connection.id
+    finally:
+        db.close()
+
+
+def _load_connection(business_id: str, connection_id: str) -> CalendarConnection:
+    db = SessionLocal()
+    try:
+        connection = _get_connection(db, business_id, connection_id)
+        db.expunge(connection)
+        return connection
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# CONNECT A CALENDAR (first sync runs right away)
+# ---------------------------------------------------------
+# Async only for the provider sync; every Session call runs on the threadpool
+@router.post("/", response_model=CalendarOut, status_code=201)
+async def connect_calendar(
+    payload: CalendarIn,
+    business_id: str = Depends(get_current_business_id_async),
+):
+    if payload.provider not in PROVIDERS:
+        raise HTTPException(status_code=400, detail=f"provider must be one of {', '.join(PROVIDERS)}")
+
+    connection_id = await run_in_threadpool(_create_connection, business_id, payload)
+    await calendar_sync.sync_connection(connection_id)
+    return await run_in_threadpool(_load_connection, business_id, connection_id)
+
+
+@router.get("/", response_model=List[CalendarOut])
+def list_calendars(
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    return db.query(CalendarConnection).filter(
+        CalendarConnection.business_id == business_id
+    ).order_by(CalendarConnection.created_at).all()
+
+
+@router.post("/{connection_id}/sync")
+async def sync_calendar(
+    connection_id: str,
+    business_id: str = Depends(get_current_business_id_async),
+):
+    await run_in_threadpool(_load_connection, business_id, connection_id)
+    return await calendar_sync.sync_connection(connection_id)
+
+
+@router.delete("/{connection_id}")
+def disconnect_calendar(
+    connection_id: str,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    delete_connection(db, _get_connection(db, business_id, connection_id))
+    return {"status": "ok"}
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from datetime import date
+
+from Backend.database import get_db
+from Backend.services import call_log
+from Backend.services.availability_service import MAX_RANGE_DAYS
+from Backend.utils.auth import get_current_business_id
+
+router = APIRouter(prefix="/calls", tags=["Calls"])
+
+
+# ---------------------------------------------------------
+# LIST CALLS FOR A DATE RANGE
+# ---------------------------------------------------------
+@router.get("/")
+def list_calls(
+    date_from: date,
+    date_to: date | None = None,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    date_to = date_to or date_from
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if (date_to - date_from).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_RANGE_DAYS} days")
+
+    rows = call_log.calls_for_days(db, business_id, date_from, date_to)
+    return [dict(row._mapping) for row in rows]
+
+
+# ---------------------------------------------------------
+# TRANSCRIPT / EVENT LOG FOR ONE CALL
+# ---------------------------------------------------------
+@router.get("/{call_id}/transcript", response_class=PlainTextResponse)
+def get_call_transcript(
+    call_id: str,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    transcript = call_log.call_transcript(db, business_id, call_id)
+    if transcript is None:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+    return transcript
+
+
+@router.get("/{call_id}/events")
+def get_call_events(
+    call_id: str,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    return list(call_log.call_events(db, business_id, call_id))
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from Backend.database import SessionLocal
+from Backend.services import bulk_import
+from Backend.utils.auth import get_current_business_id
+
+router = APIRouter(prefix="/imports", tags=["Imports"])
+
+
+# ---------------------------------------------------------
+# UPLOADS: JSON array, CSV body, or a multipart "file" field
+# ---------------------------------------------------------
+async def _read_upload(request: Request):
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Upload the rows as a 'file' field")
+        body = await upload.read()
+        content_type = upload.content_type or ""
+        if (upload.filename or "").lower().endswith(".csv"):
+            content_type = "text/csv"
+        return body, content_type
+    return await request.body(), content_type
+
+
+def _run(importer, business_id: str, body: bytes, content_type: str, dry_run: bool):
+    # Parsing and writing tens of thousands of rows stays off the event loop
+    try:
+        rows = bulk_import.parse_rows(body, content_type)
+    except bulk_import.ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    db = SessionLocal()
+    try:
+        return importer(db, business_id, rows, dry_run=dry_run)
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# IMPORT APPOINTMENTS
+# ---------------------------------------------------------
+@router.post("/appointments")
+async def import_appointments(
+    request: Request,
+    dry_run: bool = False,
+    business_id: str = Depends(get_current_business_id),
+):
+    body, content_type = await _read_upload(request)
+    return await run_in_threadpool(
+        _run, bulk_import.import_appointments, business_id, body, content_type, dry_run
+    )
+
+
+# ---------------------------------------------------------
+# IMPORT SERVICES
+# ---------------------------------------------------------
+@router.post("/services")
+async def import_services(
+    request: Request,
+    dry_run: bool = False,
+    business_id: str = Depends(get_current_business_id),
+):
+    body, content_type = await _read_upload(request)
+    return await run_in_threadpool(
+        _run, bulk_import.import_services, business_id, body, content_type, dry_run
+    )
+
+
+# ---------------------------------------------------------
+# IMPORT BUSINESS HOURS (replaces the weekly schedule)
+# ---------------------------------------------------------
+@router.post("/hours")
+async def import_hours(
+    request: Request,
+    dry_run: bool = False,
+    business_id: str = Depends(get_current_business_id),
+):
+    body, content_type = await _read_upload(request)
+    return await run_in_threadpool(
+        _run, bulk_import.import_hours, business_id, body, content_type, dry_run
+    )
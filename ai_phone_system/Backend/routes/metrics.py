@@ -0,0 +1,157 @@
+import os
+import sys
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from Backend.database import get_engine
+from Backend.services.allocation import resource_pools
+from Backend.services.availability_cache import availability_cache
+from Backend.services.calender_service import calendar_sync
+from Backend.services.call_event_queue import call_event_queue
+from Backend.services.call_log import call_log_buffer
+from Backend.services.phone_routing import phone_router
+from Backend.services.reminders import reminder_scheduler
+from Backend.services.schedule import schedule_cache
+from Backend.services.twiml_service import twiml_cache
+from Backend.services.vapi_service import tool_latency
+from Backend.utils.auth import token_cache
+from Backend.utils.instrumentation import (
+    queries_total,
+    request_db_time,
+    request_latency,
+    request_queries,
+    slow_queries_total,
+)
+from Backend.utils.metrics import sample_lines
+
+# When set, scrapers must send "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _cache_lines():
+    # (hits, misses) per in-process cache; compiled caches miss when they rebuild
+    caches = {
+        "availability": (availability_cache.hits, availability_cache.misses),
+        "twiml": (twiml_cache.hits, twiml_cache.misses),
+        "auth_token": (token_cache.hits, token_cache.misses),
+        "phone_routing": (phone_router.hits, phone_router.misses),
+        "schedule": (schedule_cache.hits, schedule_cache.compiles),
+        "resource_pool": (resource_pools.hits, resource_pools.compiles),
+    }
+    ratios = {
+        name: hits / (hits + misses) if hits + misses else 0.0
+        for name, (hits, misses) in caches.items()
+    }
+    availability = availability_cache.stats()
+    return [
+        *sample_lines("cache_hits_total", "Cache lookups answered from memory", "counter",
+                      {name: hits for name, (hits, _) in caches.items()}, label="cache"),
+        *sample_lines("cache_misses_total", "Cache lookups that had to compute or query", "counter",
+                      {name: misses for name, (_, misses) in caches.items()}, label="cache"),
+        *sample_lines("cache_hit_ratio", "Hits over lookups since start", "gauge", ratios, label="cache"),
+        *sample_lines("availability_cache_invalidations_total", "Cached days dropped by writes", "counter",
+                      availability["invalidations"]),
+        *sample_lines("availability_cache_evictions_total", "Cached days evicted for space", "counter",
+                      availability["evictions"]),
+        *sample_lines("phone_routes", "Dialed numbers in the routing map", "gauge", len(phone_router)),
+    ]
+
+
+def _worker_lines():
+    events = call_event_queue.stats()
+    calendars = calendar_sync.stats()
+    reminders = reminder_scheduler.stats()
+    return [
+        *sample_lines("vapi_event_queue_depth", "Vapi events waiting to be written", "gauge", events["depth"]),
+        *sample_lines("vapi_event_queue_high_watermark", "Deepest the queue has been", "gauge",
+                      events["high_watermark"]),
+        *sample_lines("vapi_events_total", "Vapi events by what happened to them", "counter", {
+            outcome: events[outcome] for outcome in ("enqueued", "dropped", "spilled", "written", "failed")
+        }, label="outcome"),
+        *sample_lines("call_log_live_calls", "Calls buffered until hangup", "gauge", len(call_log_buffer)),
+        *sample_lines("calendar_syncs_total", "Calendar syncs by outcome", "counter", {
+            "ok": calendars["synced"],
+            "failed": calendars["failed"],
+            "not_modified": calendars["not_modified"],
+        }, label="outcome"),
+        *sample_lines("calendar_full_syncs_total", "Syncs that relisted the whole calendar", "counter",
+                      calendars["full_syncs"]),
+        *sample_lines("calendar_sync_changes_total", "Busy blocks added, moved or removed", "counter",
+                      calendars["changes"]),
+        *sample_lines("calendar_provider_requests_total", "Requests sent to calendar providers", "counter",
+                      calendars["requests"]),
+        *sample_lines("calendar_provider_throttled_total", "Provider 429 / 5xx responses retried", "counter",
+                      calendars["throttled"]),
+        *sample_lines("calendar_sync_last_run_seconds", "Duration of the last sync pass", "gauge",
+                      calendars["last_run_seconds"]),
+        *sample_lines("reminders_held", "Due SMS reminders held in memory", "gauge", reminders["held"]),
+        *sample_lines("reminders_total", "SMS reminders by outcome", "counter", {
+            outcome: reminders[outcome] for outcome in ("claimed", "sent", "rejected", "retried")
+        }, label="outcome"),
+        *sample_lines("reminder_window_loads_total", "Indexed loads of the due-reminder window", "counter",
+                      reminders["loads"]),
+        *sample_lines("twilio_sms_requests_total", "Requests sent to Twilio's Messages API", "counter",
+                      reminders["sms"]["requests"]),
+        *sample_lines("twilio_sms_throttled_total", "Twilio 429 / 5xx responses retried", "counter",
+                      reminders["sms"]["throttled"]),
+    ]
+
+
+def _media_lines():
+    # the media stream module (and NumPy) loads with the first call; until then nothing has streamed
+    media_stream = sys.modules.get("Backend.services.media_stream")
+    if media_stream is not None:
+        media = media_stream.media_streams.stats()
+    else:
+        media = dict.fromkeys(("active", "frames", "utterances", "dropped_samples", "batch_seconds"), 0)
+    return [
+        *sample_lines("media_streams_active", "Twilio media streams connected to this process", "gauge",
+                      media["active"]),
+        *sample_lines("media_stream_frames_total", "Inbound 20 ms audio frames received", "counter",
+                      media["frames"]),
+        *sample_lines("media_stream_utterances_total", "Utterances cut by the VAD", "counter",
+                      media["utterances"]),
+        *sample_lines("media_stream_dropped_samples_total", "Buffered audio overwritten before it was read",
+                      "counter", media["dropped_samples"]),
+        *sample_lines("media_stream_batch_seconds_total", "Time spent decoding and analysing inbound audio",
+                      "counter", media["batch_seconds"]),
+    ]
+
+
+def _pool_lines():
+    checked_out = getattr(get_engine().pool, "checkedout", None)
+    if checked_out is None:
+        return []
+    return sample_lines("db_pool_checked_out", "Connections currently checked out of the pool", "gauge",
+                        checked_out())
+
+
+def render_metrics() -> str:
+    lines = [
+        *request_latency.render(),
+        *request_queries.render(),
+        *request_db_time.render(),
+        *queries_total.render(),
+        *slow_queries_total.render(),
+        *tool_latency.render(),
+        *_cache_lines(),
+        *_worker_lines(),
+        *_media_lines(),
+        *_pool_lines(),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------
+# PROMETHEUS SCRAPE ENDPOINT
+# ---------------------------------------------------------
+@router.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
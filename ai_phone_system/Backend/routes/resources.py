@@ -0,0 +1,136 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import List
+
+from Backend.database import get_db
+from Backend.models.resource import Resource, ServiceResource
+from Backend.models.service import Service
+from Backend.utils.auth import get_current_business_id
+from Backend.services.allocation import resource_pools
+from Backend.services.availability_cache import availability_cache
+
+router = APIRouter(prefix="/resources", tags=["Resources"])
+
+
+class ResourceIn(BaseModel):
+    name: str
+    kind: str = "staff"  # staff, room, equipment
+    service_ids: List[str] | None = None  # services this resource can perform
+
+
+class ResourceOut(BaseModel):
+    id: str
+    name: str
+    kind: str
+    active: bool
+    service_ids: List[str]
+
+
+def _resource_out(resource: Resource, service_ids) -> ResourceOut:
+    return ResourceOut(
+        id=resource.id,
+        name=resource.name,
+        kind=resource.kind,
+        active=resource.active,
+        service_ids=list(service_ids),
+    )
+
+
+def _set_services(db: Session, business_id: str, resource_id: str, service_ids: List[str]):
+    found = {
+        service_id for (service_id,) in db.query(Service.id).filter(
+            Service.business_id == business_id,
+            Service.id.in_(service_ids),
+        )
+    }
+    missing = [sid for sid in service_ids if sid not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Service not found: {', '.join(missing)}")
+
+    db.query(ServiceResource).filter(ServiceResource.resource_id == resource_id).delete()
+    db.add_all(ServiceResource(service_id=sid, resource_id=resource_id) for sid in found)
+
+
+def _changed(business_id: str):
+    # who can do what changed: every computed day may differ
+    resource_pools.invalidate(business_id)
+    availability_cache.invalidate_business(business_id)
+
+
+@router.post("/", response_model=ResourceOut, status_code=201)
+def create_resource(
+    payload: ResourceIn,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    resource = Resource(business_id=business_id, name=payload.name, kind=payload.kind)
+    db.add(resource)
+    db.flush()
+    if payload.service_ids:
+        _set_services(db, business_id, resource.id, payload.service_ids)
+    db.commit()
+    db.refresh(resource)
+
+    _changed(business_id)
+    return _resource_out(resource, payload.service_ids or [])
+
+
+@router.get("/", response_model=List[ResourceOut])
+def list_resources(
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    resources = db.query(Resource).filter(
+        Resource.business_id == business_id
+    ).order_by(Resource.created_at).all()
+
+    services_by_resource = {}
+    for service_id, resource_id in db.query(ServiceResource.service_id, ServiceResource.resource_id).filter(
+        ServiceResource.resource_id.in_([r.id for r in resources])
+    ):
+        services_by_resource.setdefault(resource_id, []).append(service_id)
+
+    return [_resource_out(r, services_by_resource.get(r.id, [])) for r in resources]
+
+
+@router.put("/{resource_id}/services", response_model=ResourceOut)
+def set_resource_services(
+    resource_id: str,
+    service_ids: List[str],
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    resource = db.query(Resource).filter(
+        Resource.id == resource_id,
+        Resource.business_id == business_id,
+    ).first()
+    if not resource:
+        raise HTTPException(status_code=404, detail="Resource not found")
+
+    _set_services(db, business_id, resource_id, service_ids)
+    db.commit()
+
+    _changed(business_id)
+    return _resource_out(resource, service_ids)
+
+
+@router.delete("/{resource_id}")
+def deactivate_resource(
+    resource_id: str,
+    db: Session = Depends(get_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    # Deactivated, not deleted: existing appointments keep their resource
+    resource = db.query(Resource).filter(
+        Resource.id == resource_id,
+        Resource.business_id == business_id,
+    ).first()
+    if not resource:
+        raise HTTPException(status_code=404, detail="Resource not found")
+
+    resource.active = False
+    db.commit()
+
+    _changed(business_id)
+    return {"status": "ok"}
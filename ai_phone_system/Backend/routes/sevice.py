@@ -6,6 +6,7 @@ from typing import List
 from Backend.database import get_db
 from Backend.models.service import Service
 from Backend.utils.auth import get_current_business_id
+from Backend.services.availability_cache import availability_cache
 
 router = APIRouter(prefix="/services", tags=["Services"])
 
@@ -47,6 +48,7 @@ def create_service(
     db.add(s)
     db.commit()
     db.refresh(s)
+    availability_cache.invalidate_duration(business_id, s.duration_minutes)
     return s
 
 
@@ -1,17 +1,56 @@
-from fastapi import APIRouter, Request
+import json
+
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+from Backend.database import SessionLocal
+from Backend.services.twiml_service import FALLBACK_TWIML, load_voice_twiml, twiml_cache
+from Backend.utils.phone import try_normalize_e164
 
 router = APIRouter()
 
+
+def _lookup_twiml(to_number: str):
+    db = SessionLocal()
+    try:
+        return load_voice_twiml(db, to_number)
+    finally:
+        db.close()
+
+
 @router.post("/voice")
 async def twilio_voice(request: Request):
-    twiml = """
-    <Response>
-        <Say voice="alice">
-            Hello! Please hold while I connect you to our AI assistant.
-        </Say>
-        <Pause length="1"/>
-        <Say voice="alice">Goodbye.</Say>
-    </Response>
-    """
-    return Response(content=twiml.strip(), media_type="application/xml")
\ No newline at end of file
+    form = await request.form()
+    to_number = try_normalize_e164(form.get("To"))
+
+    # Cached TwiML is served without touching the database or the threadpool
+    twiml = twiml_cache.get(to_number) if to_number else None
+    if twiml is None and to_number:
+        twiml = await run_in_threadpool(_lookup_twiml, to_number)
+
+    return Response(content=twiml or FALLBACK_TWIML, media_type="application/xml")
+
+
+# ---------------------------------------------------------
+# MEDIA STREAMS (<Connect><Stream> WebSocket)
+# ---------------------------------------------------------
+@router.websocket("/media-stream")
+async def twilio_media_stream(websocket: WebSocket):
+    # NumPy and the codec tables load with the first stream, not with the app
+    from Backend.services.media_stream import handle_message, media_streams
+
+    await websocket.accept()
+    session = None
+    try:
+        while True:
+            message = json.loads(await websocket.receive_text())
+            session = await handle_message(session, message, websocket.send_text)
+            if message.get("event") == "stop":
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # hung up without a "stop": still flush and release the call
+        if session is not None:
+            await media_streams.close(session)
@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import ValidationError
+
+from Backend.services import vapi_service
+from Backend.services.call_event_queue import call_event_queue
 
 router = APIRouter()
 
 @router.post("/")
 async def vapi_webhook(request: Request):
+    if not vapi_service.verify_secret(request.headers):
+        raise HTTPException(status_code=401, detail="Invalid Vapi secret")
     body = await request.json()
 
-    print("\n--- VAPI EVENT RECEIVED ---")
-    print(body)
-    print("--- END EVENT ---\n")
+    # Tool / function calls are answered in-process while the caller waits
+    try:
+        response = await vapi_service.dispatch(body)
+    except ValidationError:
+        raise HTTPException(status_code=422, detail="Malformed Vapi tool call")
+    if response is not None:
+        return response
 
-    # For now, just acknowledge
-    return {"status": "ok"}
\ No newline at end of file
+    # Everything else (status updates, transcripts, reports) is stored in the background
+    call_event_queue.put(body)
+    return {"status": "ok"}
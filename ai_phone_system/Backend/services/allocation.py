@@ -0,0 +1,137 @@
+import hashlib
+
+from sqlalchemy.orm import Session
+
+from Backend.models.resource import Resource, ServiceResource
+from Backend.services.schedule import ScheduleCache
+from Backend.services.slot_engine import free_slots_in, to_minute
+
+
+# ---------------------------------------------------------
+# RESOURCE POOL (who can do what, compiled per business)
+# ---------------------------------------------------------
+class ResourcePool:
+    """
+    Active resources of a business and which of them can perform each service.
+
+    An empty pool means the business books as one single resource.
+    """
+
+    __slots__ = ("resources", "eligible")
+
+    def __init__(self, resources, eligibility):
+        self.resources = tuple(resources)  # active resource ids, oldest first
+        self.eligible = {}
+        for service_id, resource_ids in eligibility.items():
+            allowed = set(resource_ids)
+            self.eligible[service_id] = tuple(r for r in self.resources if r in allowed)
+
+    def for_service(self, service_id: str | None):
+        """
+        Resource ids that can perform `service_id`, or None in single-resource mode.
+
+        Services without eligibility rows can be done by every active resource.
+        """
+        if not self.resources:
+            return None
+        return self.eligible.get(service_id, self.resources)
+
+
+def load_resource_pool(db: Session, business_id: str) -> ResourcePool:
+    resources = [
+        resource_id for (resource_id,) in db.query(Resource.id).filter(
+            Resource.business_id == business_id,
+            Resource.active.is_(True),
+        ).order_by(Resource.created_at, Resource.id)
+    ]
+    eligibility = {}
+    if resources:
+        for service_id, resource_id in db.query(ServiceResource.service_id, ServiceResource.resource_id).join(
+            Resource, Resource.id == ServiceResource.resource_id
+        ).filter(Resource.business_id == business_id):
+            eligibility.setdefault(service_id, []).append(resource_id)
+    return ResourcePool(resources, eligibility)
+
+
+# Rebuilt on resource / eligibility writes
+resource_pools = ScheduleCache(load_resource_pool)
+
+
+def pool_variant(resource_ids) -> str:
+    """Short stable cache discriminator for a set of eligible resources."""
+    if resource_ids is None:
+        return ""
+    return hashlib.sha1(",".join(sorted(resource_ids)).encode()).hexdigest()[:12]
+
+
+# ---------------------------------------------------------
+# AVAILABILITY: at least one eligible resource free
+# ---------------------------------------------------------
+def split_busy(appointments, day_start, buffer_minutes: int = 0):
+    """
+    Busy minute intervals per resource, plus the ones every resource shares.
+
+    `appointments` expose `start_time`, `end_time` and `resource_id`; rows
+    without a resource (booked before resources existed) block everyone.
+    """
+    shared = []
+    by_resource = {}
+    for appt in appointments:
+        interval = (
+            to_minute(appt.start_time, day_start) - buffer_minutes,
+            to_minute(appt.end_time, day_start, round_up=True) + buffer_minutes,
+        )
+        if appt.resource_id is None:
+            shared.append(interval)
+        else:
+            by_resource.setdefault(appt.resource_id, []).append(interval)
+    return shared, by_resource
+
+
+def resource_free_slots(
+        open_intervals,
+        shared,
+        by_resource,
+        resource_ids,
+        duration_minutes: int,
+        increment_minutes: int,
+):
+    """
+    (start, end) minute pairs at which at least one of `resource_ids` is free.
+
+    Each resource's bookings are swept on their own, so the cost grows with
+    resources + bookings rather than their product. Resources with no
+    bookings share one sweep.
+    """
+    starts = set()
+    idle_swept = False
+    for resource_id in resource_ids:
+        own = by_resource.get(resource_id)
+        if not own:
+            if idle_swept:
+                continue
+            idle_swept = True
+        busy = shared + own if own else shared
+        for start, _ in free_slots_in(open_intervals, busy, duration_minutes, increment_minutes):
+            starts.add(start)
+    return [(start, start + duration_minutes) for start in sorted(starts)]
+
+
+# ---------------------------------------------------------
+# BOOKING: pick the resource
+# ---------------------------------------------------------
+def pick_resource(candidates, overlapping, day_load):
+    """
+    Chooses a free resource among `candidates` for an interval, or None.
+
+    `overlapping` are the resource ids of scheduled appointments overlapping
+    the interval (None for unassigned ones, which block every resource).
+    Ties go to the resource with the fewest bookings that day, then pool order.
+    """
+    busy = set(overlapping)
+    if None in busy:
+        return None
+    free = [resource_id for resource_id in candidates if resource_id not in busy]
+    if not free:
+        return None
+    return min(free, key=lambda resource_id: day_load.get(resource_id, 0))
@@ -0,0 +1,282 @@
+import argparse
+import os
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from Backend.models.analytics import DailyRollup, HourlyRollup
+from Backend.models.appointment import Appointment
+from Backend.models.service import Service
+from Backend.services.timezones import business_zones, day_frame, to_local
+
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "366"))  # longest range a dashboard may show
+ANALYTICS_BACKFILL_DAYS = int(os.getenv("ANALYTICS_BACKFILL_DAYS", "31"))  # local days per backfill transaction
+
+# Dashboards read rollup rows (one per local day, at most 24 per day for hours), never the
+# appointments table. Booking, cancel and import add to them in the appointment's own
+# transaction; revenue uses the service price at that moment. A backfill recomputes from
+# appointments with current prices: run one after upgrading, and for a business whose
+# timezone changed (its local days moved).
+DAILY = DailyRollup.__table__
+HOURLY = HourlyRollup.__table__
+
+
+# ---------------------------------------------------------
+# TALLYING
+# ---------------------------------------------------------
+def tally(rows, zone):
+    """
+    Rollup counts for rows of (start_time, status, price_cents):
+    ({day: [bookings, cancellations, revenue_cents]}, {(day, hour): [bookings, cancellations]}).
+    """
+    daily = defaultdict(lambda: [0, 0, 0])
+    hourly = defaultdict(lambda: [0, 0])
+    for start_time, status, price_cents in rows:
+        local = to_local(start_time, zone)
+        day, hour = local.date(), local.hour
+        cancelled = status == "cancelled"
+        counts = daily[day]
+        counts[0] += 1
+        counts[1] += cancelled
+        if not cancelled:
+            counts[2] += price_cents or 0
+        counts = hourly[(day, hour)]
+        counts[0] += 1
+        counts[1] += cancelled
+    return daily, hourly
+
+
+def _daily_rows(business_id: str, daily):
+    return [{"business_id": business_id, "day": day, "bookings": bookings, "cancellations": cancellations,
+             "revenue_cents": revenue} for day, (bookings, cancellations, revenue) in sorted(daily.items())]
+
+
+def _hourly_rows(business_id: str, hourly):
+    return [{"business_id": business_id, "day": day, "hour": hour, "bookings": bookings,
+             "cancellations": cancellations} for (day, hour), (bookings, cancellations) in sorted(hourly.items())]
+
+
+# ---------------------------------------------------------
+# INCREMENTAL UPDATES (inside the caller's transaction)
+# ---------------------------------------------------------
+def _add(db: Session, table, keys, rows):
+    """
+    Adds the counts in `rows` to the rollup rows with the same `keys`,
+    creating missing ones: INSERT ... ON CONFLICT DO UPDATE on Postgres and
+    SQLite, UPDATE then INSERT elsewhere. Rows go in key order, so
+    concurrent writers lock them in the same order.
+    """
+    if not rows:
+        return
+    counts = [c for c in rows[0] if c not in keys]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        statement = upsert(table).values(rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={c: table.c[c] + statement.excluded[c] for c in counts},
+        ))
+        return
+    for row in rows:
+        updated = db.execute(
+            update(table)
+            .where(*(table.c[k] == row[k] for k in keys))
+            .values({c: table.c[c] + row[c] for c in counts})
+        ).rowcount
+        if not updated:
+            db.execute(insert(table).values(row))
+
+
+def _price(service_id: str | None):
+    """The service's price as a scalar subquery: no extra round-trip on the booking path."""
+    if service_id is None:
+        return 0
+    return func.coalesce(select(Service.price_cents).where(Service.id == service_id).scalar_subquery(), 0)
+
+
+def _record(db: Session, appointment: Appointment, zone, bookings: int, cancellations: int, revenue):
+    local = to_local(appointment.start_time, zone)
+    day = local.date()
+    _add(db, DAILY, ("business_id", "day"), [{
+        "business_id": appointment.business_id, "day": day,
+        "bookings": bookings, "cancellations": cancellations, "revenue_cents": revenue,
+    }])
+    _add(db, HOURLY, ("business_id", "day", "hour"), [{
+        "business_id": appointment.business_id, "day": day, "hour": local.hour,
+        "bookings": bookings, "cancellations": cancellations,
+    }])
+
+
+def record_booking(db: Session, appointment: Appointment, zone):
+    """Counts a new appointment; call before committing it."""
+    cancelled = appointment.status == "cancelled"
+    _record(db, appointment, zone, 1, int(cancelled), 0 if cancelled else _price(appointment.service_id))
+
+
+def record_cancellation(db: Session, appointment: Appointment, zone):
+    """Counts an appointment leaving scheduled / completed for cancelled; call before committing."""
+    _record(db, appointment, zone, 0, 1, -_price(appointment.service_id))
+
+
+def record_imported(db: Session, business_id: str, zone, mappings, prices):
+    """Counts bulk-inserted appointment mappings; `prices` maps service id -> price_cents."""
+    daily, hourly = tally(
+        ((m["start_time"], m["status"], prices.get(m["service_id"])) for m in mappings), zone
+    )
+    _add(db, DAILY, ("business_id", "day"), _daily_rows(business_id, daily))
+    _add(db, HOURLY, ("business_id", "day", "hour"), _hourly_rows(business_id, hourly))
+
+
+# ---------------------------------------------------------
+# DASHBOARD READS (one row per day, at most 24 per day for hours)
+# ---------------------------------------------------------
+def daily_rollups(db: Session, business_id: str, date_from: date, date_to: date):
+    """Every day in [date_from, date_to] with its counts, zero-filled."""
+    rows = {
+        row.day: row for row in db.query(
+            DailyRollup.day, DailyRollup.bookings, DailyRollup.cancellations, DailyRollup.revenue_cents
+        ).filter(
+            DailyRollup.business_id == business_id,
+            DailyRollup.day >= date_from,
+            DailyRollup.day <= date_to,
+        )
+    }
+    days = []
+    day = date_from
+    while day <= date_to:
+        row = rows.get(day)
+        days.append({
+            "day": day,
+            "bookings": row.bookings if row else 0,
+            "cancellations": row.cancellations if row else 0,
+            "revenue_cents": row.revenue_cents if row else 0,
+        })
+        day += timedelta(days=1)
+    return days
+
+
+def hourly_rollups(db: Session, business_id: str, date_from: date, date_to: date):
+    """Bookings and cancellations per local hour (0-23) summed over [date_from, date_to]."""
+    rows = {
+        row.hour: row for row in db.query(
+            HourlyRollup.hour,
+            func.sum(HourlyRollup.bookings).label("bookings"),
+            func.sum(HourlyRollup.cancellations).label("cancellations"),
+        ).filter(
+            HourlyRollup.business_id == business_id,
+            HourlyRollup.day >= date_from,
+            HourlyRollup.day <= date_to,
+        ).group_by(HourlyRollup.hour)
+    }
+    return [{
+        "hour": hour,
+        "bookings": rows[hour].bookings if hour in rows else 0,
+        "cancellations": rows[hour].cancellations if hour in rows else 0,
+    } for hour in range(24)]
+
+
+# ---------------------------------------------------------
+# BACKFILL (recompute from appointments, one chunk of days per transaction)
+# ---------------------------------------------------------
+def rebuild_days(db: Session, business_id: str, date_from: date, date_to: date) -> int:
+    """
+    Recomputes the rollups of [date_from, date_to] from appointments; returns
+    the appointments read. Holds the business's write lock until the caller
+    commits, so bookings and cancels made meanwhile wait instead of being lost.
+    """
+    from Backend.services.booking_service import lock_business_writes  # booking_service imports this module
+
+    zone = business_zones.get(db, business_id)
+    lock_business_writes(db, business_id)
+    for model in (DailyRollup, HourlyRollup):
+        db.query(model).filter(
+            model.business_id == business_id, model.day >= date_from, model.day <= date_to
+        ).delete(synchronize_session=False)
+
+    rows = db.query(Appointment.start_time, Appointment.status, Service.price_cents).outerjoin(
+        Service, Service.id == Appointment.service_id
+    ).filter(
+        Appointment.business_id == business_id,
+        Appointment.start_time >= day_frame(zone, date_from).start,
+        Appointment.start_time < day_frame(zone, date_to).end,
+    ).all()
+    daily, hourly = tally(rows, zone)
+    if daily:
+        db.execute(insert(DAILY), _daily_rows(business_id, daily))
+        db.execute(insert(HOURLY), _hourly_rows(business_id, hourly))
+    return len(rows)
+
+
+def backfill_business(db: Session, business_id: str, date_from: date | None = None, date_to: date | None = None,
+                      days_per_chunk: int = ANALYTICS_BACKFILL_DAYS) -> dict:
+    """
+    Rebuilds a business's rollups over [date_from, date_to] (default: all
+    of its appointments) in chunks of `days_per_chunk` local days, one
+    transaction each, so live traffic only ever waits for one chunk.
+    """
+    if date_from is None or date_to is None:
+        first, last = db.query(func.min(Appointment.start_time), func.max(Appointment.start_time)).filter(
+            Appointment.business_id == business_id
+        ).one()
+        db.rollback()
+        if first is None:
+            return {"chunks": 0, "appointments": 0}
+        zone = business_zones.get(db, business_id)
+        date_from = date_from or to_local(first, zone).date()
+        date_to = date_to or to_local(last, zone).date()
+
+    chunks = appointments = 0
+    day = date_from
+    while day <= date_to:
+        end = min(day + timedelta(days=days_per_chunk - 1), date_to)
+        appointments += rebuild_days(db, business_id, day, end)
+        db.commit()
+        chunks += 1
+        day = end + timedelta(days=1)
+    return {"chunks": chunks, "appointments": appointments}
+
+
+def main():
+    """
+    Backfill command. Run from `ai_phone_system/`:
+
+        python -m Backend.services.analytics
+        python -m Backend.services.analytics --business <id> --from 2025-01-01
+    """
+    from Backend.database import SessionLocal
+    from Backend.models.business import Business
+
+    parser = argparse.ArgumentParser(description="Rebuild dashboard rollups from appointments, in chunks of days.")
+    parser.add_argument("--business", action="append", help="business id (repeatable; default: every business)")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="first local day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="last local day (YYYY-MM-DD)")
+    parser.add_argument("--days-per-chunk", type=int, default=ANALYTICS_BACKFILL_DAYS)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        business_ids = args.business or [row[0] for row in db.query(Business.id).order_by(Business.id)]
+        db.rollback()
+        t0 = time.perf_counter()
+        totals = {"chunks": 0, "appointments": 0}
+        for n, business_id in enumerate(business_ids, start=1):
+            stats = backfill_business(db, business_id, args.date_from, args.date_to, args.days_per_chunk)
+            for key in totals:
+                totals[key] += stats[key]
+            print(f"[{n}/{len(business_ids)}] {business_id}: {stats['appointments']} appointments, "
+                  f"{stats['chunks']} chunks")
+        print(f"rebuilt {len(business_ids)} businesses ({totals['appointments']} appointments, "
+              f"{totals['chunks']} chunks) in {time.perf_counter() - t0:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
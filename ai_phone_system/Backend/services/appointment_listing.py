@@ -0,0 +1,116 @@
+import base64
+import csv
+import io
+import json
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+from sqlalchemy import and_, or_, select
+
+from Backend.models.appointment import Appointment
+from Backend.services.timezones import day_frame, to_aware
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+
+# Lean projection: plain column rows, no ORM identity map or relationships
+LIST_COLUMNS = (
+    Appointment.id,
+    Appointment.customer_name,
+    Appointment.customer_phone,
+    Appointment.start_time,
+    Appointment.end_time,
+    Appointment.status,
+    Appointment.created_at,
+)
+EXPORT_FIELDS = [column.key for column in LIST_COLUMNS]
+TIME_FIELDS = ("start_time", "end_time", "created_at")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(start_time: datetime, appointment_id: str) -> str:
+    raw = json.dumps([start_time.isoformat(), appointment_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        start_time, appointment_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(start_time), appointment_id
+    except (ValueError, TypeError):
+        raise InvalidCursorError(cursor)
+
+
+def listing_query(
+        business_id: str,
+        zone: ZoneInfo,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None,
+        cursor: str | None = None,
+):
+    """
+    Builds the keyset-ordered (start_time, id) select for a business.
+
+    `date_from` / `date_to` are inclusive local days of the business
+    (`zone`); `cursor` resumes strictly after the last row of the previous page.
+    """
+    query = select(*LIST_COLUMNS).where(Appointment.business_id == business_id)
+
+    if date_from:
+        query = query.where(Appointment.start_time >= day_frame(zone, date_from).start)
+    if date_to:
+        query = query.where(Appointment.start_time < day_frame(zone, date_to).end)
+    if status:
+        query = query.where(Appointment.status == status)
+    if cursor:
+        after_start, after_id = decode_cursor(cursor)
+        query = query.where(or_(
+            Appointment.start_time > after_start,
+            and_(Appointment.start_time == after_start, Appointment.id > after_id),
+        ))
+
+    return query.order_by(Appointment.start_time, Appointment.id)
+
+
+def row_out(row, zone: ZoneInfo) -> dict:
+    """A listed row with its times aware in the business's timezone."""
+    item = dict(row._mapping)
+    for field in TIME_FIELDS:
+        item[field] = to_aware(item[field], zone)
+    return item
+
+
+def page_from_rows(rows, limit: int, zone: ZoneInfo):
+    """
+    Splits `limit + 1` fetched rows into the page and the next cursor.
+    """
+    items = [row_out(row, zone) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.start_time, last.id)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def ndjson_lines(rows, zone: ZoneInfo):
+    for row in rows:
+        yield json.dumps(row_out(row, zone), default=str) + "\n"
+
+
+def csv_lines(rows, zone: ZoneInfo, header: bool = True):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        item = row_out(row, zone)
+        writer.writerow([item[field] for field in EXPORT_FIELDS])
+        if buffer.tell() > 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,181 @@
+import os
+
+import numpy as np
+
+# Twilio Media Streams carry 8 kHz mono G.711 μ-law, 20 ms (160 byte) frames
+TWILIO_SAMPLE_RATE = 8000
+TWILIO_FRAME_SAMPLES = 160
+
+VAD_THRESHOLD_DBFS = float(os.getenv("VAD_THRESHOLD_DBFS", "-45"))  # never speech below this
+VAD_MARGIN_DB = float(os.getenv("VAD_MARGIN_DB", "12"))  # speech: this far above the noise floor
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "400"))  # silence that ends an utterance
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "100"))  # shorter bursts are clicks, not speech
+
+NOISE_FLOOR_RISE = 0.01  # share of the gap to the quietest frame closed per frame
+
+_BIAS = 0x84
+_CLIP = 32635  # 8159 << 2
+
+
+# ---------------------------------------------------------
+# G.711 μ-LAW (lookup tables built once, vectorised)
+# ---------------------------------------------------------
+def _build_decode_table():
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + _BIAS) << exponent) - _BIAS
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_encode_table():
+    # the reference (Sun / ITU) encoder works on 14-bit samples
+    samples = np.arange(-32768, 32768, dtype=np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), _CLIP >> 2) + (_BIAS >> 2)
+    segment = np.floor(np.log2(magnitude)).astype(np.int32) - 5
+    mantissa = (magnitude >> (np.minimum(segment, 7) + 1)) & 0x0F
+    code = np.where(segment >= 8, 0x7F, (segment << 4) | mantissa)
+    return (code ^ mask).astype(np.uint8)
+
+
+ULAW_DECODE = _build_decode_table()  # code -> int16 sample
+ULAW_ENCODE = _build_encode_table()  # int16 sample + 32768 -> code
+
+
+def ulaw_decode(payload: bytes) -> np.ndarray:
+    """μ-law bytes -> int16 samples, one table lookup for the whole buffer."""
+    return ULAW_DECODE[np.frombuffer(payload, dtype=np.uint8)]
+
+
+def ulaw_encode(samples: np.ndarray) -> bytes:
+    """int16 samples -> μ-law bytes."""
+    return ULAW_ENCODE[samples.astype(np.int32) + 32768].tobytes()
+
+
+# ---------------------------------------------------------
+# RESAMPLING (streaming, continuous across chunks)
+# ---------------------------------------------------------
+def _lowpass(cutoff: float, taps: int) -> np.ndarray:
+    """Windowed-sinc FIR; `cutoff` in cycles per input sample."""
+    n = np.arange(taps) - (taps - 1) / 2
+    h = np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (h / h.sum()).astype(np.float32)
+
+
+class Resampler:
+    """
+    Linear-interpolation resampler that keeps its phase between chunks,
+    so a stream resampled chunk by chunk equals the stream resampled at
+    once. Downsampling low-passes first so speech does not alias.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, taps: int = 31):
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.step = src_rate / dst_rate
+        self._fir = _lowpass(0.45 * dst_rate / src_rate, taps) if dst_rate < src_rate else None
+        self._history = np.zeros(taps - 1, dtype=np.float32)
+        self._previous = 0.0  # last input sample, at position 0 of the next chunk
+        self._phase = 1.0  # position of the next output sample in [previous, *chunk]
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if self.src_rate == self.dst_rate or not len(samples):
+            return samples
+        x = samples.astype(np.float32)
+        if self._fir is not None:
+            padded = np.concatenate((self._history, x))
+            self._history = padded[len(padded) - len(self._history):]
+            x = np.convolve(padded, self._fir, mode="valid")
+
+        buffer = np.concatenate(([self._previous], x))
+        last = len(buffer) - 1
+        positions = np.arange(self._phase, last + 1e-9, self.step)
+        self._previous = float(buffer[-1])
+        if not len(positions):
+            self._phase -= len(x)
+            return np.zeros(0, dtype=np.int16)
+
+        self._phase = positions[-1] + self.step - last
+        out = np.interp(positions, np.arange(len(buffer)), buffer)
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+
+
+# ---------------------------------------------------------
+# VOICE ACTIVITY DETECTION (energy per frame, batched)
+# ---------------------------------------------------------
+def frame_energy_dbfs(samples: np.ndarray, frame_samples: int = TWILIO_FRAME_SAMPLES) -> np.ndarray:
+    """RMS level of each whole frame in dBFS (-inf is clamped to about -90)."""
+    frames = len(samples) // frame_samples
+    x = samples[:frames * frame_samples].reshape(frames, frame_samples).astype(np.float32)
+    rms = np.sqrt(np.mean(x * x, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1.0) / 32768)
+
+
+class VoiceActivityDetector:
+    """
+    Energy VAD over batches of frames.
+
+    A frame is speech when it is above both `threshold_dbfs` and the
+    tracked noise floor plus `margin_db`. An utterance starts after
+    `min_speech_ms` of speech and ends after `hangover_ms` of silence.
+    Levels are computed for the whole batch at once; only the small
+    per-frame state machine is a Python loop.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = TWILIO_SAMPLE_RATE,
+        frame_ms: int = 20,
+        threshold_dbfs: float = VAD_THRESHOLD_DBFS,
+        margin_db: float = VAD_MARGIN_DB,
+        hangover_ms: int = VAD_HANGOVER_MS,
+        min_speech_ms: int = VAD_MIN_SPEECH_MS,
+    ):
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.threshold_dbfs = threshold_dbfs
+        self.margin_db = margin_db
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.noise_floor = threshold_dbfs - margin_db
+        self.speaking = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self.frames = 0  # frames seen so far
+
+    def process(self, samples: np.ndarray):
+        """
+        Feeds whole frames; returns (frame number, "start" | "end") events.
+        A start is dated to the first frame of its speech run.
+        """
+        levels = frame_energy_dbfs(samples, self.frame_samples)
+        if not len(levels):
+            return []
+        active = levels > max(self.threshold_dbfs, self.noise_floor + self.margin_db)
+
+        # noise floor: drops at once to a quieter frame, rises slowly (~2 s) so
+        # steady background noise stops counting as speech
+        quietest = float(levels.min())
+        if quietest < self.noise_floor:
+            self.noise_floor = quietest
+        else:
+            rise = 1 - (1 - NOISE_FLOOR_RISE) ** len(levels)
+            self.noise_floor += rise * (quietest - self.noise_floor)
+
+        events = []
+        for i, is_speech in enumerate(active.tolist()):
+            frame = self.frames + i
+            if is_speech:
+                self._speech_run += 1
+                self._silence_run = 0
+                if not self.speaking and self._speech_run >= self.min_speech_frames:
+                    self.speaking = True
+                    events.append((frame - self._speech_run + 1, "start"))
+            else:
+                self._speech_run = 0
+                self._silence_run += 1
+                if self.speaking and self._silence_run >= self.hangover_frames:
+                    self.speaking = False
+                    events.append((frame - self._silence_run + 1, "end"))
+        self.frames += len(levels)
+        return events
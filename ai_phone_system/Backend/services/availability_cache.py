@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date as date_type, datetime, timedelta
+
+CACHE_URL = os.getenv("AVAILABILITY_CACHE_URL")  # e.g. redis://localhost:6379/0
+CACHE_TTL_SECONDS = int(os.getenv("AVAILABILITY_CACHE_TTL_SECONDS", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("AVAILABILITY_CACHE_MAX_ENTRIES", "10000"))
+
+
+# ---------------------------------------------------------
+# BACKENDS
+# ---------------------------------------------------------
+class LocalCacheBackend:
+    """
+    In-process LRU cache with a TTL per entry.
+
+    Every key is registered under a set of tags so writers can drop exactly
+    the entries they affect. Also serves as the stand-in backend for tests.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: int = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}  # tag -> set of keys
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, tags):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_tag(self, tag) -> int:
+        with self._lock:
+            keys = self._tags.pop(tag, ())
+            for key in list(keys):
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    """
+    Redis-backed cache shared by every worker.
+
+    Values are stored as JSON with a TTL; each tag is a Redis set listing
+    the keys registered under it.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int = CACHE_TTL_SECONDS, prefix: str = "avail:"):
+        import redis  # optional dependency, only needed for a shared cache
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.evictions = 0  # evictions are handled by Redis itself
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, tags):
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, json.dumps(value), ex=self.ttl_seconds)
+        for tag in tags:
+            pipe.sadd(self.prefix + "tag:" + tag, key)
+            pipe.expire(self.prefix + "tag:" + tag, self.ttl_seconds)
+        pipe.execute()
+
+    def invalidate_tag(self, tag) -> int:
+        tag_key = self.prefix + "tag:" + tag
+        keys = [k.decode() for k in self.client.smembers(tag_key)]
+        pipe = self.client.pipeline()
+        for key in keys:
+            pipe.delete(self.prefix + key)
+        pipe.delete(tag_key)
+        pipe.execute()
+        return len(keys)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+# ---------------------------------------------------------
+# AVAILABILITY CACHE
+# ---------------------------------------------------------
+class AvailabilityCache:
+    """
+    Computed slot lists keyed by (business_id, date, service duration).
+
+    Entries are tagged by business + date, business + weekday and
+    business + duration, which are the three things writers change.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(business_id: str, day: date_type, duration_minutes: int, variant: str = "") -> str:
+        key = f"{business_id}:{day.isoformat()}:{duration_minutes}"
+        return f"{key}:{variant}" if variant else key
+
+    def get(self, business_id: str, day: date_type, duration_minutes: int, variant: str = ""):
+        """`variant` separates services of equal duration done by different resources."""
+        value = self.backend.get(self._key(business_id, day, duration_minutes, variant))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, business_id: str, day: date_type, duration_minutes: int, slots, variant: str = ""):
+        self.backend.set(
+            self._key(business_id, day, duration_minutes, variant),
+            slots,
+            (
+                f"{business_id}:date:{day.isoformat()}",
+                f"{business_id}:weekday:{day.weekday()}",
+                f"{business_id}:duration:{duration_minutes}",
+            ),
+        )
+
+    def invalidate_interval(
+        self,
+        business_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        buffer_minutes: int = 0,
+    ):
+        """Drops every day a booking (plus its buffer) touches."""
+        day = (start_time - timedelta(minutes=buffer_minutes)).date()
+        last_day = (end_time + timedelta(minutes=buffer_minutes)).date()
+        while day <= last_day:
+            self.invalidations += self.backend.invalidate_tag(f"{business_id}:date:{day.isoformat()}")
+            day += timedelta(days=1)
+
+    def invalidate_weekday(self, business_id: str, day_of_week: int):
+        self.invalidations += self.backend.invalidate_tag(f"{business_id}:weekday:{day_of_week}")
+
+    def invalidate_business(self, business_id: str):
+        """Drops every cached day of a business (e.g. its timezone changed)."""
+        for day_of_week in range(7):
+            self.invalidate_weekday(business_id, day_of_week)
+
+    def invalidate_duration(self, business_id: str, duration_minutes: int):
+        self.invalidations += self.backend.invalidate_tag(f"{business_id}:duration:{duration_minutes}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.backend.evictions,
+        }
+
+
+def build_cache() -> AvailabilityCache:
+    if CACHE_URL:
+        return AvailabilityCache(RedisCacheBackend(CACHE_URL))
+    return AvailabilityCache(LocalCacheBackend())
+
+
+availability_cache = build_cache()
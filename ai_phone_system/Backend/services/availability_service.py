@@ -1,11 +1,126 @@
-from datetime import datetime, timedelta
+import os
+from bisect import bisect_right
+from datetime import datetime, timedelta, date as date_type
+from itertools import chain, islice
 from sqlalchemy.orm import Session
-from Backend.models.business import BusinessHours
 from Backend.models.appointment import Appointment
+from Backend.models.calendar import ExternalBusyBlock
+from Backend.models.service import Service
+from Backend.services.allocation import pool_variant, resource_free_slots, resource_pools, split_busy
+from Backend.services.schedule import schedule_cache
+from Backend.services.slot_engine import busy_intervals, format_slots, free_slots_in
+from Backend.services.timezones import UTC, business_zones, day_frame, day_frames, to_local, to_utc
 
 DEFAULT_SLOT_MINUTES = 30
 SLOT_INCREMENT_MINUTES = 15  # step between possible slots
 BUFFER_MINUTES = 5  # optional buffer after appointments
+MAX_RANGE_DAYS = 31  # longest span a single range lookup may cover
+
+# "Next available" search: hard cap on how far ahead it looks, and the
+# number of open days whose bookings are loaded in its first query
+NEXT_SLOT_HORIZON_DAYS = int(os.getenv("NEXT_SLOT_HORIZON_DAYS", "90"))
+NEXT_SLOT_FIRST_WINDOW_DAYS = 3
+MAX_NEXT_SLOTS = 20
+
+
+def slots_for_day(
+        date: date_type,
+        open_intervals,
+        appointments,
+        service_duration_minutes: int,
+        slot_increment_minutes: int = SLOT_INCREMENT_MINUTES,
+        buffer_minutes: int = BUFFER_MINUTES,
+        frame=None,
+        resources=None
+):
+    """
+    Computes available slots for one day from already-loaded rows.
+
+    `open_intervals` are the day's (open, close) wall-minute pairs from its
+    `WeeklySchedule`; `appointments` are the bookings (naive UTC) overlapping
+    that day; no queries are made. `frame` is the business-local `DayFrame`
+    of `date` (UTC when omitted); wall times are placed on it and slot
+    durations are real minutes, so DST days get 23 or 25 hours.
+
+    With `resources` (eligible resource ids) a slot is offered when at
+    least one of them is free; without, the business is one resource.
+    """
+    if isinstance(date, datetime):
+        date = date.date()
+    if frame is None:
+        frame = day_frame(UTC, date)
+
+    slots = day_slot_minutes(
+        open_intervals, appointments, service_duration_minutes, slot_increment_minutes, buffer_minutes,
+        frame, resources,
+    )
+    if frame.transition is None:
+        return format_slots(slots)
+    return [(frame.label(start), frame.label(end)) for start, end in slots]
+
+
+def day_slot_minutes(open_intervals, appointments, service_duration_minutes: int, slot_increment_minutes: int,
+                     buffer_minutes: int, frame, resources=None):
+    """`slots_for_day` as unformatted (start, end) real minutes since `frame.start`."""
+    if frame.transition is None:
+        real_intervals = open_intervals
+    else:
+        real_intervals = [
+            (frame.wall_to_minute(open_minute), frame.wall_to_minute(close_minute, later=True))
+            for open_minute, close_minute in open_intervals
+        ]
+
+    if resources is None:
+        return free_slots_in(
+            real_intervals,
+            busy_intervals(appointments, frame.start, buffer_minutes),
+            service_duration_minutes,
+            slot_increment_minutes,
+        )
+    shared, by_resource = split_busy(appointments, frame.start, buffer_minutes)
+    return resource_free_slots(
+        real_intervals,
+        shared,
+        by_resource,
+        resources,
+        service_duration_minutes,
+        slot_increment_minutes,
+    )
+
+
+def busy_rows(db: Session, business_id: str, start: datetime, end: datetime):
+    """
+    Scheduled appointments and synced external calendar blocks overlapping
+    [start, end) (naive UTC), as (start_time, end_time, resource_id) rows.
+    """
+    appointments = db.query(Appointment.start_time, Appointment.end_time, Appointment.resource_id).filter(
+        Appointment.business_id == business_id,
+        Appointment.status == "scheduled",
+        Appointment.start_time < end,
+        Appointment.end_time > start,
+    )
+    blocks = db.query(ExternalBusyBlock.start_time, ExternalBusyBlock.end_time, ExternalBusyBlock.resource_id).filter(
+        ExternalBusyBlock.business_id == business_id,
+        ExternalBusyBlock.start_time < end,
+        ExternalBusyBlock.end_time > start,
+    )
+    return chain(appointments, blocks)
+
+
+def busy_rows_by_day(rows, frames):
+    """
+    Buckets busy rows per local day they touch. `frames` are sorted but
+    need not be consecutive: days missing from them are skipped.
+    """
+    frame_starts = [frame.start for frame in frames]
+    by_day = {}
+    for row in rows:
+        i = max(bisect_right(frame_starts, row.start_time) - 1, 0)
+        while i < len(frames) and frames[i].start < row.end_time:
+            if frames[i].end > row.start_time:
+                by_day.setdefault(frames[i].day, []).append(row)
+            i += 1
+    return by_day
 
 
 def get_available_slots(
@@ -14,54 +129,364 @@ def get_available_slots(
         date: datetime,
         service_duration_minutes: int,
         slot_increment_minutes: int = SLOT_INCREMENT_MINUTES,
-        buffer_minutes: int = BUFFER_MINUTES
+        buffer_minutes: int = BUFFER_MINUTES,
+        service_id: str | None = None
 ):
     """
     Returns available time slots for a business on a given date.
 
     Slots are generated in increments of `slot_increment_minutes`.
     Appointments are respected with an optional `buffer_minutes` between them.
+    `date` is a day in the business's own timezone; pass `service_id` to
+    only count the resources that can perform it.
     """
-    weekday = date.weekday()  # 0 = Monday
-
-    # 1️⃣ Get business hours for that day
-    hours = db.query(BusinessHours).filter(
-        BusinessHours.business_id == business_id,
-        BusinessHours.day_of_week == weekday
-    ).first()
+    if isinstance(date, datetime):
+        date = date.date()
 
-    if not hours:
+    # 1️⃣ Compiled opening hours for that day (shifts minus closures)
+    open_intervals = schedule_cache.get(db, business_id).open_intervals(date)
+    if not open_intervals:
         return []
 
-    start_dt = datetime.combine(date.date(), hours.open_time)
-    end_dt = datetime.combine(date.date(), hours.close_time)
+    # 2️⃣ Get bookings and external calendar blocks overlapping the local day (UTC bounds)
+    frame = day_frame(business_zones.get(db, business_id), date)
+    appointments = list(busy_rows(db, business_id, frame.start, frame.end))
 
-    # 2️⃣ Get existing appointments for that day
-    appointments = db.query(Appointment).filter(
-        Appointment.business_id == business_id,
-        Appointment.start_time < end_dt,  # appointments that overlap the day
-        Appointment.end_time > start_dt
+    # 3️⃣ Sweep the free gaps between the merged bookings
+    return slots_for_day(
+        date,
+        open_intervals,
+        appointments,
+        service_duration_minutes,
+        slot_increment_minutes=slot_increment_minutes,
+        buffer_minutes=buffer_minutes,
+        frame=frame,
+        resources=resource_pools.get(db, business_id).for_service(service_id),
+    )
+
+
+def get_availability_range(
+        db: Session,
+        business_id: str,
+        date_from: date_type,
+        date_to: date_type,
+        service_ids,
+        slot_increment_minutes: int = SLOT_INCREMENT_MINUTES,
+        buffer_minutes: int = BUFFER_MINUTES,
+        cache=None
+):
+    """
+    Returns available slots for every day in [date_from, date_to] and every service.
+
+    Services and bookings are each loaded once for the whole range and hours
+    come from the compiled `WeeklySchedule`, so the number of queries does
+    not grow with the number of days or services.
+    Unknown service ids are left out of `services`. Days are local to the
+    business's timezone; their UTC offsets are computed once for the range.
+
+    When an `AvailabilityCache` is given, cached days are served from it and
+    bookings are only loaded for the span of days that missed.
+    """
+    lookup = range_lookup(
+        db, business_id, date_from, date_to, service_ids, slot_increment_minutes, buffer_minutes, cache
+    )
+    span = lookup.serve_cached()
+    if span is not None:
+        lookup.compute(busy_rows(db, business_id, *span))
+    return lookup.days()
+
+
+def range_lookup(
+        db: Session,
+        business_id: str,
+        date_from: date_type,
+        date_to: date_type,
+        service_ids,
+        slot_increment_minutes: int = SLOT_INCREMENT_MINUTES,
+        buffer_minutes: int = BUFFER_MINUTES,
+        cache=None
+):
+    """The queries that start a `RangeLookup`: compiled hours, services, resources and zone."""
+    # 1️⃣ Compiled weekly hours and closures (no query unless rebuilt)
+    schedule = schedule_cache.get(db, business_id)
+
+    # 2️⃣ Requested services, grouped by (duration, eligible resources)
+    services = db.query(Service.id, Service.duration_minutes).filter(
+        Service.business_id == business_id,
+        Service.id.in_(service_ids),
     ).all()
+    return RangeLookup(
+        business_id,
+        date_from,
+        date_to,
+        schedule,
+        services,
+        resource_pools.get(db, business_id),
+        business_zones.get(db, business_id),
+        slot_increment_minutes,
+        buffer_minutes,
+        cache,
+    )
+
+
+class RangeLookup:
+    """
+    The steps of `get_availability_range` after its first queries. Nothing
+    here touches the database: the caller loads `busy_rows` for the span
+    `serve_cached` returns, so the async routes can run that query on their
+    AsyncSession and the cache and slot work off the event loop.
+    """
+
+    def __init__(self, business_id, date_from, date_to, schedule, services, pool, zone,
+                 slot_increment_minutes, buffer_minutes, cache):
+        self.business_id = business_id
+        self.date_from = date_from
+        self.date_to = date_to
+        self.schedule = schedule
+        self.services = services
+        self.zone = zone
+        self.slot_increment_minutes = slot_increment_minutes
+        self.buffer_minutes = buffer_minutes
+        self.cache = cache
+        self.variant_of = {
+            service.id: (service.duration_minutes, pool.for_service(service.id)) for service in services
+        }
+        # -> cache variant
+        self.variants = {variant: pool_variant(variant[1]) for variant in set(self.variant_of.values())}
+        self.results = {}  # (day, duration, resources) -> slots
+        self.missing_days = []
+        self.frames = []
+
+    def serve_cached(self):
+        """
+        3️⃣ Serves whatever the cache already holds; returns the UTC span whose
+        busy rows the missing days need, or None if nothing is missing.
+        """
+        day = self.date_from
+        while day <= self.date_to:
+            if self.schedule.is_open(day):
+                for (duration, resources), cache_variant in self.variants.items():
+                    slots = self.cache.get(self.business_id, day, duration, cache_variant) if self.cache else None
+                    if slots is None:
+                        self.missing_days.append(day)
+                        break
+                    self.results[(day, duration, resources)] = slots
+            day += timedelta(days=1)
+
+        if not self.missing_days:
+            return None
+        self.frames = day_frames(self.zone, self.missing_days[0], self.missing_days[-1])
+        return self.frames[0].start, self.frames[-1].end
+
+    def compute(self, rows):
+        """
+        4️⃣ Buckets every booking and external calendar block of the span per
+        local day it touches, then 5️⃣ computes the missing days in memory.
+        """
+        appointments_by_day = busy_rows_by_day(rows, self.frames)
+        frames_by_day = {frame.day: frame for frame in self.frames}
+        for day in self.missing_days:
+            for (duration, resources), cache_variant in self.variants.items():
+                slots = slots_for_day(
+                    day,
+                    self.schedule.open_intervals(day),
+                    appointments_by_day.get(day, []),
+                    duration,
+                    slot_increment_minutes=self.slot_increment_minutes,
+                    buffer_minutes=self.buffer_minutes,
+                    frame=frames_by_day[day],
+                    resources=resources,
+                )
+                if self.cache:
+                    self.cache.set(self.business_id, day, duration, slots, cache_variant)
+                self.results[(day, duration, resources)] = slots
+
+    def days(self):
+        days = []
+        day = self.date_from
+        while day <= self.date_to:
+            days.append({
+                "date": day.isoformat(),
+                "services": {
+                    service.id: self.results.get((day, *self.variant_of[service.id]), [])
+                    for service in self.services
+                },
+            })
+            day += timedelta(days=1)
+        return days
+
+
+def _fits_window(open_intervals, duration_minutes: int, earliest: int | None, latest: int | None) -> bool:
+    """Whether a slot of `duration_minutes` could lie inside the open hours and the time-of-day window."""
+    low = 0 if earliest is None else earliest
+    high = 24 * 60 if latest is None else latest
+    return any(min(close, high) - max(start, low) >= duration_minutes for start, close in open_intervals)
+
+
+def next_available_slots(
+        db: Session,
+        business_id: str,
+        service_id: str,
+        count: int = 3,
+        after: datetime | None = None,
+        earliest: int | None = None,
+        latest: int | None = None,
+        weekdays=None,
+        horizon_days: int = NEXT_SLOT_HORIZON_DAYS,
+        slot_increment_minutes: int = SLOT_INCREMENT_MINUTES,
+        buffer_minutes: int = BUFFER_MINUTES
+):
+    """
+    The first `count` free slots of a service at or after `after` (default
+    now), or None if the service does not exist. A naive `after` is wall
+    time in the business's timezone, as for bookings.
+
+    `earliest` / `latest` are wall minutes the slot must lie within;
+    `weekdays` (0 = Mon) limits the days searched. Days that are closed or
+    filtered out are skipped from the compiled hours without a query;
+    bookings are loaded for windows of 3, 6, 12... open days and the walk
+    stops at the `count`-th slot. Never looks past `horizon_days`
+    (capped at NEXT_SLOT_HORIZON_DAYS) from the first day.
+    """
+    search = next_slot_search(
+        db, business_id, service_id, count, after, earliest, latest, weekdays, horizon_days,
+        slot_increment_minutes, buffer_minutes,
+    )
+    if search is None:
+        return None
+    while (span := search.next_span()) is not None:
+        search.sweep(busy_rows(db, business_id, *span))
+    return search.result()
+
+
+def next_slot_search(
+        db: Session,
+        business_id: str,
+        service_id: str,
+        count: int = 3,
+        after: datetime | None = None,
+        earliest: int | None = None,
+        latest: int | None = None,
+        weekdays=None,
+        horizon_days: int = NEXT_SLOT_HORIZON_DAYS,
+        slot_increment_minutes: int = SLOT_INCREMENT_MINUTES,
+        buffer_minutes: int = BUFFER_MINUTES
+):
+    """The queries that start a `NextSlotSearch`, or None if the service does not exist."""
+    # 1️⃣ Service, compiled hours, zone and eligible resources
+    service = db.query(Service.duration_minutes).filter(
+        Service.id == service_id,
+        Service.business_id == business_id,
+    ).first()
+    if service is None:
+        return None
+    return NextSlotSearch(
+        service_id,
+        service.duration_minutes,
+        schedule_cache.get(db, business_id),
+        business_zones.get(db, business_id),
+        resource_pools.get(db, business_id).for_service(service_id),
+        count,
+        after,
+        earliest,
+        latest,
+        weekdays,
+        horizon_days,
+        slot_increment_minutes,
+        buffer_minutes,
+    )
+
+
+class NextSlotSearch:
+    """
+    The walk of `next_available_slots` without its queries: `next_span`
+    names the UTC span of the next window of open days, the caller loads
+    its `busy_rows` and hands them to `sweep`, until `next_span` is None.
+    """
+
+    def __init__(self, service_id, duration, schedule, zone, resources, count, after, earliest, latest,
+                 weekdays, horizon_days, slot_increment_minutes, buffer_minutes):
+        self.service_id = service_id
+        self.duration = duration
+        self.schedule = schedule
+        self.zone = zone
+        self.resources = resources
+        self.count = count
+        self.earliest = earliest
+        self.latest = latest
+        self.slot_increment_minutes = slot_increment_minutes
+        self.buffer_minutes = buffer_minutes
 
-    booked_slots = [
-        (appt.start_time - timedelta(minutes=buffer_minutes),
-         appt.end_time + timedelta(minutes=buffer_minutes))
-        for appt in appointments
-    ]
-    booked_slots.sort()  # optional, for faster checking
+        self.after = to_utc(after, zone) if after else datetime.utcnow()
+        self.first_day = to_local(self.after, zone).date()
+        self.last_day = self.first_day + timedelta(days=max(1, min(horizon_days, NEXT_SLOT_HORIZON_DAYS)) - 1)
+        self.weekdays = set(weekdays) if weekdays else None
 
-    # 3️⃣ Generate available slots
-    slots = []
-    current = start_dt
+        self.found = []
+        self.searched_to = self.first_day
+        self._days = self._candidate_days()
+        self._window = NEXT_SLOT_FIRST_WINDOW_DAYS
+        self._frames = []
 
-    while current + timedelta(minutes=service_duration_minutes) <= end_dt:
-        slot_end = current + timedelta(minutes=service_duration_minutes)
+    # 2️⃣ Days that can hold a slot at all, straight from the compiled hours
+    def _candidate_days(self):
+        day = self.first_day
+        while day <= self.last_day:
+            if (self.weekdays is None or day.weekday() in self.weekdays) and _fits_window(
+                self.schedule.open_intervals(day), self.duration, self.earliest, self.latest
+            ):
+                yield day
+            day += timedelta(days=1)
 
-        # Check for overlaps
-        overlap = any(not (slot_end <= bs or current >= be) for bs, be in booked_slots)
-        if not overlap:
-            slots.append((current.strftime("%H:%M"), slot_end.strftime("%H:%M")))
+    def next_span(self):
+        """3️⃣ UTC span of the next, doubled window of open days; None once done."""
+        if len(self.found) >= self.count:
+            return None
+        batch = list(islice(self._days, self._window))
+        if not batch:
+            self.searched_to = self.last_day
+            return None
+        self._window *= 2
+        self._frames = [day_frame(self.zone, day) for day in batch]
+        return self._frames[0].start, self._frames[-1].end
 
-        current += timedelta(minutes=slot_increment_minutes)
+    def sweep(self, rows):
+        """Sweeps the window's days in order, stopping at the `count`-th slot."""
+        by_day = busy_rows_by_day(rows, self._frames)
+        for frame in self._frames:
+            self.searched_to = frame.day
+            slots = day_slot_minutes(
+                self.schedule.open_intervals(frame.day),
+                by_day.get(frame.day, []),
+                self.duration,
+                self.slot_increment_minutes,
+                self.buffer_minutes,
+                frame,
+                self.resources,
+            )
+            for start, end in slots:
+                starts_at = frame.start + timedelta(minutes=start)
+                if starts_at < self.after:
+                    continue
+                if self.earliest is not None and frame.wall_minute(start) < self.earliest:
+                    continue
+                if self.latest is not None and frame.wall_minute(end) > self.latest:
+                    continue
+                self.found.append({
+                    "date": frame.day.isoformat(),
+                    "start": frame.label(start),
+                    "end": frame.label(end),
+                    "start_time": starts_at.replace(tzinfo=UTC).astimezone(self.zone).isoformat(timespec="minutes"),
+                })
+                if len(self.found) == self.count:
+                    return
 
-    return slots
\ No newline at end of file
+    def result(self):
+        return {
+            "service_id": self.service_id,
+            "duration_minutes": self.duration,
+            "slots": self.found,
+            "searched_from": self.first_day.isoformat(),
+            "searched_to": self.searched_to.isoformat(),
+            "complete": len(self.found) == self.count,
+        }
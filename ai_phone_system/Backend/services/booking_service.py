@@ -0,0 +1,258 @@
+from datetime import datetime, timedelta
+from itertools import chain
+from sqlalchemy import func, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from Backend.models.appointment import Appointment
+from Backend.models.business import Business
+from Backend.models.calendar import ExternalBusyBlock
+from Backend.services.allocation import pick_resource, resource_pools
+from Backend.services.availability_cache import availability_cache
+from Backend.services.availability_service import BUFFER_MINUTES
+from Backend.services import analytics, reminders
+from Backend.services.timezones import business_zones, to_local, to_utc
+
+
+class SlotUnavailableError(Exception):
+    """Raised when the requested interval overlaps a scheduled appointment."""
+
+
+class IneligibleResourceError(Exception):
+    """Raised when no active resource (or not the requested one) can perform the service."""
+
+
+def _overlap_query(db: Session, business_id: str, start_time: datetime, end_time: datetime):
+    return db.query(Appointment.id).filter(
+        Appointment.business_id == business_id,
+        Appointment.start_time < end_time,
+        Appointment.end_time > start_time,
+        Appointment.status == "scheduled",
+    )
+
+
+def _blocked_query(db: Session, business_id: str, start_time: datetime, end_time: datetime):
+    """Synced external calendar blocks overlapping the interval."""
+    return db.query(ExternalBusyBlock.resource_id).filter(
+        ExternalBusyBlock.business_id == business_id,
+        ExternalBusyBlock.start_time < end_time,
+        ExternalBusyBlock.end_time > start_time,
+    )
+
+
+def lock_business(db: Session, business_id: str):
+    """
+    Serialises bookings for one business inside the current transaction.
+
+    Postgres takes a transaction-scoped advisory lock keyed by the business,
+    other server databases lock the business row with SELECT ... FOR UPDATE.
+    Bookings for different businesses never wait on each other.
+    SQLite has no row locks; `book_appointment` relies on its single
+    database write lock instead.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": business_id})
+    elif dialect != "sqlite":
+        db.query(Business.id).filter(Business.id == business_id).with_for_update().first()
+
+
+def lock_business_writes(db: Session, business_id: str):
+    """
+    `lock_business` for batch writers (imports, rollup backfills) that read
+    before they write. SQLite has no row locks: a no-op write takes its
+    database write lock up front instead.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text("UPDATE businesses SET id = id WHERE id = :id"), {"id": business_id})
+    else:
+        lock_business(db, business_id)
+
+
+def _allocate(db: Session, business_id: str, candidates, start_time: datetime, end_time: datetime,
+              exclude_id: str = ""):
+    """
+    Picks a free resource for [start_time, end_time) among `candidates`, or None.
+
+    Must run while this transaction holds the business lock (or SQLite's
+    write lock), so what it reads cannot change before commit.
+    """
+    overlapping = db.query(Appointment.resource_id).filter(
+        Appointment.business_id == business_id,
+        Appointment.start_time < end_time,
+        Appointment.end_time > start_time,
+        Appointment.status == "scheduled",
+        Appointment.id != exclude_id,
+    )
+
+    # spread the day's work: fewest bookings in the surrounding 24h wins ties
+    day_load = dict(
+        db.query(Appointment.resource_id, func.count()).filter(
+            Appointment.business_id == business_id,
+            Appointment.resource_id.in_(candidates),
+            Appointment.status == "scheduled",
+            Appointment.start_time >= start_time - timedelta(hours=12),
+            Appointment.start_time < start_time + timedelta(hours=12),
+            Appointment.id != exclude_id,
+        ).group_by(Appointment.resource_id).all()
+    )
+    blocked = _blocked_query(db, business_id, start_time, end_time)
+    return pick_resource(candidates, [row[0] for row in chain(overlapping, blocked)], day_load)
+
+
+def book_appointment(
+        db: Session,
+        business_id: str,
+        customer_name: str,
+        customer_phone: str,
+        start_time: datetime,
+        duration_minutes: int,
+        service_id: str | None = None,
+        resource_id: str | None = None,
+        notify: bool = True,
+) -> Appointment:
+    """
+    Books an appointment, raising `SlotUnavailableError` on any overlap
+    with a scheduled appointment or a synced external calendar block.
+
+    A naive `start_time` is wall time in the business's timezone; aware
+    values are converted. The appointment is stored in naive UTC.
+
+    Businesses with resources get one assigned in the same transaction:
+    `resource_id` if given (it must be able to perform `service_id`),
+    otherwise the least-loaded eligible resource that is free. Businesses
+    without resources book as a single resource, as before.
+
+    Safe under concurrent callers:
+    - Postgres / MySQL: per-business lock, then check, then insert. The
+      `appointments_no_overlap` / `appointments_resource_no_overlap`
+      exclusion constraints are a backstop on Postgres.
+    - SQLite: insert first, then check. The INSERT takes SQLite's database
+      write lock, so a competing booking blocks until this one commits and
+      then sees it in its own check.
+
+    `notify=False` leaves the post-commit cache and reminder work to the
+    caller (`after_booking`), e.g. to run it off the event loop.
+    """
+    zone = business_zones.get(db, business_id)
+    start_time = to_utc(start_time, zone)
+    end_time = start_time + timedelta(minutes=duration_minutes)
+
+    candidates = resource_pools.get(db, business_id).for_service(service_id)
+    if resource_id is not None:
+        if candidates is None or resource_id not in candidates:
+            raise IneligibleResourceError(resource_id, service_id)
+        candidates = (resource_id,)
+    elif candidates == ():
+        raise IneligibleResourceError(None, service_id)
+
+    appointment = Appointment(
+        business_id=business_id,
+        service_id=service_id,
+        resource_id=candidates[0] if candidates else None,
+        customer_name=customer_name,
+        customer_phone=customer_phone,
+        start_time=start_time,
+        end_time=end_time,
+        status="scheduled",
+    )
+
+    try:
+        if db.get_bind().dialect.name == "sqlite":
+            db.add(appointment)
+            db.flush()
+            if candidates is None:
+                conflict = _overlap_query(db, business_id, start_time, end_time).filter(
+                    Appointment.id != appointment.id
+                ).first() or _blocked_query(db, business_id, start_time, end_time).first()
+            else:
+                # write lock held from here on: choose against committed state
+                appointment.resource_id = _allocate(
+                    db, business_id, candidates, start_time, end_time, exclude_id=appointment.id
+                )
+                conflict = appointment.resource_id is None
+                if not conflict:
+                    db.flush()
+        else:
+            lock_business(db, business_id)
+            if candidates is None:
+                conflict = (
+                    _overlap_query(db, business_id, start_time, end_time).first()
+                    or _blocked_query(db, business_id, start_time, end_time).first()
+                )
+            else:
+                appointment.resource_id = _allocate(db, business_id, candidates, start_time, end_time)
+                conflict = appointment.resource_id is None
+            if not conflict:
+                db.add(appointment)
+                db.flush()
+
+        if conflict:
+            db.rollback()
+            raise SlotUnavailableError(business_id, start_time, end_time)
+
+        analytics.record_booking(db, appointment, zone)
+        db.commit()
+    except IntegrityError:
+        # exclusion constraint fired: another transaction won the slot
+        db.rollback()
+        raise SlotUnavailableError(business_id, start_time, end_time)
+
+    db.refresh(appointment)
+    if notify:
+        after_booking(appointment, zone)
+    return appointment
+
+
+def after_booking(appointment: Appointment, zone):
+    """Post-commit work of a booking: cached days and the reminder. No database access."""
+    # cached days are local to the business
+    availability_cache.invalidate_interval(
+        appointment.business_id,
+        to_local(appointment.start_time, zone),
+        to_local(appointment.end_time, zone),
+        BUFFER_MINUTES,
+    )
+    reminders.on_booked(appointment)
+
+
+def cancel_appointment(db: Session, appointment_id: str, business_id: str | None = None,
+                       notify: bool = True) -> Appointment | None:
+    """
+    Cancels an appointment and frees its slot; returns None if it does not exist.
+
+    Pass `business_id` to only match appointments of that business.
+    `notify=False` leaves the post-commit work to `after_cancellation`.
+    """
+    query = db.query(Appointment).filter(Appointment.id == appointment_id)
+    if business_id:
+        query = query.filter(Appointment.business_id == business_id)
+    appointment = query.first()
+
+    if not appointment:
+        return None
+
+    zone = business_zones.get(db, appointment.business_id)
+    if appointment.status != "cancelled":
+        # conditional update: of two concurrent cancels only one is counted in the rollups
+        lock_business(db, appointment.business_id)
+        changed = db.query(Appointment).filter(
+            Appointment.id == appointment.id, Appointment.status != "cancelled"
+        ).update({"status": "cancelled"})
+        if changed:
+            analytics.record_cancellation(db, appointment, zone)
+    db.commit()
+    if notify:
+        after_cancellation(appointment, zone)
+    return appointment
+
+
+def after_cancellation(appointment: Appointment, zone):
+    """Post-commit work of a cancellation: cached days and the reminder. No database access."""
+    availability_cache.invalidate_interval(
+        appointment.business_id,
+        to_local(appointment.start_time, zone),
+        to_local(appointment.end_time, zone),
+        BUFFER_MINUTES,
+    )
+    reminders.on_cancelled(appointment.id)
@@ -0,0 +1,505 @@
+import csv
+import io
+import json
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from Backend.models.appointment import Appointment, uuid_str
+from Backend.models.business import BusinessHours
+from Backend.models.calendar import ExternalBusyBlock
+from Backend.models.service import Service
+from Backend.services import analytics
+from Backend.services.allocation import pick_resource, resource_pools
+from Backend.services.availability_cache import availability_cache
+from Backend.services.booking_service import lock_business_writes
+from Backend.services.reminders import reminder_due, reminder_queue
+from Backend.services.schedule import schedule_cache
+from Backend.services.timezones import business_zones, to_utc
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))  # rows per transaction
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "100000"))
+
+APPOINTMENT_STATUSES = ("scheduled", "cancelled", "completed")
+DAY_NAMES = {name: i for i, name in enumerate(("mon", "tue", "wed", "thu", "fri", "sat", "sun"))}
+
+# Bookings made by other workers during an import are re-read by created_at;
+# the slack covers clock skew between workers
+LATE_BOOKING_SLACK = timedelta(seconds=30)
+
+
+class ImportFormatError(ValueError):
+    """Raised when an upload is neither a JSON array of objects nor a CSV with a header."""
+
+
+# ---------------------------------------------------------
+# PARSING (JSON array or CSV -> list of dicts)
+# ---------------------------------------------------------
+def parse_rows(body: bytes, content_type: str | None = None):
+    """
+    Rows of a JSON array (or {"rows": [...]}) or of a CSV with a header line.
+
+    CSV is assumed when the content type says so or the body does not start
+    like JSON. Blank CSV cells become None.
+    """
+    try:
+        content = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFormatError("Upload must be UTF-8")
+
+    if "csv" in (content_type or "") or not content.lstrip().startswith(("[", "{")):
+        rows = [
+            {key.strip(): (value.strip() or None) if isinstance(value, str) else None
+             for key, value in row.items() if key}
+            for row in csv.DictReader(io.StringIO(content))
+        ]
+    else:
+        try:
+            data = json.loads(content)
+        except ValueError:
+            raise ImportFormatError("Body is not valid JSON")
+        if isinstance(data, dict):
+            data = data.get("rows")
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise ImportFormatError("Expected a JSON array of objects")
+        rows = data
+
+    if len(rows) > BULK_MAX_ROWS:
+        raise ImportFormatError(f"At most {BULK_MAX_ROWS} rows per import")
+    return rows
+
+
+def _text(row, key: str, required: bool = False):
+    value = row.get(key)
+    if value is None or value == "":
+        if required:
+            raise ValueError(f"{key} is required")
+        return None
+    return str(value).strip()
+
+
+def _int(row, key: str):
+    value = row.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be an integer")
+
+
+def _datetime(row, key: str):
+    value = _text(row, key)
+    if value is None:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{key} must be an ISO 8601 datetime")
+
+
+def _time(row, key: str):
+    value = _text(row, key, required=True)
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{key} must be in HH:MM format")
+
+
+def _weekday(row):
+    value = _text(row, "day_of_week", required=True)
+    if value.isdigit() and 0 <= int(value) <= 6:
+        return int(value)
+    day = DAY_NAMES.get(value[:3].lower())
+    if day is None:
+        raise ValueError("day_of_week must be 0 (Monday) to 6 (Sunday) or a day name")
+    return day
+
+
+# ---------------------------------------------------------
+# RESULTS (one entry per input row, 1-based)
+# ---------------------------------------------------------
+def _result(row_number: int, status: str, id=None, error: str | None = None):
+    result = {"row": row_number, "status": status}
+    if id is not None:
+        result["id"] = id
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+def _summary(results, dry_run: bool):
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return {"dry_run": dry_run, "total": len(results), "counts": counts, "rows": results}
+
+
+def _chunks(items, size: int = BULK_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ---------------------------------------------------------
+# IN-MEMORY CONFLICT CHECK
+# ---------------------------------------------------------
+class BusyIndex:
+    """
+    Merged busy intervals per key (a resource id, or None for the whole
+    business), kept sorted so an overlap check or an insert is a bisect.
+
+    Adding an interval twice is harmless, so late bookings can be re-read.
+    """
+
+    def __init__(self):
+        self._starts = {}
+        self._ends = {}
+
+    def overlaps(self, key, start, end) -> bool:
+        ends = self._ends.get(key)
+        if not ends:
+            return False
+        i = bisect_right(ends, start)
+        return i < len(ends) and self._starts[key][i] < end
+
+    def add(self, key, start, end):
+        starts = self._starts.setdefault(key, [])
+        ends = self._ends.setdefault(key, [])
+        # [i, j) are the intervals this one overlaps or touches
+        i = bisect_left(ends, start)
+        j = bisect_right(starts, end)
+        if i < j:
+            start = min(start, starts[i])
+            end = max(end, ends[j - 1])
+        starts[i:j] = [start]
+        ends[i:j] = [end]
+
+
+def _place(index: BusyIndex, candidates, start, end, load):
+    """
+    Reserves [start, end) and returns (True, resource_id), or (False, None)
+    on a conflict. `candidates` is None in single-resource mode.
+    """
+    if index.overlaps(None, start, end):
+        return False, None
+    if candidates is None:
+        index.add(None, start, end)
+        return True, None
+
+    overlapping = [r for r in candidates if index.overlaps(r, start, end)]
+    resource_id = pick_resource(candidates, overlapping, load)
+    if resource_id is None:
+        return False, None
+    index.add(resource_id, start, end)
+    load[resource_id] = load.get(resource_id, 0) + 1
+    return True, resource_id
+
+
+def _load_busy(index: BusyIndex, db: Session, business_id: str, single: bool, lo, hi,
+               since=None, import_stamp=None):
+    query = db.query(Appointment.start_time, Appointment.end_time, Appointment.resource_id).filter(
+        Appointment.business_id == business_id,
+        Appointment.status == "scheduled",
+        Appointment.start_time < hi,
+        Appointment.end_time > lo,
+    )
+    if since is not None:
+        # only bookings made by others since the last read; this import's
+        # own rows all carry `import_stamp` and are already in the index
+        query = query.filter(Appointment.created_at >= since, Appointment.created_at != import_stamp)
+    for start, end, resource_id in query:
+        index.add(None if single else resource_id, start, end)
+
+    # synced external calendars: a block without a resource holds the whole business
+    blocks = db.query(ExternalBusyBlock.start_time, ExternalBusyBlock.end_time, ExternalBusyBlock.resource_id).filter(
+        ExternalBusyBlock.business_id == business_id,
+        ExternalBusyBlock.start_time < hi,
+        ExternalBusyBlock.end_time > lo,
+    )
+    if since is not None:
+        blocks = blocks.filter(ExternalBusyBlock.updated_at >= since)
+    for start, end, resource_id in blocks:
+        index.add(None if single else resource_id, start, end)
+
+
+# ---------------------------------------------------------
+# APPOINTMENTS
+# ---------------------------------------------------------
+def _appointment_row(row, business_id, zone, pool, services_by_id, services_by_name, created_at):
+    """Insert mapping + eligible resources for one row; raises ValueError."""
+    start_time = _datetime(row, "start_time")
+    if start_time is None:
+        raise ValueError("start_time is required")
+
+    service = None
+    service_id = _text(row, "service_id")
+    service_name = _text(row, "service")
+    if service_id:
+        service = services_by_id.get(service_id)
+        if service is None:
+            raise ValueError(f"Unknown service_id {service_id!r}")
+    elif service_name:
+        service = services_by_name.get(service_name.lower())
+        if service is None:
+            raise ValueError(f"Unknown service {service_name!r}")
+
+    start_time = to_utc(start_time, zone)
+    end_time = _datetime(row, "end_time")
+    if end_time is not None:
+        end_time = to_utc(end_time, zone)
+    else:
+        duration = _int(row, "duration_minutes")
+        if duration is None and service is not None:
+            duration = service.duration_minutes
+        if duration is None:
+            raise ValueError("Give end_time, duration_minutes or a service")
+        end_time = start_time + timedelta(minutes=duration)
+    if end_time <= start_time:
+        raise ValueError("end_time must be after start_time")
+
+    status = (_text(row, "status") or "scheduled").lower()
+    if status not in APPOINTMENT_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(APPOINTMENT_STATUSES)}")
+
+    candidates = pool.for_service(service.id if service else None)
+    resource_id = _text(row, "resource_id")
+    if resource_id is not None:
+        if candidates is None or resource_id not in candidates:
+            raise ValueError(f"Resource {resource_id!r} cannot perform this service")
+        candidates = (resource_id,)
+    elif candidates == () and status == "scheduled":
+        raise ValueError("No active resource can perform this service")
+
+    mapping = {
+        "id": uuid_str(),
+        "business_id": business_id,
+        "service_id": service.id if service else None,
+        "resource_id": resource_id,
+        "customer_name": _text(row, "customer_name"),
+        "customer_phone": _text(row, "customer_phone"),
+        "start_time": start_time,
+        "end_time": end_time,
+        "status": status,
+        "created_at": created_at,
+    }
+    return mapping, candidates
+
+
+def import_appointments(db: Session, business_id: str, rows, dry_run: bool = False):
+    """
+    Imports appointment rows with one result per row.
+
+    Each row needs `start_time` and one of `end_time`, `duration_minutes`
+    or a service (`service_id`, or `service` by name); `customer_name`,
+    `customer_phone`, `resource_id` and `status` are optional. Naive times
+    are wall time in the business's timezone, as in `book_appointment`.
+
+    Scheduled rows are conflict-checked in memory against the business's
+    bookings and synced calendar blocks in the import's time span (loaded
+    once) and against earlier rows; with resources, each row gets a free
+    eligible resource. Rows are written with executemany in chunks of
+    BULK_CHUNK_SIZE, one transaction per chunk. Each chunk first takes the
+    business lock and re-reads bookings and blocks changed since the last
+    chunk, so live traffic keeps working during a long import. `dry_run`
+    validates and checks without writing.
+    """
+    zone = business_zones.get(db, business_id)
+    pool = resource_pools.get(db, business_id)
+    single = not pool.resources
+    services_by_id, services_by_name = {}, {}
+    for service in db.query(Service.id, Service.name, Service.duration_minutes, Service.price_cents).filter(
+        Service.business_id == business_id
+    ):
+        services_by_id[service.id] = service
+        services_by_name.setdefault(service.name.lower(), service)
+    prices = {service_id: service.price_cents for service_id, service in services_by_id.items()}
+
+    # 1️⃣ Validate every row
+    created_at = datetime.utcnow()
+    results = [None] * len(rows)
+    parsed = []
+    for i, row in enumerate(rows):
+        try:
+            mapping, candidates = _appointment_row(
+                row, business_id, zone, pool, services_by_id, services_by_name, created_at
+            )
+        except ValueError as exc:
+            results[i] = _result(i + 1, "invalid", error=str(exc))
+            continue
+        parsed.append((i, mapping, candidates))
+
+    scheduled = [mapping for _, mapping, _ in parsed if mapping["status"] == "scheduled"]
+    if not parsed:
+        return _summary(results, dry_run)
+
+    # 2️⃣ Load existing bookings of the span once
+    index = BusyIndex()
+    load = {}  # bookings per resource in this import: spreads work like `book_appointment`
+    lo = min((m["start_time"] for m in scheduled), default=None)
+    hi = max((m["end_time"] for m in scheduled), default=None)
+    seen_at = datetime.utcnow() - LATE_BOOKING_SLACK
+    if scheduled:
+        _load_busy(index, db, business_id, single, lo, hi)
+
+    # 3️⃣ Check and write chunk by chunk
+    created = 0
+    for chunk in _chunks(parsed):
+        if not dry_run:
+            lock_business_writes(db, business_id)
+            if scheduled:
+                since, seen_at = seen_at, datetime.utcnow() - LATE_BOOKING_SLACK
+                _load_busy(index, db, business_id, single, lo, hi, since=since, import_stamp=created_at)
+
+        accepted = []
+        for i, mapping, candidates in chunk:
+            if mapping["status"] == "scheduled":
+                ok, resource_id = _place(index, candidates, mapping["start_time"], mapping["end_time"], load)
+                if not ok:
+                    results[i] = _result(i + 1, "conflict", error="Time slot not available")
+                    continue
+                mapping["resource_id"] = resource_id
+            accepted.append((i, mapping))
+
+        if dry_run:
+            for i, mapping in accepted:
+                results[i] = _result(i + 1, "valid")
+            continue
+
+        try:
+            db.bulk_insert_mappings(Appointment, [mapping for _, mapping in accepted])
+            analytics.record_imported(db, business_id, zone, [mapping for _, mapping in accepted], prices)
+            db.commit()
+        except IntegrityError:
+            # exclusion constraint fired: a booking slipped past the re-read
+            db.rollback()
+            for i, mapping in accepted:
+                results[i] = _result(i + 1, "conflict", error="Conflicts with a concurrent booking")
+                if mapping["status"] == "scheduled" and mapping["resource_id"] is not None:
+                    load[mapping["resource_id"]] -= 1
+            # the rolled-back rows were placed in the index: rebuild it from what was committed
+            index = BusyIndex()
+            _load_busy(index, db, business_id, single, lo, hi)
+            continue
+        for i, mapping in accepted:
+            results[i] = _result(i + 1, "created", id=mapping["id"])
+            if mapping["status"] == "scheduled" and mapping["customer_phone"]:
+                reminder_queue.schedule(mapping["id"], reminder_due(mapping["start_time"]))
+        created += len(accepted)
+
+    if created:
+        availability_cache.invalidate_business(business_id)
+    return _summary(results, dry_run)
+
+
+# ---------------------------------------------------------
+# SERVICES (matched by name: existing ones are updated)
+# ---------------------------------------------------------
+def import_services(db: Session, business_id: str, rows, dry_run: bool = False):
+    """
+    Creates or updates services from rows of `name`, `duration_minutes` and
+    optional `price_cents`. A name the business already has (case-insensitive)
+    updates that service instead of adding a duplicate; its price is only
+    changed when the row has one.
+    """
+    existing = {
+        service.name.lower(): service for service in db.query(
+            Service.id, Service.name, Service.duration_minutes
+        ).filter(Service.business_id == business_id)
+    }
+
+    results = [None] * len(rows)
+    inserts, updates = [], []
+    seen = set()
+    touched_durations = set()
+    for i, row in enumerate(rows):
+        try:
+            name = _text(row, "name", required=True)
+            duration = _int(row, "duration_minutes")
+            price_cents = _int(row, "price_cents")
+            if duration is None or duration <= 0:
+                raise ValueError("duration_minutes must be greater than 0")
+            if price_cents is not None and price_cents < 0:
+                raise ValueError("price_cents cannot be negative")
+            if name.lower() in seen:
+                raise ValueError(f"Duplicate service name {name!r} in this import")
+        except ValueError as exc:
+            results[i] = _result(i + 1, "invalid", error=str(exc))
+            continue
+
+        seen.add(name.lower())
+        touched_durations.add(duration)
+        current = existing.get(name.lower())
+        mapping = {"name": name, "duration_minutes": duration}
+        if price_cents is not None or current is None:
+            mapping["price_cents"] = price_cents  # a row without a price keeps the existing one
+        if current is None:
+            mapping.update(id=uuid_str(), business_id=business_id)
+            inserts.append(mapping)
+            results[i] = _result(i + 1, "valid" if dry_run else "created", id=mapping["id"])
+        else:
+            mapping["id"] = current.id
+            touched_durations.add(current.duration_minutes)
+            updates.append(mapping)
+            results[i] = _result(i + 1, "valid" if dry_run else "updated", id=current.id)
+
+    if dry_run or not (inserts or updates):
+        return _summary(results, dry_run)
+
+    for chunk in _chunks(inserts):
+        db.bulk_insert_mappings(Service, chunk)
+    for chunk in _chunks(updates):
+        db.bulk_update_mappings(Service, chunk)
+    db.commit()
+
+    for duration in touched_durations:
+        availability_cache.invalidate_duration(business_id, duration)
+    return _summary(results, dry_run)
+
+
+# ---------------------------------------------------------
+# HOURS (the upload replaces the weekly schedule)
+# ---------------------------------------------------------
+def import_hours(db: Session, business_id: str, rows, dry_run: bool = False):
+    """
+    Replaces the weekly hours with rows of `day_of_week` (0-6 or a day name),
+    `open_time` and `close_time`; repeat a day for split shifts.
+
+    All or nothing: a single invalid row leaves the current hours in place.
+    """
+    results = [None] * len(rows)
+    mappings = []
+    for i, row in enumerate(rows):
+        try:
+            day_of_week = _weekday(row)
+            open_time = _time(row, "open_time")
+            close_time = _time(row, "close_time")
+            if close_time <= open_time:
+                raise ValueError("close_time must be after open_time")
+        except ValueError as exc:
+            results[i] = _result(i + 1, "invalid", error=str(exc))
+            continue
+        mappings.append({
+            "business_id": business_id,
+            "day_of_week": day_of_week,
+            "open_time": open_time,
+            "close_time": close_time,
+        })
+        results[i] = _result(i + 1, "valid")
+
+    if dry_run or len(mappings) < len(rows):
+        return _summary(results, dry_run)
+
+    db.query(BusinessHours).filter(BusinessHours.business_id == business_id).delete()
+    db.bulk_insert_mappings(BusinessHours, mappings)
+    db.commit()
+    for result in results:
+        result["status"] = "created"
+
+    schedule_cache.invalidate(business_id)
+    availability_cache.invalidate_business(business_id)
+    return _summary(results, dry_run)
@@ -0,0 +1,538 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import date as date_type, datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from Backend.database import SessionLocal
+from Backend.models.calendar import CalendarConnection, ExternalBusyBlock, uuid_str
+from Backend.services.availability_cache import availability_cache
+from Backend.services.availability_service import BUFFER_MINUTES
+from Backend.services.timezones import business_zones, to_local, to_utc
+from Backend.utils.rate_limit import RateLimiter
+
+CALENDAR_SYNC_ENABLED = os.getenv("CALENDAR_SYNC_ENABLED", "true").lower() in ("1", "true", "yes")
+SYNC_INTERVAL_SECONDS = float(os.getenv("CALENDAR_SYNC_INTERVAL_SECONDS", "60"))
+SYNC_CONCURRENCY = int(os.getenv("CALENDAR_SYNC_CONCURRENCY", "8"))
+RATE_LIMIT_PER_SECOND = float(os.getenv("CALENDAR_RATE_LIMIT_PER_SECOND", "10"))  # per provider
+SYNC_WINDOW_DAYS = int(os.getenv("CALENDAR_SYNC_WINDOW_DAYS", "90"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("CALENDAR_HTTP_TIMEOUT_SECONDS", "10"))
+MAX_RETRIES = int(os.getenv("CALENDAR_MAX_RETRIES", "3"))
+
+GOOGLE_CALENDAR_URL = os.getenv("GOOGLE_CALENDAR_URL", "https://www.googleapis.com/calendar/v3")
+OUTLOOK_CALENDAR_URL = os.getenv("OUTLOOK_CALENDAR_URL", "https://graph.microsoft.com/v1.0")
+FAKE_CALENDAR_URL = os.getenv("FAKE_CALENDAR_URL", "http://127.0.0.1:8765")  # benchmarks/fake_calendar.py
+
+logger = logging.getLogger("reception_ai.calendar_sync")
+
+# Past this many changed blocks, drop the business's cached days wholesale
+MAX_TARGETED_INVALIDATIONS = 50
+
+
+class CalendarSyncError(Exception):
+    pass
+
+
+class CalendarAuthError(CalendarSyncError):
+    """The provider rejected the access token."""
+
+
+class SyncTokenExpired(CalendarSyncError):
+    """The provider no longer accepts the sync token; a full sync is needed."""
+
+
+# ---------------------------------------------------------
+# HTTP: one pooled client, a token bucket per provider
+# ---------------------------------------------------------
+class CalendarHttp:
+    """
+    GETs through the shared client, throttled per provider. 429 and 5xx
+    responses are retried up to MAX_RETRIES times, honouring Retry-After.
+    """
+
+    def __init__(self, client, rate_per_second: float = RATE_LIMIT_PER_SECOND):
+        self.client = client
+        self.rate_per_second = rate_per_second
+        self._limiters = {}
+        self.requests = 0
+        self.throttled = 0
+
+    async def get(self, provider: str, url: str, params=None, headers=None):
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            limiter = self._limiters[provider] = RateLimiter(self.rate_per_second)
+
+        for attempt in range(MAX_RETRIES + 1):
+            await limiter.acquire()
+            response = await self.client.get(url, params=params, headers=headers)
+            self.requests += 1
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            self.throttled += 1
+            try:
+                delay = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                delay = 2.0 ** attempt
+            limiter.pause(delay)
+        raise CalendarSyncError(f"{provider} returned {response.status_code} after {MAX_RETRIES} retries")
+
+
+# ---------------------------------------------------------
+# PROVIDERS (fetch changes since the stored sync token)
+# ---------------------------------------------------------
+class SyncResult:
+    """
+    Busy-time changes of one calendar: (event id, start, end), start None
+    when the event is gone or free. `full` results list every event, so
+    stored blocks missing from them are deleted.
+    """
+
+    __slots__ = ("changes", "sync_token", "etag", "full", "not_modified")
+
+    def __init__(self, changes=(), sync_token=None, etag=None, full=False, not_modified=False):
+        self.changes = list(changes)
+        self.sync_token = sync_token
+        self.etag = etag
+        self.full = full
+        self.not_modified = not_modified
+
+
+def _parse_iso(value: str) -> datetime:
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    head, dot, rest = value.partition(".")
+    if dot:
+        # Graph sends 7 fractional digits; keep microseconds and any offset
+        digits = len(rest) - len(rest.lstrip("0123456789"))
+        value = head + "." + rest[:min(digits, 6)].ljust(6, "0") + rest[digits:]
+    return datetime.fromisoformat(value)
+
+
+class GoogleCalendarProvider:
+    """
+    Google Calendar events.list with `syncToken` (incremental) and an ETag
+    on the first page, so an unchanged calendar costs one 304.
+    """
+
+    def __init__(self, base_url: str = GOOGLE_CALENDAR_URL, name: str = "google"):
+        self.base_url = base_url.rstrip("/")
+        self.name = name
+
+    async def fetch(self, http: CalendarHttp, connection) -> SyncResult:
+        url = f"{self.base_url}/calendars/{connection.calendar_id}/events"
+        params = {"singleEvents": "true", "maxResults": "2500"}
+        full = not connection.sync_token
+        if full:
+            now = datetime.utcnow()
+            params["timeMin"] = (now - timedelta(days=1)).isoformat() + "Z"
+            params["timeMax"] = (now + timedelta(days=SYNC_WINDOW_DAYS)).isoformat() + "Z"
+        else:
+            params["syncToken"] = connection.sync_token
+        headers = {"Authorization": f"Bearer {connection.access_token}"}
+
+        result = SyncResult(full=full)
+        first = True
+        while True:
+            page_headers = dict(headers)
+            if first and not full and connection.etag:
+                page_headers["If-None-Match"] = connection.etag
+            response = await http.get(self.name, url, params=params, headers=page_headers)
+            if response.status_code == 304:
+                return SyncResult(sync_token=connection.sync_token, etag=connection.etag, not_modified=True)
+            if response.status_code == 410:
+                raise SyncTokenExpired(connection.calendar_id)
+            if response.status_code == 401:
+                raise CalendarAuthError(f"{self.name} rejected the access token")
+            if response.status_code != 200:
+                raise CalendarSyncError(f"{self.name} returned {response.status_code}")
+            if first:
+                result.etag = response.headers.get("ETag")
+                first = False
+
+            body = response.json()
+            for item in body.get("items", []):
+                if item.get("status") == "cancelled" or item.get("transparency") == "transparent":
+                    result.changes.append((item["id"], None, None))
+                else:
+                    result.changes.append((item["id"], self._time(item["start"]), self._time(item["end"])))
+
+            if body.get("nextPageToken"):
+                params["pageToken"] = body["nextPageToken"]
+                continue
+            result.sync_token = body.get("nextSyncToken")
+            return result
+
+    @staticmethod
+    def _time(value):
+        # all-day events carry a local date, resolved in the business's zone
+        if "dateTime" in value:
+            return _parse_iso(value["dateTime"])
+        return date_type.fromisoformat(value["date"])
+
+
+class OutlookCalendarProvider:
+    """
+    Microsoft Graph calendarView delta query; the delta link is the sync token.
+    """
+
+    def __init__(self, base_url: str = OUTLOOK_CALENDAR_URL, name: str = "outlook"):
+        self.base_url = base_url.rstrip("/")
+        self.name = name
+
+    async def fetch(self, http: CalendarHttp, connection) -> SyncResult:
+        headers = {
+            "Authorization": f"Bearer {connection.access_token}",
+            "Prefer": 'outlook.timezone="UTC", odata.maxpagesize=200',
+        }
+        full = not connection.sync_token
+        if full:
+            now = datetime.utcnow()
+            url = f"{self.base_url}/me/calendars/{connection.calendar_id}/calendarView/delta"
+            params = {
+                "startDateTime": (now - timedelta(days=1)).isoformat() + "Z",
+                "endDateTime": (now + timedelta(days=SYNC_WINDOW_DAYS)).isoformat() + "Z",
+            }
+        else:
+            url, params = connection.sync_token, None
+
+        result = SyncResult(full=full)
+        while True:
+            response = await http.get(self.name, url, params=params, headers=headers)
+            if response.status_code == 410:
+                raise SyncTokenExpired(connection.calendar_id)
+            if response.status_code == 401:
+                raise CalendarAuthError(f"{self.name} rejected the access token")
+            if response.status_code != 200:
+                raise CalendarSyncError(f"{self.name} returned {response.status_code}")
+
+            body = response.json()
+            for item in body.get("value", []):
+                if "@removed" in item or item.get("showAs") == "free" or item.get("isCancelled"):
+                    result.changes.append((item["id"], None, None))
+                else:
+                    start = _parse_iso(item["start"]["dateTime"] + "+00:00")
+                    end = _parse_iso(item["end"]["dateTime"] + "+00:00")
+                    result.changes.append((item["id"], start, end))
+
+            if body.get("@odata.nextLink"):
+                url, params = body["@odata.nextLink"], None
+                continue
+            result.sync_token = body.get("@odata.deltaLink")
+            return result
+
+
+PROVIDERS = {
+    "google": GoogleCalendarProvider(),
+    "outlook": OutlookCalendarProvider(),
+    # Google's protocol served locally by benchmarks/fake_calendar.py
+    "fake": GoogleCalendarProvider(FAKE_CALENDAR_URL, name="fake"),
+}
+
+
+# ---------------------------------------------------------
+# STORAGE (apply a sync result to external_busy_blocks)
+# ---------------------------------------------------------
+def _to_utc(value, zone):
+    if isinstance(value, datetime):
+        return to_utc(value, zone)
+    return to_utc(datetime.combine(value, datetime.min.time()), zone)
+
+
+def apply_sync(db: Session, connection_id: str, result: SyncResult) -> int:
+    """
+    Writes a sync result and the new sync state; returns the blocks changed.
+
+    Only the days a changed block touches are dropped from the availability
+    cache (or the whole business past MAX_TARGETED_INVALIDATIONS).
+    """
+    connection = db.get(CalendarConnection, connection_id)
+    if connection is None or not connection.active:
+        return 0  # disconnected while the fetch was in flight
+
+    business_id = connection.business_id
+    zone = business_zones.get(db, business_id)
+    now = datetime.utcnow()
+
+    latest = {}  # later changes to the same event win
+    for external_id, start, end in result.changes:
+        latest[external_id] = (start, end)
+
+    blocks = db.query(ExternalBusyBlock).filter(ExternalBusyBlock.connection_id == connection_id)
+    if result.full:
+        existing = {block.external_id: block for block in blocks}
+    else:
+        existing = {}
+        ids = list(latest)
+        for i in range(0, len(ids), 500):
+            for block in blocks.filter(ExternalBusyBlock.external_id.in_(ids[i:i + 500])):
+                existing[block.external_id] = block
+
+    touched = []  # UTC intervals whose local days need recomputing
+    inserts = []
+    for external_id, (start, end) in latest.items():
+        block = existing.pop(external_id, None)
+        if start is not None:
+            start, end = _to_utc(start, zone), _to_utc(end, zone)
+        if start is None or end <= start:
+            if block is not None:
+                touched.append((block.start_time, block.end_time))
+                db.delete(block)
+            continue
+
+        if block is None:
+            inserts.append({
+                "id": uuid_str(),
+                "connection_id": connection_id,
+                "business_id": business_id,
+                "resource_id": connection.resource_id,
+                "external_id": external_id,
+                "start_time": start,
+                "end_time": end,
+                "updated_at": now,
+            })
+        elif (block.start_time, block.end_time) != (start, end):
+            touched.append((block.start_time, block.end_time))
+            block.start_time, block.end_time, block.updated_at = start, end, now
+        else:
+            continue
+        touched.append((start, end))
+
+    if result.full:
+        for block in existing.values():
+            touched.append((block.start_time, block.end_time))
+            db.delete(block)
+
+    if inserts:
+        db.bulk_insert_mappings(ExternalBusyBlock, inserts)
+    # finished events can no longer block a slot
+    db.query(ExternalBusyBlock).filter(
+        ExternalBusyBlock.connection_id == connection_id,
+        ExternalBusyBlock.end_time < now - timedelta(days=1),
+    ).delete(synchronize_session=False)
+
+    connection.sync_token = result.sync_token
+    connection.etag = result.etag
+    connection.last_synced_at = now
+    connection.last_error = None
+    db.commit()
+
+    if len(touched) > MAX_TARGETED_INVALIDATIONS:
+        availability_cache.invalidate_business(business_id)
+    else:
+        for start, end in touched:
+            availability_cache.invalidate_interval(
+                business_id, to_local(start, zone), to_local(end, zone), BUFFER_MINUTES
+            )
+    return len(touched)
+
+
+def delete_connection(db: Session, connection: CalendarConnection):
+    """Drops a connection with its blocks and every cached day they shaped."""
+    business_id = connection.business_id
+    db.query(ExternalBusyBlock).filter(ExternalBusyBlock.connection_id == connection.id).delete(
+        synchronize_session=False
+    )
+    db.delete(connection)
+    db.commit()
+    availability_cache.invalidate_business(business_id)
+
+
+def _claim_due_connections(interval_seconds: float):
+    """
+    Ids of the active connections not synced within the interval, claimed
+    by stamping `last_synced_at` in one conditional UPDATE. Every web
+    worker runs the sync loop; the UPDATE re-checks the due condition, so
+    each connection is fetched by one process per interval.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=interval_seconds)
+        claimed = db.execute(
+            update(CalendarConnection)
+            .where(
+                CalendarConnection.active.is_(True),
+                (CalendarConnection.last_synced_at.is_(None)) | (CalendarConnection.last_synced_at < cutoff),
+            )
+            .values(last_synced_at=now)
+            .returning(CalendarConnection.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        db.commit()
+        return claimed
+    finally:
+        db.close()
+
+
+def _load_state(connection_id: str):
+    db = SessionLocal()
+    try:
+        row = db.query(
+            CalendarConnection.id,
+            CalendarConnection.provider,
+            CalendarConnection.calendar_id,
+            CalendarConnection.access_token,
+            CalendarConnection.sync_token,
+            CalendarConnection.etag,
+        ).filter(CalendarConnection.id == connection_id, CalendarConnection.active.is_(True)).first()
+        return SimpleNamespace(**row._asdict()) if row else None
+    finally:
+        db.close()
+
+
+def _apply(connection_id: str, result: SyncResult) -> int:
+    db = SessionLocal()
+    try:
+        return apply_sync(db, connection_id, result)
+    finally:
+        db.close()
+
+
+def _record_error(connection_id: str, message: str):
+    db = SessionLocal()
+    try:
+        connection = db.get(CalendarConnection, connection_id)
+        if connection is not None:
+            # retried on the next interval, not on every tick
+            connection.last_synced_at = datetime.utcnow()
+            connection.last_error = message[:500]
+            db.commit()
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# WORKER
+# ---------------------------------------------------------
+class CalendarSyncWorker:
+    """
+    Background task keeping `external_busy_blocks` current.
+
+    Every `interval_seconds` it syncs the connections not synced within
+    that interval, `concurrency` at a time, through one pooled HTTP client
+    with a per-provider rate limit. Availability requests never call a
+    provider; they read the stored blocks.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = SYNC_INTERVAL_SECONDS,
+        concurrency: int = SYNC_CONCURRENCY,
+        rate_per_second: float = RATE_LIMIT_PER_SECOND,
+        providers=None,
+    ):
+        self.interval_seconds = interval_seconds
+        self.concurrency = concurrency
+        self.rate_per_second = rate_per_second
+        self.providers = providers if providers is not None else PROVIDERS
+        self._http = None
+        self._task = None
+        self._semaphore = None
+
+        self.runs = 0
+        self.synced = 0
+        self.failed = 0
+        self.not_modified = 0
+        self.full_syncs = 0
+        self.changes = 0
+        self.last_run_seconds = 0.0
+        self._closed_requests = 0  # counts of HTTP clients already closed by stop()
+        self._closed_throttled = 0
+
+    def _ensure_http(self):
+        if self._http is None:
+            import httpx
+
+            client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency * 2,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+            self._http = CalendarHttp(client, self.rate_per_second)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._http
+
+    def start(self):
+        self._ensure_http()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._http is not None:
+            self._closed_requests += self._http.requests
+            self._closed_throttled += self._http.throttled
+            await self._http.client.aclose()
+            self._http = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync_due()
+            except Exception:
+                logger.exception("calendar sync run failed")  # database hiccup: try again next interval
+            await asyncio.sleep(self.interval_seconds)
+
+    async def sync_due(self):
+        started = time.perf_counter()
+        claimed = await run_in_threadpool(_claim_due_connections, self.interval_seconds)
+        await asyncio.gather(*(self.sync_connection(connection_id) for connection_id in claimed))
+        self.runs += 1
+        self.last_run_seconds = time.perf_counter() - started
+
+    async def sync_connection(self, connection_id: str) -> dict:
+        """Syncs one connection now; returns what changed."""
+        http = self._ensure_http()
+        async with self._semaphore:
+            state = await run_in_threadpool(_load_state, connection_id)
+            if state is None:
+                return {"status": "inactive"}
+            provider = self.providers.get(state.provider)
+            try:
+                if provider is None:
+                    raise CalendarSyncError(f"Unknown provider {state.provider!r}")
+                try:
+                    result = await provider.fetch(http, state)
+                except SyncTokenExpired:
+                    # provider dropped our sync state: refetch everything once
+                    state.sync_token = state.etag = None
+                    result = await provider.fetch(http, state)
+                changed = await run_in_threadpool(_apply, connection_id, result)
+            except Exception as exc:
+                self.failed += 1
+                message = str(exc) or type(exc).__name__
+                await run_in_threadpool(_record_error, connection_id, message)
+                return {"status": "error", "error": message}
+
+            if result.not_modified:
+                self.not_modified += 1
+            if result.full:
+                self.full_syncs += 1
+            self.synced += 1
+            self.changes += changed
+            return {"status": "ok", "full": result.full, "not_modified": result.not_modified, "changed": changed}
+
+    def stats(self):
+        return {
+            "runs": self.runs,
+            "synced": self.synced,
+            "failed": self.failed,
+            "not_modified": self.not_modified,
+            "full_syncs": self.full_syncs,
+            "changes": self.changes,
+            "requests": self._closed_requests + (self._http.requests if self._http else 0),
+            "throttled": self._closed_throttled + (self._http.throttled if self._http else 0),
+            "last_run_seconds": self.last_run_seconds,
+        }
+
+
+calendar_sync = CalendarSyncWorker()
@@ -0,0 +1,332 @@
+import asyncio
+import glob
+import itertools
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from sqlalchemy import insert
+from starlette.concurrency import run_in_threadpool
+
+from Backend.database import SessionLocal
+from Backend.models.call import CallEvent
+from Backend.services.call_log import call_log_buffer, write_calls
+from Backend.services.phone_routing import phone_router
+from Backend.utils.phone import try_normalize_e164
+
+QUEUE_SIZE = int(os.getenv("VAPI_EVENT_QUEUE_SIZE", "10000"))
+WORKERS = int(os.getenv("VAPI_EVENT_WORKERS", "2"))
+BATCH_SIZE = int(os.getenv("VAPI_EVENT_BATCH_SIZE", "200"))
+FLUSH_SECONDS = float(os.getenv("VAPI_EVENT_FLUSH_MS", "250")) / 1000
+FULL_POLICY = os.getenv("VAPI_EVENT_FULL_POLICY", "spill")  # "drop" or "spill"
+# Each process spills to its own vapi_events.<pid>.jsonl in this host-local directory
+SPILL_DIR = os.path.abspath(os.getenv("VAPI_EVENT_SPILL_DIR") or os.path.join(tempfile.gettempdir(), "vapi_spill"))
+STOP_TIMEOUT_SECONDS = float(os.getenv("VAPI_EVENT_STOP_SECONDS", "10"))  # flush budget at shutdown
+
+logger = logging.getLogger("reception_ai.call_events")
+
+
+def event_row(body: dict) -> dict:
+    """
+    Flattens a Vapi webhook body into a `call_events` row.
+    """
+    message = body.get("message") or {}
+    call = message.get("call") or {}
+    metadata = (message.get("assistant") or {}).get("metadata") or {}
+    number = try_normalize_e164((call.get("phoneNumber") or {}).get("number"))
+    timestamp = message.get("timestamp")  # epoch milliseconds
+
+    return {
+        "call_id": call.get("id"),
+        "business_id": metadata.get("business_id") or phone_router.lookup(number),
+        "event_type": message.get("type") or "unknown",
+        "payload": json.dumps(body),
+        "received_at": (
+            datetime.utcfromtimestamp(timestamp / 1000) if isinstance(timestamp, (int, float))
+            else datetime.utcnow()
+        ),
+    }
+
+
+class UnwrittenRows(Exception):
+    """Raised by a writer with the rows that still need to be kept."""
+
+    def __init__(self, rows):
+        super().__init__(f"{len(rows)} rows not written")
+        self.rows = rows
+
+
+def write_rows(rows, flush_live: bool = False):
+    """
+    Buffers call events until hangup, then bulk-inserts finished calls.
+
+    Events without a call id go straight to `call_events` with a single
+    executemany. `flush_live` also closes calls still in progress (shutdown).
+    """
+    orphans = []
+    for row in rows:
+        if row["call_id"]:
+            call_log_buffer.add(row)
+        else:
+            orphans.append(row)
+
+    ready = call_log_buffer.pop_ready(include_live=flush_live)
+    if not orphans and not ready:
+        return
+
+    db = SessionLocal()
+    try:
+        if orphans:
+            db.execute(insert(CallEvent), orphans)
+        if ready:
+            write_calls(db, ready)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        call_log_buffer.retry(ready)
+        raise UnwrittenRows(orphans) from exc
+    finally:
+        db.close()
+
+
+def flush_live_calls():
+    write_rows([], flush_live=True)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class CallEventQueue:
+    """
+    Bounded queue between the Vapi webhook and the database.
+
+    The webhook only calls `put`, which never blocks. Worker tasks drain the
+    queue and hand events to the writer in batches. When the queue is full, events are
+    either dropped or spilled to this process's JSON-lines file that workers
+    re-ingest once the queue has emptied. Files left by processes that are
+    gone are re-ingested too.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = QUEUE_SIZE,
+        workers: int = WORKERS,
+        batch_size: int = BATCH_SIZE,
+        flush_seconds: float = FLUSH_SECONDS,
+        full_policy: str = FULL_POLICY,
+        spill_dir: str = SPILL_DIR,
+        writer=write_rows,
+        on_stop=flush_live_calls,
+        stop_timeout: float = STOP_TIMEOUT_SECONDS,
+    ):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.full_policy = full_policy
+        self.spill_dir = spill_dir
+        self.writer = writer
+        self.on_stop = on_stop
+        self.stop_timeout = stop_timeout
+
+        self._queue = None
+        self._tasks = []
+        self._spill_lock = threading.Lock()
+        self._drain_lock = threading.Lock()  # one worker re-ingests at a time
+        self._claims = itertools.count()
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.high_watermark = 0
+
+    # -----------------------------
+    # PRODUCER
+    # -----------------------------
+    def put(self, body: dict) -> bool:
+        """Queues an event; returns False if it was dropped or spilled."""
+        row = event_row(body)
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(row)
+                self.enqueued += 1
+                self.high_watermark = max(self.high_watermark, self._queue.qsize())
+                return True
+            except asyncio.QueueFull:
+                pass
+
+        if self.full_policy == "spill":
+            self._spill([row])
+            self.spilled += 1
+        else:
+            self.dropped += 1
+        return False
+
+    # -----------------------------
+    # CONSUMERS
+    # -----------------------------
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """
+        Flushes everything still queued, then stops the workers. Whatever is
+        not written within `stop_timeout` is spilled (or counted as dropped).
+        """
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.stop_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("call event queue not drained after %ss", self.stop_timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        left = []
+        while not self._queue.empty():
+            left.append(self._queue.get_nowait())
+        if left and self.full_policy == "spill":
+            self._spill(left)
+        else:
+            self.dropped += len(left)
+        self._tasks = []
+        self._queue = None
+        if self.on_stop is not None:
+            try:
+                await asyncio.wait_for(run_in_threadpool(self.on_stop), self.stop_timeout)
+            except Exception:
+                logger.exception("flushing live calls at shutdown failed")
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.flush_seconds
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self._write(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("call event batch failed")  # the worker keeps going
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if self._queue.empty() and self.full_policy == "spill":
+                try:
+                    await run_in_threadpool(self._drain_spill)
+                except Exception:
+                    logger.exception("re-ingesting spilled call events failed")  # retried after the next batch
+
+    async def _write(self, rows):
+        try:
+            await run_in_threadpool(self.writer, rows)
+            self.written += len(rows)
+            self.batches += 1
+        except Exception as exc:
+            # keep the events rather than lose them with the batch
+            rows = getattr(exc, "rows", rows)
+            self.failed += len(rows)
+            logger.warning("writing %d call events failed: %s", len(rows), exc)
+            if self.full_policy == "spill":
+                self._spill(rows)
+
+    # -----------------------------
+    # SPILL FILES (one per process, renamed before they are read)
+    # -----------------------------
+    @property
+    def spill_path(self) -> str:
+        # pid read on use: workers forked after import each get their own file
+        return os.path.join(self.spill_dir, f"vapi_events.{os.getpid()}.jsonl")
+
+    def _spill(self, rows):
+        # small append on the event loop; only happens while the queue is full
+        os.makedirs(self.spill_dir, exist_ok=True)
+        with self._spill_lock, open(self.spill_path, "a") as f:
+            for row in rows:
+                f.write(json.dumps({**row, "received_at": row["received_at"].isoformat()}) + "\n")
+
+    def _claim_spills(self):
+        """
+        Renames this process's spill file, and those of processes that are
+        gone, to .draining names of this process; returns every file to read.
+        New spills meanwhile start a fresh file.
+        """
+        pid = os.getpid()
+        with self._spill_lock:
+            if os.path.exists(self.spill_path):
+                os.replace(self.spill_path, f"{self.spill_path}.{next(self._claims)}.draining")
+        for path in glob.glob(os.path.join(self.spill_dir, "vapi_events.*.jsonl*")):
+            owner = os.path.basename(path).split(".")[1]
+            if not owner.isdigit() or int(owner) == pid or _alive(int(owner)):
+                continue
+            try:
+                os.replace(path, f"{self.spill_path}.{next(self._claims)}.draining")
+            except FileNotFoundError:
+                pass  # another process adopted it first
+        return sorted(glob.glob(f"{self.spill_path}.*.draining"))
+
+    def _drain_spill(self):
+        if not os.path.isdir(self.spill_dir) or not self._drain_lock.acquire(blocking=False):
+            return
+        try:
+            self._drain_claimed()
+        finally:
+            self._drain_lock.release()
+
+    def _drain_claimed(self):
+        for path in self._claim_spills():
+            with open(path) as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+            for row in rows:
+                row["received_at"] = datetime.fromisoformat(row["received_at"])
+            for i in range(0, len(rows), self.batch_size):
+                batch = rows[i:i + self.batch_size]
+                try:
+                    self.writer(batch)
+                except Exception as exc:
+                    # unwritten rows go back to the live spill file; the claimed one is done
+                    self._spill(getattr(exc, "rows", batch) + rows[i + self.batch_size:])
+                    os.remove(path)
+                    raise
+                self.written += len(batch)
+                self.batches += 1
+            os.remove(path)
+
+    def stats(self):
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "capacity": self.maxsize,
+            "high_watermark": self.high_watermark,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+        }
+
+
+call_event_queue = CallEventQueue()
@@ -0,0 +1,338 @@
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import Session
+
+from Backend.models.call import Call, CallLogChunk, uuid_str
+
+CHUNK_EVENTS = int(os.getenv("CALL_LOG_CHUNK_EVENTS", "500"))
+IDLE_FLUSH_SECONDS = int(os.getenv("CALL_LOG_IDLE_SECONDS", "7200"))  # calls with no hangup report
+COMPRESSION_LEVEL = 6
+
+# Columns returned by listings; the transcript blob is only read on demand
+SUMMARY_COLUMNS = (
+    Call.id,
+    Call.vapi_call_id,
+    Call.twilio_call_sid,
+    Call.appointment_id,
+    Call.from_number,
+    Call.to_number,
+    Call.started_at,
+    Call.ended_at,
+    Call.duration_seconds,
+    Call.outcome,
+    Call.ended_reason,
+)
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode(), COMPRESSION_LEVEL)
+
+
+def decompress_text(blob: bytes, codec: str = "zlib") -> str:
+    if codec != "zlib":
+        raise ValueError(f"Unsupported codec {codec}")
+    return zlib.decompress(blob).decode()
+
+
+def _parse_time(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except (AttributeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------
+# IN-MEMORY BUFFER (one entry per live call)
+# ---------------------------------------------------------
+class CallLogBuffer:
+    """
+    Holds the events of calls still in progress.
+
+    An end-of-call report closes the call; calls that never send one are
+    closed after `IDLE_FLUSH_SECONDS` without events.
+    """
+
+    def __init__(self, idle_seconds: int = IDLE_FLUSH_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._calls = {}  # vapi call id -> {"rows": [...], "appointment_id": ..., "outcome": ..., "seen": t}
+        self._ready = []  # closed calls waiting to be written
+        self._lock = threading.Lock()
+
+    def _entry(self, vapi_call_id: str):
+        entry = self._calls.get(vapi_call_id)
+        if entry is None:
+            entry = self._calls[vapi_call_id] = {"rows": [], "appointment_id": None, "outcome": None}
+        entry["seen"] = time.monotonic()
+        return entry
+
+    def add(self, row: dict):
+        with self._lock:
+            self._entry(row["call_id"])["rows"].append(row)
+            if row["event_type"] == "end-of-call-report":
+                self._ready.append((row["call_id"], self._calls.pop(row["call_id"])))
+
+    def link_appointment(self, vapi_call_id: str, appointment_id: str, outcome: str):
+        """Records what a tool call did so the call row carries it."""
+        with self._lock:
+            entry = self._entry(vapi_call_id)
+            entry["appointment_id"] = appointment_id
+            entry["outcome"] = outcome
+
+    def pop_ready(self, include_live: bool = False):
+        """Returns closed calls (and idle or, with `include_live`, all open ones)."""
+        now = time.monotonic()
+        with self._lock:
+            for vapi_call_id in list(self._calls):
+                entry = self._calls[vapi_call_id]
+                if include_live or now - entry["seen"] > self.idle_seconds:
+                    self._calls.pop(vapi_call_id)
+                    if entry["rows"]:
+                        self._ready.append((vapi_call_id, entry))
+            ready, self._ready = self._ready, []
+            return ready
+
+    def retry(self, ready):
+        """Puts calls back after a failed write."""
+        with self._lock:
+            self._ready.extend(ready)
+
+    def __len__(self):
+        return len(self._calls)
+
+
+call_log_buffer = CallLogBuffer()
+
+
+# ---------------------------------------------------------
+# ROW BUILDING + BULK WRITE
+# ---------------------------------------------------------
+def build_call_rows(vapi_call_id: str, entry: dict):
+    """
+    Turns a closed call's buffered events into one `calls` row and its chunks.
+    """
+    rows = entry["rows"]
+    report = {}
+    final_lines = []
+    call_info = {}
+    for row in rows:
+        message = json.loads(row["payload"]).get("message") or {}
+        call_info = message.get("call") or call_info
+        if row["event_type"] == "end-of-call-report":
+            report = message
+        elif row["event_type"] == "transcript" and message.get("transcriptType") == "final":
+            final_lines.append(f"{message.get('role', 'unknown')}: {message.get('transcript', '')}")
+
+    started_at = _parse_time(report.get("startedAt")) or rows[0]["received_at"]
+    ended_at = _parse_time(report.get("endedAt")) or rows[-1]["received_at"]
+    duration = report.get("durationSeconds")
+    if duration is None:
+        duration = (ended_at - started_at).total_seconds()
+
+    transcript = report.get("transcript") or "\n".join(final_lines)
+    outcome = entry["outcome"] or ("no_report" if not report else "no_booking")
+
+    call_id = uuid_str()
+    call_row = {
+        "id": call_id,
+        "vapi_call_id": vapi_call_id,
+        "twilio_call_sid": call_info.get("phoneCallProviderId"),
+        "business_id": next((r["business_id"] for r in rows if r["business_id"]), None),
+        "appointment_id": entry["appointment_id"],
+        "from_number": (call_info.get("customer") or {}).get("number"),
+        "to_number": (call_info.get("phoneNumber") or {}).get("number"),
+        "started_at": started_at,
+        "ended_at": ended_at,
+        "duration_seconds": int(duration),
+        "outcome": outcome,
+        "ended_reason": report.get("endedReason"),
+        "transcript": compress_text(transcript) if transcript else None,
+        "transcript_codec": "zlib",
+        "created_at": datetime.utcnow(),
+    }
+
+    chunk_rows = []
+    for seq, i in enumerate(range(0, len(rows), CHUNK_EVENTS)):
+        chunk = rows[i:i + CHUNK_EVENTS]
+        chunk_rows.append({
+            "call_id": call_id,
+            "business_id": call_row["business_id"],
+            "seq": seq,
+            "first_at": chunk[0]["received_at"],
+            "last_at": chunk[-1]["received_at"],
+            "event_count": len(chunk),
+            "codec": "zlib",
+            "data": compress_text("\n".join(r["payload"] for r in chunk)),
+        })
+    return call_row, chunk_rows
+
+
+def _merge_ready(ready):
+    """
+    One entry per call: a batch can hold the same call twice (a re-delivered
+    end-of-call report, a write retried after more events arrived). Rows are
+    put back in arrival order; exact re-deliveries are kept once.
+    """
+    merged = {}
+    for vapi_call_id, entry in ready:
+        into = merged.get(vapi_call_id)
+        if into is None:
+            merged[vapi_call_id] = {**entry, "rows": list(entry["rows"])}
+            continue
+        into["rows"].extend(entry["rows"])
+        into["appointment_id"] = entry["appointment_id"] or into["appointment_id"]
+        into["outcome"] = entry["outcome"] or into["outcome"]
+    for entry in merged.values():
+        seen = set()
+        rows = [r for r in entry["rows"] if not (r["payload"] in seen or seen.add(r["payload"]))]
+        entry["rows"] = sorted(rows, key=lambda r: r["received_at"])
+    return merged
+
+
+def _insert_calls(db: Session, call_rows):
+    """
+    INSERT ... ON CONFLICT (vapi_call_id) DO NOTHING on Postgres and SQLite;
+    elsewhere calls already stored are filtered out first.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        db.execute(upsert(Call).on_conflict_do_nothing(index_elements=["vapi_call_id"]), call_rows)
+        return
+    stored = {vapi_call_id for (vapi_call_id,) in db.query(Call.vapi_call_id).filter(
+        Call.vapi_call_id.in_([c["vapi_call_id"] for c in call_rows]))}
+    call_rows = [c for c in call_rows if c["vapi_call_id"] not in stored]
+    if call_rows:
+        db.execute(insert(Call), call_rows)
+
+
+def _merge_into(db: Session, stored, call_row: dict, entry: dict):
+    """
+    Folds a later piece of an already stored call (events that reached
+    another worker, a re-delivered report) into its `calls` row.
+    """
+    has_report = any(r["event_type"] == "end-of-call-report" for r in entry["rows"])
+    values = {
+        "started_at": case((Call.started_at > call_row["started_at"], call_row["started_at"]),
+                           else_=Call.started_at),
+        "ended_at": case((Call.ended_at < call_row["ended_at"], call_row["ended_at"]),
+                         else_=func.coalesce(Call.ended_at, call_row["ended_at"])),
+    }
+    for column in ("twilio_call_sid", "business_id", "from_number", "to_number"):
+        if call_row[column] is not None:
+            values[column] = func.coalesce(getattr(Call, column), call_row[column])
+
+    if has_report:
+        values["duration_seconds"] = call_row["duration_seconds"]
+        values["ended_reason"] = call_row["ended_reason"]
+        if call_row["transcript"] is not None:
+            values["transcript"] = call_row["transcript"]
+    elif stored.outcome == "no_report":
+        span = max(stored.ended_at or stored.started_at, call_row["ended_at"]) - min(
+            stored.started_at, call_row["started_at"])
+        values["duration_seconds"] = int(span.total_seconds())
+
+    if entry["outcome"]:
+        values["outcome"] = entry["outcome"]
+        values["appointment_id"] = entry["appointment_id"]
+    elif has_report and stored.outcome == "no_report":
+        values["outcome"] = "no_booking"
+
+    db.query(Call).filter(Call.id == stored.id).update(values, synchronize_session=False)
+
+
+def write_calls(db: Session, ready):
+    """
+    Bulk-inserts closed calls and their chunks; caller commits.
+
+    Duplicates in `ready` are merged first and the insert skips calls
+    already stored, so a replayed report never fails the batch. Events of a
+    call that is already stored are appended to it as further chunks.
+    """
+    merged = _merge_ready(ready)
+    built = {vapi_call_id: build_call_rows(vapi_call_id, entry) for vapi_call_id, entry in merged.items()}
+    _insert_calls(db, [call_row for call_row, _ in built.values()])
+
+    stored = {
+        row.vapi_call_id: row for row in db.query(
+            Call.id, Call.vapi_call_id, Call.business_id, Call.started_at, Call.ended_at, Call.outcome
+        ).filter(Call.vapi_call_id.in_(list(built)))
+    }
+    later = [stored[v].id for v, (call_row, _) in built.items() if stored[v].id != call_row["id"]]
+    next_seq = dict(
+        db.query(CallLogChunk.call_id, func.max(CallLogChunk.seq) + 1).filter(
+            CallLogChunk.call_id.in_(later)
+        ).group_by(CallLogChunk.call_id).all()
+    ) if later else {}
+
+    chunk_rows = []
+    for vapi_call_id, (call_row, chunks) in built.items():
+        row = stored[vapi_call_id]
+        if row.id != call_row["id"]:
+            _merge_into(db, row, call_row, merged[vapi_call_id])
+            # chunks follow the call's business (same coalesce as the merge)
+            business_id = row.business_id or call_row["business_id"]
+            if row.business_id is None and business_id is not None:
+                db.query(CallLogChunk).filter(
+                    CallLogChunk.call_id == row.id, CallLogChunk.business_id.is_(None)
+                ).update({"business_id": business_id}, synchronize_session=False)
+            for chunk in chunks:
+                chunk["call_id"] = row.id
+                chunk["business_id"] = business_id
+                chunk["seq"] += next_seq.get(row.id, 0)
+        chunk_rows.extend(chunks)
+    if chunk_rows:
+        db.execute(insert(CallLogChunk), chunk_rows)
+
+
+# ---------------------------------------------------------
+# READS (range queries on (business_id, started_at))
+# ---------------------------------------------------------
+def calls_between(db: Session, business_id: str, start: datetime, end: datetime):
+    return (
+        db.query(*SUMMARY_COLUMNS)
+        .filter(
+            Call.business_id == business_id,
+            Call.started_at >= start,
+            Call.started_at < end,
+        )
+        .order_by(Call.started_at)
+        .all()
+    )
+
+
+def calls_for_days(db: Session, business_id: str, date_from: date, date_to: date):
+    start = datetime.combine(date_from, datetime.min.time())
+    end = datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+    return calls_between(db, business_id, start, end)
+
+
+def call_transcript(db: Session, business_id: str, call_id: str) -> str | None:
+    row = db.query(Call.transcript, Call.transcript_codec).filter(
+        Call.id == call_id,
+        Call.business_id == business_id,
+    ).first()
+    if row is None or row.transcript is None:
+        return None
+    return decompress_text(row.transcript, row.transcript_codec)
+
+
+def call_events(db: Session, business_id: str, call_id: str):
+    """Yields the raw event dicts of a call, oldest first."""
+    chunks = db.query(CallLogChunk.data, CallLogChunk.codec).filter(
+        CallLogChunk.call_id == call_id,
+        CallLogChunk.business_id == business_id,
+    ).order_by(CallLogChunk.seq, CallLogChunk.id)  # appended pieces may share a seq
+    for chunk in chunks:
+        for line in decompress_text(chunk.data, chunk.codec).splitlines():
+            yield json.loads(line)
@@ -0,0 +1,292 @@
+import asyncio
+import binascii
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from Backend.services.audio import (
+    TWILIO_FRAME_SAMPLES,
+    TWILIO_SAMPLE_RATE,
+    Resampler,
+    VoiceActivityDetector,
+    ulaw_decode,
+    ulaw_encode,
+)
+
+# Audio handed to the speech pipeline is 16 kHz mono int16
+PIPELINE_SAMPLE_RATE = int(os.getenv("MEDIA_PIPELINE_SAMPLE_RATE", "16000"))
+# Inbound frames are decoded and run through the VAD in batches of this many (20 ms each)
+MEDIA_BATCH_FRAMES = int(os.getenv("MEDIA_BATCH_FRAMES", "5"))
+# Per-call ring buffer; the oldest audio is dropped past this
+MEDIA_BUFFER_SECONDS = float(os.getenv("MEDIA_BUFFER_SECONDS", "15"))
+# Speech before the VAD fired that is kept at the start of an utterance
+UTTERANCE_PREROLL_MS = int(os.getenv("UTTERANCE_PREROLL_MS", "200"))
+
+logger = logging.getLogger("reception_ai.media_stream")
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size int16 ring addressed by absolute sample position (samples
+    written since the call started). Writes never allocate; past capacity
+    the oldest samples are overwritten and counted as dropped.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=np.int16)
+        self.end = 0  # absolute position after the newest sample
+        self.dropped = 0
+
+    @property
+    def start(self) -> int:
+        """Absolute position of the oldest sample still held."""
+        return max(0, self.end - self.capacity)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def write(self, samples: np.ndarray):
+        n = len(samples)
+        if n >= self.capacity:
+            self.dropped += self.end - self.start + n - self.capacity
+            samples = samples[n - self.capacity:]
+            self.end += n - self.capacity
+            n = self.capacity
+        else:
+            self.dropped += max(0, len(self) + n - self.capacity)
+        offset = self.end % self.capacity
+        head = min(n, self.capacity - offset)
+        self._buffer[offset:offset + head] = samples[:head]
+        self._buffer[:n - head] = samples[head:]
+        self.end += n
+
+    def read(self, since: int) -> np.ndarray:
+        """Copy of the samples from absolute position `since` (clamped) to the newest."""
+        since = max(since, self.start)
+        n = self.end - since
+        offset = since % self.capacity
+        head = min(n, self.capacity - offset)
+        return np.concatenate((self._buffer[offset:offset + head], self._buffer[:n - head]))
+
+
+class MediaStreamSession:
+    """
+    One Twilio `<Stream>`: decodes inbound μ-law in batches, resamples it
+    for the speech pipeline into a bounded ring buffer, and cuts it into
+    utterances with the VAD. `play` sends pipeline audio back to the call.
+
+    `send` is an async callable taking a text message (the WebSocket's
+    `send_text`); `on_utterance(session, samples)` receives each utterance
+    as PIPELINE_SAMPLE_RATE int16 audio.
+    """
+
+    def __init__(self, stream_sid: str, call_sid: str | None, parameters: dict, send, on_utterance=None,
+                 hub=None):
+        self.stream_sid = stream_sid
+        self.call_sid = call_sid
+        self.business_id = parameters.get("business_id")
+        self.parameters = parameters
+        self._send = send
+        self.on_utterance = on_utterance
+        self.hub = hub
+
+        self.buffer = AudioRingBuffer(int(MEDIA_BUFFER_SECONDS * PIPELINE_SAMPLE_RATE))
+        self.vad = VoiceActivityDetector(sample_rate=TWILIO_SAMPLE_RATE)
+        self._upsample = Resampler(TWILIO_SAMPLE_RATE, PIPELINE_SAMPLE_RATE)
+        self._pending = []  # undecoded μ-law frames of the current batch
+        self._utterance_start = None  # buffer position where the current utterance began
+        self._tasks = set()
+
+        self.frames = 0
+        self.utterances = 0
+        self.marks = {}  # mark name -> sent at (monotonic), until Twilio echoes it
+        self._plays = 0
+        self.playing = False
+        self.started_at = time.monotonic()
+
+    # ---------------------------------------------------------
+    # INBOUND
+    # ---------------------------------------------------------
+    def on_media(self, media: dict):
+        if media.get("track", "inbound") != "inbound":
+            return
+        self._pending.append(binascii.a2b_base64(media["payload"]))
+        if len(self._pending) >= MEDIA_BATCH_FRAMES:
+            self.flush()
+
+    def flush(self):
+        """Decodes and analyses the pending frames in one pass."""
+        if not self._pending:
+            return
+        started = time.perf_counter()
+        samples = ulaw_decode(b"".join(self._pending))
+        self.frames += len(self._pending)
+        self._pending.clear()
+
+        first_frame = self.vad.frames
+        base = self.buffer.end
+        self.buffer.write(self._upsample.process(samples))
+        ratio = PIPELINE_SAMPLE_RATE / TWILIO_SAMPLE_RATE
+
+        for frame, kind in self.vad.process(samples):
+            # frame number -> position in the (resampled) buffer
+            position = base + int((frame - first_frame) * TWILIO_FRAME_SAMPLES * ratio)
+            if kind == "start":
+                self._utterance_start = position - UTTERANCE_PREROLL_MS * PIPELINE_SAMPLE_RATE // 1000
+                if self.playing:
+                    self._spawn(self.clear())  # caller talks over us: stop playback
+            elif self._utterance_start is not None:
+                audio = self.buffer.read(self._utterance_start)[:max(0, position - self._utterance_start)]
+                self._utterance_start = None
+                self._emit(audio)
+
+        if self.hub is not None:
+            self.hub.record_batch(time.perf_counter() - started)
+
+    def _emit(self, audio: np.ndarray):
+        self.utterances += 1
+        if self.hub is not None:
+            self.hub.utterances += 1
+        if self.on_utterance is not None:
+            self._spawn(self.on_utterance(self, audio))
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def on_mark(self, mark: dict):
+        self.marks.pop(mark.get("name"), None)
+        if not self.marks:
+            self.playing = False
+
+    # ---------------------------------------------------------
+    # OUTBOUND
+    # ---------------------------------------------------------
+    async def play(self, samples: np.ndarray, sample_rate: int = PIPELINE_SAMPLE_RATE, mark: str | None = None):
+        """
+        Sends int16 audio to the caller as 20 ms μ-law frames, followed by a
+        mark so we know when Twilio has played it.
+        """
+        if sample_rate != TWILIO_SAMPLE_RATE:
+            samples = Resampler(sample_rate, TWILIO_SAMPLE_RATE).process(samples)
+        payload = ulaw_encode(samples)
+        frame_bytes = TWILIO_FRAME_SAMPLES
+        for i in range(0, len(payload), frame_bytes):
+            await self._send(json.dumps({
+                "event": "media",
+                "streamSid": self.stream_sid,
+                "media": {"payload": binascii.b2a_base64(payload[i:i + frame_bytes], newline=False).decode()},
+            }))
+        self._plays += 1
+        name = mark or f"play-{self._plays}"
+        self.marks[name] = time.monotonic()
+        self.playing = True
+        await self._send(json.dumps({"event": "mark", "streamSid": self.stream_sid, "mark": {"name": name}}))
+
+    async def clear(self):
+        """Drops audio Twilio has buffered but not played yet (barge-in)."""
+        self.marks.clear()
+        self.playing = False
+        await self._send(json.dumps({"event": "clear", "streamSid": self.stream_sid}))
+
+    async def close(self):
+        self.flush()
+        if self._utterance_start is not None:
+            audio = self.buffer.read(self._utterance_start)
+            self._utterance_start = None
+            self._emit(audio)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class MediaStreamHub:
+    """
+    Live media streams of this process, plus counters for /metrics.
+
+    `on_utterance` is where a speech pipeline plugs in; sessions opened
+    afterwards hand it their utterances.
+    """
+
+    def __init__(self):
+        self.sessions = {}  # stream sid -> MediaStreamSession
+        self.on_utterance = None
+        self.opened = 0
+        self.closed = 0
+        self.frames = 0
+        self.utterances = 0
+        self.dropped_samples = 0
+        self.batches = 0
+        self.batch_seconds = 0.0
+
+    def open(self, start: dict, send) -> MediaStreamSession:
+        session = MediaStreamSession(
+            start["streamSid"],
+            start.get("callSid"),
+            start.get("customParameters") or {},
+            send,
+            on_utterance=self.on_utterance,
+            hub=self,
+        )
+        self.sessions[session.stream_sid] = session
+        self.opened += 1
+        return session
+
+    async def close(self, session: MediaStreamSession):
+        try:
+            await session.close()
+        finally:
+            self.sessions.pop(session.stream_sid, None)
+            self.closed += 1
+            self.frames += session.frames
+            self.dropped_samples += session.buffer.dropped
+            if session.buffer.dropped:
+                logger.warning("stream %s dropped %d samples: the pipeline is not keeping up",
+                               session.stream_sid, session.buffer.dropped)
+
+    def record_batch(self, seconds: float):
+        self.batches += 1
+        self.batch_seconds += seconds
+
+    def stats(self):
+        return {
+            "active": len(self.sessions),
+            "opened": self.opened,
+            "closed": self.closed,
+            "frames": self.frames + sum(s.frames for s in self.sessions.values()),
+            "utterances": self.utterances,
+            "dropped_samples": self.dropped_samples,
+            "batches": self.batches,
+            "batch_seconds": self.batch_seconds,
+        }
+
+
+media_streams = MediaStreamHub()
+
+
+async def handle_message(session: MediaStreamSession | None, message: dict, send):
+    """
+    Applies one Twilio Media Streams message; returns the call's session
+    (opened by "start", None again once "stop" has closed it).
+    """
+    event = message.get("event")
+    if event == "media":
+        if session is not None:
+            session.on_media(message["media"])
+        return session
+    if event == "start":
+        return media_streams.open(message["start"], send)
+    if event == "mark":
+        if session is not None:
+            session.on_mark(message.get("mark") or {})
+        return session
+    if event == "stop":
+        if session is not None:
+            await media_streams.close(session)
+        return None
+    # "connected", "dtmf": nothing to do yet
+    return session
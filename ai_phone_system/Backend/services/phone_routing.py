@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from Backend.models.business import Business, BusinessPhoneNumber
+from Backend.services.twiml_service import twiml_cache
+from Backend.utils.phone import normalize_e164, try_normalize_e164
+
+
+# Other workers only see number moves through this TTL
+PHONE_ROUTING_TTL_SECONDS = int(os.getenv("PHONE_ROUTING_TTL_SECONDS", "300"))
+
+
+class PhoneNumberTakenError(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# IN-MEMORY ROUTING MAP (dialed E.164 number -> business_id)
+# ---------------------------------------------------------
+class PhoneRouter:
+    """
+    Dialed number -> business_id, warmed at startup and kept current by the
+    write paths below.
+
+    A miss (e.g. a number added through another worker) falls back to one
+    lookup on the unique `business_phone_numbers.number` index and is then
+    remembered, so call setup never scans a table. Entries older than
+    `ttl_seconds` count as misses, so a number moved or removed through
+    another worker is re-read from the table.
+    """
+
+    def __init__(self, ttl_seconds: int = PHONE_ROUTING_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._by_number = {}  # number -> (business_id, loaded_at)
+        self._lock = threading.Lock()
+        self.warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    def warm(self, db: Session) -> int:
+        rows = db.query(BusinessPhoneNumber.number, BusinessPhoneNumber.business_id).all()
+        now = time.monotonic()
+        with self._lock:
+            self._by_number = {number: (business_id, now) for number, business_id in rows}
+            self.warmed = True
+        return len(rows)
+
+    def lookup(self, number: str | None) -> str | None:
+        """Memory-only lookup; `number` must already be E.164."""
+        if not number:
+            return None
+        entry = self._by_number.get(number)
+        if entry is None or time.monotonic() - entry[1] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def resolve(self, db: Session, raw_number: str | None) -> str | None:
+        """Business answering on `raw_number` (any format), or None."""
+        number = try_normalize_e164(raw_number)
+        if not number:
+            return None
+        business_id = self.lookup(number)
+        if business_id is None:
+            row = db.query(BusinessPhoneNumber.business_id).filter(
+                BusinessPhoneNumber.number == number
+            ).first()
+            previous = self._by_number.get(number)
+            if previous is not None and (row is None or row[0] != previous[0]):
+                _forget(number)  # moved or removed through another worker
+            if row is None:
+                return None
+            business_id = row[0]
+            self.add(number, business_id)
+        return business_id
+
+    def add(self, number: str, business_id: str):
+        with self._lock:
+            self._by_number[number] = (business_id, time.monotonic())
+
+    def remove(self, number: str):
+        with self._lock:
+            self._by_number.pop(number, None)
+
+    def replace_business(self, business_id: str, numbers) -> list:
+        """Points exactly `numbers` at a business; returns the numbers it lost."""
+        numbers = set(numbers)
+        now = time.monotonic()
+        with self._lock:
+            stale = [n for n, (b, _) in self._by_number.items() if b == business_id and n not in numbers]
+            for number in stale:
+                del self._by_number[number]
+            for number in numbers:
+                self._by_number[number] = (business_id, now)
+        return stale
+
+    def __len__(self):
+        return len(self._by_number)
+
+
+phone_router = PhoneRouter()
+
+
+def _forget(number: str):
+    phone_router.remove(number)
+    # the cache is keyed by number; drop it whoever it pointed to
+    twiml_cache.invalidate_number(number)
+
+
+# ---------------------------------------------------------
+# WRITE PATHS (commit, then update the map)
+# ---------------------------------------------------------
+def list_numbers(db: Session, business_id: str):
+    return (
+        db.query(BusinessPhoneNumber)
+        .filter(BusinessPhoneNumber.business_id == business_id)
+        .order_by(BusinessPhoneNumber.created_at)
+        .all()
+    )
+
+
+def add_number(db: Session, business_id: str, raw_number: str, kind: str = "forwarded") -> BusinessPhoneNumber:
+    """
+    Routes `raw_number` to a business. Raises InvalidPhoneNumberError or
+    PhoneNumberTakenError (the number answers for another business).
+    """
+    number = normalize_e164(raw_number)
+    existing = db.query(BusinessPhoneNumber).filter(BusinessPhoneNumber.number == number).first()
+    if existing:
+        if existing.business_id != business_id:
+            raise PhoneNumberTakenError(f"{number} is already in use")
+        return existing
+
+    row = BusinessPhoneNumber(business_id=business_id, number=number, kind=kind)
+    db.add(row)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise PhoneNumberTakenError(f"{number} is already in use")
+    db.refresh(row)
+
+    _forget(number)
+    phone_router.add(number, business_id)
+    return row
+
+
+def remove_number(db: Session, business_id: str, raw_number: str) -> bool:
+    number = normalize_e164(raw_number)
+    row = db.query(BusinessPhoneNumber).filter(
+        BusinessPhoneNumber.number == number,
+        BusinessPhoneNumber.business_id == business_id,
+    ).first()
+    if not row:
+        return False
+
+    business = db.query(Business).filter(Business.id == business_id).first()
+    if business and business.phone_number == number:
+        business.phone_number = None
+    db.delete(row)
+    db.commit()
+
+    _forget(number)
+    return True
+
+
+def set_primary_number(db: Session, business: Business, raw_number: str | None):
+    """
+    Makes `raw_number` the business's primary number (None clears it).
+
+    The previous primary row is dropped; forwarded and ported numbers stay.
+    Flushes but does not commit; call `publish_numbers` after committing.
+    """
+    number = normalize_e164(raw_number) if raw_number else None
+    if number == business.phone_number:
+        return
+
+    if number:
+        owner = db.query(BusinessPhoneNumber).filter(BusinessPhoneNumber.number == number).first()
+        if owner and owner.business_id != business.id:
+            raise PhoneNumberTakenError(f"{number} is already in use")
+    else:
+        owner = None
+
+    if business.phone_number:
+        db.query(BusinessPhoneNumber).filter(
+            BusinessPhoneNumber.business_id == business.id,
+            BusinessPhoneNumber.number == business.phone_number,
+            BusinessPhoneNumber.kind == "primary",
+        ).delete()
+
+    if owner:
+        owner.kind = "primary"
+    elif number:
+        db.add(BusinessPhoneNumber(business_id=business.id, number=number, kind="primary"))
+
+    business.phone_number = number
+    db.flush()
+
+
+def publish_numbers(db: Session, business_id: str):
+    """
+    Re-syncs the routing map with a business's committed numbers.
+    """
+    numbers = [row.number for row in list_numbers(db, business_id)]
+    for number in phone_router.replace_business(business_id, numbers):
+        twiml_cache.invalidate_number(number)
@@ -0,0 +1,364 @@
+import asyncio
+import heapq
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from Backend.database import SessionLocal
+from Backend.models.appointment import Appointment
+from Backend.models.business import Business
+from Backend.services.timezones import business_zones, to_local
+from Backend.services.twilio_service import TWILIO_ACCOUNT_SID, SmsRejected, TwilioSmsClient
+
+REMINDERS_ENABLED = os.getenv("REMINDERS_ENABLED", "true" if TWILIO_ACCOUNT_SID else "false").lower() in (
+    "1", "true", "yes"
+)
+REMINDER_LEAD_HOURS = float(os.getenv("REMINDER_LEAD_HOURS", "24"))  # reminder goes out this long before
+REMINDER_MIN_NOTICE_MINUTES = int(os.getenv("REMINDER_MIN_NOTICE_MINUTES", "60"))  # closer than this: skip
+REMINDER_WINDOW_MINUTES = int(os.getenv("REMINDER_WINDOW_MINUTES", "60"))  # due reminders held in memory
+REMINDER_RELOAD_MINUTES = float(os.getenv("REMINDER_RELOAD_MINUTES", "15"))  # re-read the window (other writers)
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "100"))
+REMINDER_MAX_INFLIGHT_BATCHES = int(os.getenv("REMINDER_MAX_INFLIGHT_BATCHES", "2"))  # claimed, not yet sent
+REMINDER_TICK_SECONDS = float(os.getenv("REMINDER_TICK_SECONDS", "1"))
+REMINDER_RETRY_MINUTES = float(os.getenv("REMINDER_RETRY_MINUTES", "5"))  # after a transient send failure
+
+logger = logging.getLogger("reception_ai.reminders")
+
+
+def reminder_due(start_time: datetime, lead_hours: float = REMINDER_LEAD_HOURS) -> datetime:
+    return start_time - timedelta(hours=lead_hours)
+
+
+def format_reminder(business_name: str | None, local_start: datetime) -> str:
+    clock = local_start.strftime("%I:%M %p").lstrip("0")
+    who = f" from {business_name}" if business_name else ""
+    return (
+        f"Reminder{who}: your appointment is on {local_start:%a %b} {local_start.day} at {clock}. "
+        "Call us if you need to change it."
+    )
+
+
+# ---------------------------------------------------------
+# IN-MEMORY QUEUE (reminders due before `horizon`)
+# ---------------------------------------------------------
+class ReminderQueue:
+    """
+    Min-heap of (due, appointment id) for the reminders due before
+    `horizon`; later ones are left in the database until the window
+    moves up to them.
+
+    Cancelled or moved appointments are not searched for in the heap:
+    `_due` holds each id's current due time and stale heap entries are
+    skipped when they surface. Thread-safe, since the sync booking
+    routes call `schedule` / `discard` from the threadpool.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._due = {}  # appointment id -> due time of its live heap entry
+        self._lock = threading.Lock()
+        self.horizon = None  # None: not loaded yet, nothing is held
+
+    def __len__(self):
+        return len(self._due)
+
+    def schedule(self, appointment_id: str, due: datetime, replace: bool = True) -> bool:
+        """
+        Holds the reminder if it falls inside the loaded window; returns
+        whether it did. With `replace=False` an id already held keeps its
+        due time (a pending retry is not pulled forward by a reload).
+        """
+        with self._lock:
+            if self.horizon is None or due >= self.horizon:
+                self._due.pop(appointment_id, None)
+                return False
+            if not replace and appointment_id in self._due:
+                return True
+            self._due[appointment_id] = due
+            heapq.heappush(self._heap, (due, appointment_id))
+            return True
+
+    def discard(self, appointment_id: str):
+        with self._lock:
+            self._due.pop(appointment_id, None)
+
+    def pop_due(self, now: datetime, limit: int):
+        """Up to `limit` (due, appointment id) due by `now`, earliest first."""
+        batch = []
+        with self._lock:
+            while self._heap and len(batch) < limit and self._heap[0][0] <= now:
+                due, appointment_id = heapq.heappop(self._heap)
+                if self._due.get(appointment_id) == due:
+                    del self._due[appointment_id]
+                    batch.append((due, appointment_id))
+            if len(self._heap) > 2 * len(self._due) + 1024:
+                # mostly stale entries (cancellations): rebuild
+                self._heap = [(due, key) for key, due in self._due.items()]
+                heapq.heapify(self._heap)
+        return batch
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            self._due.clear()
+            self.horizon = None
+
+
+reminder_queue = ReminderQueue()
+
+
+def on_booked(appointment: Appointment):
+    """Booking hook: holds the reminder if it is due inside the loaded window."""
+    if appointment.customer_phone and appointment.status == "scheduled":
+        reminder_queue.schedule(appointment.id, reminder_due(appointment.start_time))
+
+
+def on_cancelled(appointment_id: str):
+    reminder_queue.discard(appointment_id)
+
+
+# ---------------------------------------------------------
+# STORAGE (indexed window load, claim, release)
+# ---------------------------------------------------------
+def window_query(db: Session, start: datetime | None, end: datetime, now: datetime,
+                 lead_hours: float = REMINDER_LEAD_HOURS):
+    """
+    (id, start_time) of unsent reminders due in [start, end); `start`
+    None means everything not yet sent that is still worth sending.
+    One range scan on ix_appointments_reminder_due.
+    """
+    lead = timedelta(hours=lead_hours)
+    query = db.query(Appointment.id, Appointment.start_time).filter(
+        Appointment.status == "scheduled",
+        Appointment.reminder_sent_at.is_(None),
+        Appointment.start_time < end + lead,
+        Appointment.start_time > now + timedelta(minutes=REMINDER_MIN_NOTICE_MINUTES),
+        Appointment.customer_phone.isnot(None),
+    )
+    if start is not None:
+        query = query.filter(Appointment.start_time >= start + lead)
+    return query
+
+
+def load_window(db: Session, start: datetime | None, end: datetime, now: datetime,
+                lead_hours: float = REMINDER_LEAD_HOURS):
+    return window_query(db, start, end, now, lead_hours).all()
+
+
+def claim_reminders(db: Session, appointment_ids, now: datetime, lead_hours: float = REMINDER_LEAD_HOURS):
+    """
+    Marks the reminders as sent and returns [(id, phone, message)] for the
+    ones this call claimed. The UPDATE re-checks everything the in-memory
+    queue may be stale on (cancelled, moved, claimed by another process),
+    so each reminder is sent at most once across workers.
+    """
+    claimed = db.execute(
+        update(Appointment)
+        .where(
+            Appointment.id.in_(list(appointment_ids)),
+            Appointment.status == "scheduled",
+            Appointment.reminder_sent_at.is_(None),
+            Appointment.customer_phone.isnot(None),
+            Appointment.start_time <= now + timedelta(hours=lead_hours),
+            Appointment.start_time > now + timedelta(minutes=REMINDER_MIN_NOTICE_MINUTES),
+        )
+        .values(reminder_sent_at=now)
+        .returning(Appointment.id, Appointment.business_id, Appointment.customer_phone, Appointment.start_time)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    if not claimed:
+        return []
+
+    names = dict(db.query(Business.id, Business.name).filter(
+        Business.id.in_({row.business_id for row in claimed})
+    ))
+    messages = []
+    for row in claimed:
+        local_start = to_local(row.start_time, business_zones.get(db, row.business_id))
+        messages.append((row.id, row.customer_phone, format_reminder(names.get(row.business_id), local_start)))
+    return messages
+
+
+def release_reminders(db: Session, appointment_ids):
+    """Un-claims reminders whose send failed transiently, so they can be retried."""
+    db.query(Appointment).filter(Appointment.id.in_(list(appointment_ids))).update(
+        {Appointment.reminder_sent_at: None}, synchronize_session=False
+    )
+    db.commit()
+
+
+def _in_session(fn, *args):
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# WORKER
+# ---------------------------------------------------------
+class ReminderScheduler:
+    """
+    Background task sending SMS reminders `lead_hours` before appointments.
+
+    Only the next `window_minutes` of due reminders are held in memory
+    (`reminder_queue`), loaded with an indexed range query as the window
+    moves and kept current by the booking and cancel hooks. Every
+    `reload_minutes` the whole window is re-read to pick up writes from
+    other processes. Due reminders are claimed and sent in batches of
+    `batch_size` through the rate-limited Twilio client, at most
+    `max_inflight_batches` at a time (a backlog after downtime is not
+    claimed all at once); transient failures are released and retried
+    after `retry_minutes`.
+    """
+
+    def __init__(
+        self,
+        client: TwilioSmsClient | None = None,
+        queue: ReminderQueue = reminder_queue,
+        lead_hours: float = REMINDER_LEAD_HOURS,
+        window_minutes: float = REMINDER_WINDOW_MINUTES,
+        reload_minutes: float = REMINDER_RELOAD_MINUTES,
+        batch_size: int = REMINDER_BATCH_SIZE,
+        max_inflight_batches: int = REMINDER_MAX_INFLIGHT_BATCHES,
+        tick_seconds: float = REMINDER_TICK_SECONDS,
+        retry_minutes: float = REMINDER_RETRY_MINUTES,
+    ):
+        self.client = client if client is not None else TwilioSmsClient()
+        self.queue = queue
+        self.lead_hours = lead_hours
+        self.window = timedelta(minutes=window_minutes)
+        self.reload_every = timedelta(minutes=reload_minutes)
+        self.batch_size = batch_size
+        self.max_inflight_batches = max_inflight_batches
+        self.tick_seconds = tick_seconds
+        self.retry_after = timedelta(minutes=retry_minutes)
+        self._task = None
+        self._inflight = set()
+        self._reloaded_at = None
+
+        self.loads = 0
+        self.loaded = 0
+        self.batches = 0
+        self.claimed = 0
+        self.sent = 0
+        self.rejected = 0
+        self.retried = 0
+        self.last_batch_seconds = 0.0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._inflight:
+            # claimed reminders: finish sending them rather than leave them marked sent
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        self.queue.clear()
+        self._reloaded_at = None
+        await self.client.aclose()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("reminder tick failed")  # database hiccup: try again next tick
+            await asyncio.sleep(self.tick_seconds)
+
+    async def tick(self, now: datetime | None = None):
+        """
+        Moves the window if needed, then starts sending what is due by `now`
+        (in the background; `drain` waits for it).
+        """
+        now = now or datetime.utcnow()
+        if self._reloaded_at is None or now - self._reloaded_at >= self.reload_every:
+            await self._load(None, now)
+            self._reloaded_at = now
+        elif self.queue.horizon - now < self.window / 2:
+            await self._load(self.queue.horizon, now)
+
+        while len(self._inflight) < self.max_inflight_batches:
+            batch = self.queue.pop_due(now, self.batch_size)
+            if not batch:
+                return
+            task = asyncio.create_task(self._dispatch(batch, now))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def drain(self):
+        """Waits for the batches being sent."""
+        while self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def _load(self, start: datetime | None, now: datetime):
+        # widen first: bookings committed while the query runs are caught by the hook
+        end = now + self.window
+        self.queue.horizon = max(end, self.queue.horizon or end)
+        rows = await run_in_threadpool(_in_session, load_window, start, end, now, self.lead_hours)
+        for appointment_id, start_time in rows:
+            self.queue.schedule(appointment_id, reminder_due(start_time, self.lead_hours), replace=False)
+        self.loads += 1
+        self.loaded += len(rows)
+
+    async def _dispatch(self, batch, now: datetime):
+        try:
+            await self._send(batch, now)
+        except Exception:
+            logger.exception("reminder batch failed")  # anything left unclaimed is re-read by the next reload
+
+    async def _send(self, batch, now: datetime):
+        started = time.perf_counter()
+        self.batches += 1
+        messages = await run_in_threadpool(
+            _in_session, claim_reminders, [appointment_id for _, appointment_id in batch], now, self.lead_hours
+        )
+        self.claimed += len(messages)
+        if not messages:
+            return
+
+        results = await self.client.send_batch([(phone, body) for _, phone, body in messages])
+        retry = []
+        for (appointment_id, phone, _), result in zip(messages, results):
+            if not isinstance(result, BaseException):
+                self.sent += 1
+            elif isinstance(result, SmsRejected):
+                self.rejected += 1  # stays claimed: the number will not start working
+                logger.warning("reminder for %s rejected: %s", appointment_id, result)
+            else:
+                retry.append(appointment_id)
+        if retry:
+            self.retried += len(retry)
+            await run_in_threadpool(_in_session, release_reminders, retry)
+            for appointment_id in retry:
+                self.queue.schedule(appointment_id, now + self.retry_after)
+        self.last_batch_seconds = time.perf_counter() - started
+
+    def stats(self):
+        return {
+            "held": len(self.queue),
+            "inflight_batches": len(self._inflight),
+            "loads": self.loads,
+            "loaded": self.loaded,
+            "batches": self.batches,
+            "claimed": self.claimed,
+            "sent": self.sent,
+            "rejected": self.rejected,
+            "retried": self.retried,
+            "last_batch_seconds": self.last_batch_seconds,
+            "sms": self.client.stats(),
+        }
+
+
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from datetime import date as date_type, timedelta
+
+from sqlalchemy.orm import Session
+
+from Backend.models.business import BusinessClosure, BusinessHours
+from Backend.services.slot_engine import merge_intervals, subtract_intervals
+
+# Other workers only see hour / closure writes through this TTL
+SCHEDULE_TTL_SECONDS = int(os.getenv("SCHEDULE_TTL_SECONDS", "300"))
+
+DAY_MINUTES = 24 * 60
+
+
+def wall_minute(value, round_up: bool = False) -> int:
+    """Minutes since midnight of a `time`; seconds round up for opening times."""
+    minute = value.hour * 60 + value.minute
+    if round_up and (value.second or value.microsecond):
+        minute += 1
+    return minute
+
+
+class WeeklySchedule:
+    """
+    A business's opening hours compiled to sorted (open, close) wall-minute
+    intervals per weekday, with closures subtracted per date.
+
+    Several rows on one weekday are split shifts; overlapping rows merge.
+    """
+
+    __slots__ = ("weekly", "closures")
+
+    def __init__(self, weekly, closures):
+        self.weekly = weekly  # 7 tuples of (open, close) wall-minute pairs
+        self.closures = closures  # date -> merged closed wall-minute pairs
+
+    @classmethod
+    def compile(cls, hours, closures=()):
+        by_weekday = [[] for _ in range(7)]
+        for h in hours:
+            open_minute = wall_minute(h.open_time, round_up=True)
+            close_minute = wall_minute(h.close_time)
+            if close_minute > open_minute:
+                by_weekday[h.day_of_week].append((open_minute, close_minute))
+        weekly = tuple(
+            tuple((start, end) for start, end in merge_intervals(intervals))
+            for intervals in by_weekday
+        )
+
+        closed = {}
+        for c in closures:
+            if c.start_time is None or c.end_time is None:
+                window = (0, DAY_MINUTES)
+            else:
+                window = (wall_minute(c.start_time), wall_minute(c.end_time, round_up=True))
+            day = c.start_date
+            while day <= c.end_date:
+                closed.setdefault(day, []).append(window)
+                day += timedelta(days=1)
+        return cls(weekly, {day: merge_intervals(windows) for day, windows in closed.items()})
+
+    def open_intervals(self, day: date_type):
+        """Open wall-minute intervals of a local date, closures removed."""
+        intervals = self.weekly[day.weekday()]
+        closed = self.closures.get(day)
+        if closed and intervals:
+            return subtract_intervals(intervals, closed)
+        return intervals
+
+    def is_open(self, day: date_type) -> bool:
+        return bool(self.open_intervals(day))
+
+
+# ---------------------------------------------------------
+# PER-BUSINESS CACHE (rebuilt on hours / closure writes)
+# ---------------------------------------------------------
+class ScheduleCache:
+    """
+    One compiled object per business, built by `loader(db, business_id)`.
+
+    Writers call `invalidate`; other workers rebuild after `ttl_seconds`.
+    """
+
+    def __init__(self, loader, ttl_seconds: int = SCHEDULE_TTL_SECONDS):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}  # business_id -> (compiled, compiled_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.compiles = 0
+
+    def get(self, db: Session, business_id: str):
+        entry = self._entries.get(business_id)
+        if entry is not None and time.monotonic() - entry[1] <= self.ttl_seconds:
+            self.hits += 1
+        else:
+            entry = (self.loader(db, business_id), time.monotonic())
+            with self._lock:
+                self._entries[business_id] = entry
+                self.compiles += 1
+        return entry[0]
+
+    def invalidate(self, business_id: str):
+        with self._lock:
+            self._entries.pop(business_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def load_schedule(db: Session, business_id: str) -> WeeklySchedule:
+    """
+    Two indexed queries: all weekly hours, and closures not yet over.
+    """
+    hours = db.query(
+        BusinessHours.day_of_week, BusinessHours.open_time, BusinessHours.close_time
+    ).filter(BusinessHours.business_id == business_id).all()
+
+    # past closures cannot affect bookable days; keep a day of slack for zones ahead of UTC
+    closures = db.query(
+        BusinessClosure.start_date,
+        BusinessClosure.end_date,
+        BusinessClosure.start_time,
+        BusinessClosure.end_time,
+    ).filter(
+        BusinessClosure.business_id == business_id,
+        BusinessClosure.end_date >= date_type.today() - timedelta(days=1),
+    ).all()
+
+    return WeeklySchedule.compile(hours, closures)
+
+
+schedule_cache = ScheduleCache(load_schedule)
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+
+_MINUTE = timedelta(minutes=1)
+
+
+def to_minute(dt: datetime, day_start: datetime, round_up: bool = False) -> int:
+    """
+    Converts `dt` to whole minutes since `day_start`.
+
+    Seconds are floored by default; pass `round_up=True` for interval ends
+    so a booking never shrinks when it is converted.
+    """
+    if round_up:
+        return -((day_start - dt) // _MINUTE)
+    return (dt - day_start) // _MINUTE
+
+
+def busy_intervals(appointments, day_start: datetime, buffer_minutes: int = 0):
+    """
+    Returns (start, end) minute pairs for `appointments`, padded by `buffer_minutes`.
+
+    Any object exposing `start_time` and `end_time` datetimes works.
+    """
+    return [
+        (
+            to_minute(appt.start_time, day_start) - buffer_minutes,
+            to_minute(appt.end_time, day_start, round_up=True) + buffer_minutes,
+        )
+        for appt in appointments
+    ]
+
+
+def merge_intervals(intervals):
+    """
+    Sorts and merges overlapping or touching (start, end) intervals.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def subtract_intervals(intervals, removed):
+    """
+    Returns the parts of sorted, disjoint `intervals` not covered by `removed`.
+    """
+    removed = merge_intervals(removed)
+    if not removed:
+        return list(intervals)
+
+    result = []
+    for start, end in intervals:
+        for cut_start, cut_end in removed:
+            if cut_end <= start or cut_start >= end:
+                continue
+            if cut_start > start:
+                result.append((start, cut_start))
+            start = max(start, cut_end)
+            if start >= end:
+                break
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def _sweep(open_minute, close_minute, merged, duration_minutes, increment_minutes, slots):
+    gap_start = open_minute
+    for busy_start, busy_end in merged:
+        if busy_end <= gap_start:
+            continue
+        if busy_start >= close_minute:
+            break
+        gap_end = busy_start
+
+        if gap_end - gap_start >= duration_minutes:
+            # first grid point at or after the start of the gap
+            steps = -((open_minute - gap_start) // increment_minutes)
+            start = open_minute + max(steps, 0) * increment_minutes
+            last_start = gap_end - duration_minutes
+            while start <= last_start:
+                slots.append((start, start + duration_minutes))
+                start += increment_minutes
+
+        gap_start = max(gap_start, busy_end)
+        if gap_start >= close_minute:
+            return
+
+    if close_minute - gap_start >= duration_minutes:
+        steps = -((open_minute - gap_start) // increment_minutes)
+        start = open_minute + max(steps, 0) * increment_minutes
+        last_start = close_minute - duration_minutes
+        while start <= last_start:
+            slots.append((start, start + duration_minutes))
+            start += increment_minutes
+
+
+def free_slots(
+        open_minute: int,
+        close_minute: int,
+        busy,
+        duration_minutes: int,
+        increment_minutes: int,
+):
+    """
+    Returns (start, end) minute pairs of every free slot in [open_minute, close_minute].
+
+    Candidate starts lie on the `increment_minutes` grid anchored at `open_minute`.
+    The busy intervals are merged once and the free gaps between them are
+    swept in a single pass, so the cost is O(n log n + slots) instead of
+    O(slots x appointments).
+    """
+    return free_slots_in([(open_minute, close_minute)], busy, duration_minutes, increment_minutes)
+
+
+def free_slots_in(open_intervals, busy, duration_minutes: int, increment_minutes: int):
+    """
+    `free_slots` over several sorted, disjoint open intervals (split shifts).
+
+    Busy intervals are merged once for all of them; each interval keeps its
+    own grid anchored at its opening minute.
+    """
+    slots = []
+    if duration_minutes <= 0 or increment_minutes <= 0:
+        return slots
+
+    merged = merge_intervals(busy)
+    for open_minute, close_minute in open_intervals:
+        _sweep(open_minute, close_minute, merged, duration_minutes, increment_minutes, slots)
+    return slots
+
+
+def format_slots(slots):
+    """
+    Formats minute pairs as ("HH:MM", "HH:MM") tuples.
+    """
+    return [
+        (f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}")
+        for start, end in slots
+    ]
@@ -0,0 +1,193 @@
+import os
+import threading
+import time
+from datetime import date as date_type, datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy.orm import Session
+
+from Backend.models.business import Business
+
+BUSINESS_ZONE_TTL_SECONDS = int(os.getenv("BUSINESS_ZONE_TTL_SECONDS", "300"))
+
+UTC = timezone.utc
+_MIDNIGHT = datetime.min.time()
+
+
+class UnknownTimezoneError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str | None) -> ZoneInfo:
+    """ZoneInfo for an IANA name; None or "" means UTC."""
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        raise UnknownTimezoneError(f"Unknown timezone {name!r}")
+
+
+# ---------------------------------------------------------
+# PER-TENANT ZONES
+# ---------------------------------------------------------
+class BusinessZones:
+    """
+    business_id -> ZoneInfo, loaded once per tenant and dropped on timezone change.
+
+    Invalidation only reaches this process; other workers re-read the
+    timezone after `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: int = BUSINESS_ZONE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._zones = {}  # business_id -> (zone, loaded_at)
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, business_id: str) -> ZoneInfo:
+        entry = self._zones.get(business_id)
+        if entry is not None and time.monotonic() - entry[1] <= self.ttl_seconds:
+            return entry[0]
+
+        row = db.query(Business.timezone).filter(Business.id == business_id).first()
+        try:
+            zone = get_zone(row[0] if row else None)
+        except UnknownTimezoneError:
+            zone = get_zone("UTC")
+        with self._lock:
+            self._zones[business_id] = (zone, time.monotonic())
+        return zone
+
+    def invalidate(self, business_id: str):
+        with self._lock:
+            self._zones.pop(business_id, None)
+
+
+business_zones = BusinessZones()
+
+
+# ---------------------------------------------------------
+# CONVERSIONS (appointments are stored as naive UTC)
+# ---------------------------------------------------------
+def to_utc(dt: datetime, zone: ZoneInfo) -> datetime:
+    """
+    Naive UTC for `dt`. Naive input is wall time in `zone`: an ambiguous
+    time resolves to its first occurrence, a time skipped by DST moves
+    forward by the size of the gap.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=zone)
+    return dt.astimezone(UTC).replace(tzinfo=None)
+
+
+def to_local(dt: datetime, zone: ZoneInfo) -> datetime:
+    """Naive wall time in `zone` for a naive UTC `dt`."""
+    return dt.replace(tzinfo=UTC).astimezone(zone).replace(tzinfo=None)
+
+
+def to_aware(dt: datetime | None, zone: ZoneInfo) -> datetime | None:
+    """Aware time in `zone` for a naive UTC `dt`: how appointment times leave the API."""
+    if dt is None:
+        return None
+    return dt.replace(tzinfo=UTC).astimezone(zone)
+
+
+def _offset_minutes(offset: timedelta) -> int:
+    return int(offset.total_seconds()) // 60
+
+
+def _format_offset(minutes: int) -> str:
+    sign = "-" if minutes < 0 else "+"
+    minutes = abs(minutes)
+    return f"{sign}{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+# ---------------------------------------------------------
+# DAY FRAMES (one local day on a real-minute axis)
+# ---------------------------------------------------------
+class DayFrame:
+    """
+    One local day expressed in real minutes since its UTC start.
+
+    Off DST days the real minute and the wall minute are the same number.
+    On a transition day wall time jumps by `delta` minutes at real minute
+    `transition` (+60 for a spring-forward gap, -60 for a fall-back overlap).
+    """
+
+    __slots__ = ("day", "start", "end", "offset", "transition", "delta")
+
+    def __init__(self, day, start, end, offset, transition=None, delta=0):
+        self.day = day
+        self.start = start  # naive UTC of local midnight
+        self.end = end  # naive UTC of the next local midnight
+        self.offset = offset  # UTC offset in minutes at the start of the day
+        self.transition = transition
+        self.delta = delta
+
+    def wall_to_minute(self, wall_minute: int, later: bool = False) -> int:
+        """
+        Real minute at which the wall clock shows `wall_minute`.
+
+        Wall times inside a gap map to the transition; inside an overlap
+        the first occurrence is used unless `later` is set.
+        """
+        t = self.transition
+        if t is None or wall_minute < t + min(self.delta, 0):
+            return wall_minute
+        if self.delta > 0:
+            return t if wall_minute < t + self.delta else wall_minute - self.delta
+        if wall_minute < t and not later:
+            return wall_minute
+        return wall_minute - self.delta
+
+    def wall_minute(self, minute: int) -> int:
+        """Wall-clock minute shown at real minute `minute`."""
+        t = self.transition
+        return minute if t is None or minute < t else minute + self.delta
+
+    def label(self, minute: int) -> str:
+        """
+        "HH:MM" wall time of a real minute. Times inside a fall-back overlap
+        carry their UTC offset ("01:30-04:00") since the wall time repeats.
+        """
+        t = self.transition
+        wall = self.wall_minute(minute)
+        text = f"{wall // 60:02d}:{wall % 60:02d}"
+        if self.delta < 0 and t + self.delta <= wall < t:
+            text += _format_offset(self.offset if minute < t else self.offset + self.delta)
+        return text
+
+
+def _utc_midnight(zone: ZoneInfo, day: date_type):
+    """(naive UTC instant, offset minutes just before it) of local midnight."""
+    offset = _offset_minutes(datetime.combine(day, _MIDNIGHT, tzinfo=zone).utcoffset())
+    return datetime.combine(day, _MIDNIGHT) - timedelta(minutes=offset), offset
+
+
+@lru_cache(maxsize=8192)
+def day_frame(zone: ZoneInfo, day: date_type) -> DayFrame:
+    start, offset = _utc_midnight(zone, day)
+    end, next_offset = _utc_midnight(zone, day + timedelta(days=1))
+    if next_offset == offset:
+        return DayFrame(day, start, end, offset)
+
+    # first real minute with the new offset
+    low, high = 0, (end - start) // timedelta(minutes=1)
+    while low < high:
+        mid = (low + high) // 2
+        instant = (start + timedelta(minutes=mid)).replace(tzinfo=UTC)
+        if _offset_minutes(instant.astimezone(zone).utcoffset()) == offset:
+            low = mid + 1
+        else:
+            high = mid
+    return DayFrame(day, start, end, offset, transition=low, delta=next_offset - offset)
+
+
+def day_frames(zone: ZoneInfo, date_from: date_type, date_to: date_type):
+    """Frames for every local day in [date_from, date_to], oldest first."""
+    frames = []
+    day = date_from
+    while day <= date_to:
+        frames.append(day_frame(zone, day))
+        day += timedelta(days=1)
+    return frames
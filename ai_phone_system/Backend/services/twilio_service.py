@@ -0,0 +1,152 @@
+import asyncio
+import os
+
+from Backend.utils.rate_limit import RateLimiter
+
+TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
+TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
+TWILIO_FROM_NUMBER = os.getenv("TWILIO_FROM_NUMBER")  # sender; or send through a Messaging Service
+TWILIO_MESSAGING_SERVICE_SID = os.getenv("TWILIO_MESSAGING_SERVICE_SID")
+TWILIO_API_URL = os.getenv("TWILIO_API_URL", "https://api.twilio.com")  # benchmarks/fake_twilio.py locally
+
+# Twilio queues messages past the sender's throughput; stay under it instead
+SMS_RATE_PER_SECOND = float(os.getenv("SMS_RATE_PER_SECOND", "10"))
+SMS_CONCURRENCY = int(os.getenv("SMS_CONCURRENCY", "8"))
+SMS_MAX_RETRIES = int(os.getenv("SMS_MAX_RETRIES", "3"))
+SMS_HTTP_TIMEOUT_SECONDS = float(os.getenv("SMS_HTTP_TIMEOUT_SECONDS", "10"))
+
+
+class SmsError(Exception):
+    """Sending failed for now (throttled, Twilio or network down); worth retrying later."""
+
+
+class SmsRejected(SmsError):
+    """Twilio refused the message itself (bad number, opted out); retrying will not help."""
+
+
+class TwilioSmsClient:
+    """
+    Sends SMS through Twilio's Messages API over one pooled HTTP client.
+
+    Requests are throttled by a token bucket at `rate_per_second` and at
+    most `concurrency` are in flight. 429 and 5xx responses and network
+    errors are retried up to `max_retries` times, honouring Retry-After;
+    a 429 pauses every send, a 5xx only the message that got it.
+    """
+
+    def __init__(
+        self,
+        account_sid: str | None = TWILIO_ACCOUNT_SID,
+        auth_token: str | None = TWILIO_AUTH_TOKEN,
+        from_number: str | None = TWILIO_FROM_NUMBER,
+        messaging_service_sid: str | None = TWILIO_MESSAGING_SERVICE_SID,
+        base_url: str = TWILIO_API_URL,
+        rate_per_second: float = SMS_RATE_PER_SECOND,
+        concurrency: int = SMS_CONCURRENCY,
+        max_retries: int = SMS_MAX_RETRIES,
+    ):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.messaging_service_sid = messaging_service_sid
+        self.url = f"{base_url.rstrip('/')}/2010-04-01/Accounts/{account_sid}/Messages.json"
+        self.rate_per_second = rate_per_second
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._client = None
+        self._limiter = None
+        self._semaphore = None
+
+        self.requests = 0
+        self.sent = 0
+        self.throttled = 0
+        self.failed = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.account_sid and self.auth_token and (self.from_number or self.messaging_service_sid))
+
+    def _ensure_client(self):
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                auth=(self.account_sid, self.auth_token),
+                timeout=SMS_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+            # created here, not in __init__: they belong to the running event loop
+            self._limiter = RateLimiter(self.rate_per_second, burst=1)  # evenly spaced: no bursts into a 429
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def send_sms(self, to: str, body: str) -> str:
+        """Sends one message; returns Twilio's message SID."""
+        import httpx
+
+        client = self._ensure_client()
+        data = {"To": to, "Body": body}
+        if self.messaging_service_sid:
+            data["MessagingServiceSid"] = self.messaging_service_sid
+        else:
+            data["From"] = self.from_number
+
+        async with self._semaphore:
+            error = None
+            for attempt in range(self.max_retries + 1):
+                await self._limiter.acquire()
+                self.requests += 1
+                try:
+                    response = await client.post(self.url, data=data)
+                except httpx.TransportError as exc:
+                    error = SmsError(f"Twilio unreachable: {exc!r}")
+                    await asyncio.sleep(min(2.0 ** attempt, 30.0))
+                    continue
+
+                if response.status_code in (200, 201):
+                    self.sent += 1
+                    return response.json().get("sid")
+                if response.status_code != 429 and response.status_code < 500:
+                    self.failed += 1
+                    raise SmsRejected(self._describe(response))
+
+                self.throttled += 1
+                error = SmsError(self._describe(response))
+                try:
+                    delay = float(response.headers.get("Retry-After", ""))
+                except ValueError:
+                    delay = 0.5 * 2.0 ** attempt
+                if response.status_code == 429:
+                    self._limiter.pause(delay)  # the account is over its rate: everyone waits
+                else:
+                    await asyncio.sleep(delay)  # a 5xx only backs off this message
+            self.failed += 1
+            raise error
+
+    async def send_batch(self, messages):
+        """
+        Sends [(to, body)] concurrently through the pool; returns one result
+        per message, in order: the message SID or the exception raised.
+        """
+        return await asyncio.gather(*(self.send_sms(to, body) for to, body in messages), return_exceptions=True)
+
+    @staticmethod
+    def _describe(response) -> str:
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        code = body.get("code")
+        message = body.get("message") or response.text[:200]
+        return f"Twilio {response.status_code}" + (f" ({code})" if code else "") + f": {message}"
+
+    def stats(self):
+        return {"requests": self.requests, "sent": self.sent, "throttled": self.throttled, "failed": self.failed}
@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from xml.sax.saxutils import escape, quoteattr
+
+from Backend.models.business import Business
+
+DEFAULT_VOICE = "alice"
+# Our own <Stream> endpoint (wss://.../twilio/media-stream), for businesses without a stream_url
+MEDIA_STREAM_URL = os.getenv("MEDIA_STREAM_URL")
+# Other workers only see greeting / voice / stream changes through this TTL
+TWIML_TTL_SECONDS = int(os.getenv("TWIML_TTL_SECONDS", "300"))
+
+# Templates are formatted, never parsed; values are escaped on the way in
+_SAY = '<Say voice={voice}>{text}</Say>'
+_STREAM = (
+    '<Connect><Stream url={url}>'
+    '<Parameter name="business_id" value={business_id}/>'
+    '</Stream></Connect>'
+)
+_RESPONSE = '<?xml version="1.0" encoding="UTF-8"?><Response>{body}</Response>'
+
+FALLBACK_TWIML = _RESPONSE.format(body=(
+    _SAY.format(voice=quoteattr(DEFAULT_VOICE),
+                text="Hello! Please hold while I connect you to our AI assistant.")
+    + '<Pause length="1"/>'
+    + _SAY.format(voice=quoteattr(DEFAULT_VOICE), text="Goodbye.")
+)).encode()
+
+
+def render_voice_twiml(business: Business) -> bytes:
+    """
+    Builds the answering TwiML for a business: greeting, then the media stream.
+    """
+    voice = quoteattr(business.voice or DEFAULT_VOICE)
+    greeting = business.greeting or (
+        f"Hello! Thanks for calling {business.name}. "
+        "Please hold while I connect you to our AI assistant."
+    )
+
+    body = _SAY.format(voice=voice, text=escape(greeting))
+    stream_url = business.stream_url or MEDIA_STREAM_URL
+    if stream_url:
+        body += _STREAM.format(url=quoteattr(stream_url), business_id=quoteattr(business.id))
+    else:
+        body += '<Pause length="1"/>' + _SAY.format(voice=voice, text="Goodbye.")
+    return _RESPONSE.format(body=body).encode()
+
+
+class TwimlCache:
+    """
+    Rendered TwiML bytes keyed by dialed number.
+
+    Entries are also indexed by business so a settings change drops every
+    number that business answers on. Invalidation only reaches this
+    process; other workers re-render after `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: int = TWIML_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._by_number = {}  # number -> (business_id, twiml, cached_at)
+        self._numbers = {}  # business_id -> set of numbers
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, number: str):
+        entry = self._by_number.get(number)
+        if entry is None or time.monotonic() - entry[2] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def set(self, number: str, business_id: str, twiml: bytes):
+        with self._lock:
+            previous = self._by_number.get(number)
+            if previous is not None and previous[0] != business_id:
+                self._numbers.get(previous[0], set()).discard(number)
+            self._by_number[number] = (business_id, twiml, time.monotonic())
+            self._numbers.setdefault(business_id, set()).add(number)
+
+    def invalidate_business(self, business_id: str):
+        with self._lock:
+            for number in self._numbers.pop(business_id, ()):
+                self._by_number.pop(number, None)
+
+    def invalidate_number(self, number: str):
+        with self._lock:
+            entry = self._by_number.pop(number, None)
+            if entry is not None:
+                self._numbers.get(entry[0], set()).discard(number)
+
+    def clear(self):
+        with self._lock:
+            self._by_number.clear()
+            self._numbers.clear()
+
+
+twiml_cache = TwimlCache()
+
+
+def load_voice_twiml(db, to_number: str) -> bytes | None:
+    """
+    Renders and caches TwiML for a call to E.164 `to_number`; None if no business answers on it.
+
+    The number is routed through the in-memory phone map, then the business
+    is a primary-key fetch.
+    """
+    from Backend.services.phone_routing import phone_router  # imports this module
+
+    business_id = phone_router.resolve(db, to_number)
+    business = db.get(Business, business_id) if business_id else None
+    if not business:
+        return None
+
+    twiml = render_voice_twiml(business)
+    twiml_cache.set(to_number, business.id, twiml)
+    return twiml
@@ -0,0 +1,345 @@
+import asyncio
+import hmac
+import json
+import logging
+import os
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import func
+from starlette.concurrency import run_in_threadpool
+
+from Backend.database import SessionLocal
+from Backend.models.service import Service
+from Backend.services import booking_service
+from Backend.services.availability_cache import availability_cache
+from Backend.services.availability_service import MAX_NEXT_SLOTS, get_availability_range, next_available_slots
+from Backend.services.call_log import call_log_buffer
+from Backend.services.phone_routing import phone_router
+from Backend.services.timezones import business_zones, to_aware
+from Backend.utils.metrics import Histogram
+from Backend.utils.phone import try_normalize_e164
+
+TOOL_BUDGET_SECONDS = float(os.getenv("VAPI_TOOL_BUDGET_MS", "800")) / 1000
+
+# Server URL secret set on the Vapi assistant / phone number; Vapi sends it as "X-Vapi-Secret"
+VAPI_WEBHOOK_SECRET = os.getenv("VAPI_WEBHOOK_SECRET")
+
+logger = logging.getLogger("reception_ai.vapi_tools")
+
+tool_latency = Histogram(
+    "vapi_tool_latency_seconds",
+    "Time spent answering a Vapi tool call",
+    label="tool",
+)
+
+
+# ---------------------------------------------------------
+# PAYLOAD SCHEMAS
+# ---------------------------------------------------------
+class ToolFunction(BaseModel):
+    name: str
+    arguments: Dict[str, Any] | str = {}
+
+
+class ToolCall(BaseModel):
+    id: str
+    function: ToolFunction
+
+
+class LegacyFunctionCall(BaseModel):
+    name: str
+    parameters: Dict[str, Any] = {}
+
+
+class VapiMessage(BaseModel):
+    type: str
+    toolCallList: List[ToolCall] = []
+    functionCall: Optional[LegacyFunctionCall] = None
+    assistant: Optional[Dict[str, Any]] = None
+    call: Optional[Dict[str, Any]] = None
+
+
+class VapiWebhook(BaseModel):
+    message: VapiMessage
+
+
+class CheckAvailabilityArgs(BaseModel):
+    date: date
+    service_id: Optional[str] = None
+    service_name: Optional[str] = None
+
+
+class FindNextAvailableArgs(BaseModel):
+    service_id: Optional[str] = None
+    service_name: Optional[str] = None
+    count: int = 3
+    after: Optional[datetime] = None
+    earliest: Optional[str] = None  # "HH:MM"
+    latest: Optional[str] = None
+    weekdays: Optional[List[str]] = None  # "monday", "tue", ...
+
+
+class BookAppointmentArgs(BaseModel):
+    start_time: datetime
+    customer_name: str
+    customer_phone: str
+    service_id: Optional[str] = None
+    service_name: Optional[str] = None
+
+
+class CancelAppointmentArgs(BaseModel):
+    appointment_id: str
+
+
+# Built once at import so validation never rebuilds a schema per request
+webhook_adapter = TypeAdapter(VapiWebhook)
+
+
+class ToolError(Exception):
+    """An error whose message is safe to read back to the caller."""
+
+
+# ---------------------------------------------------------
+# TOOL HANDLERS (run in a worker thread with their own session)
+# ---------------------------------------------------------
+def _find_service(db, business_id: str, service_id: str | None, service_name: str | None) -> Service:
+    query = db.query(Service).filter(Service.business_id == business_id)
+    if service_id:
+        service = query.filter(Service.id == service_id).first()
+    elif service_name:
+        # exact, case-insensitive: ilike would read "%" / "_" in the caller's words as wildcards
+        service = query.filter(func.lower(Service.name) == service_name.lower()).first()
+    else:
+        service = None
+    if not service:
+        raise ToolError("I couldn't find that service.")
+    return service
+
+
+def check_availability(db, business_id: str, args: CheckAvailabilityArgs):
+    service = _find_service(db, business_id, args.service_id, args.service_name)
+    days = get_availability_range(
+        db, business_id, args.date, args.date, [service.id], cache=availability_cache
+    )
+    slots = days[0]["services"].get(service.id, [])
+    return {
+        "date": args.date.isoformat(),
+        "service": service.name,
+        "available_start_times": [start for start, _ in slots],
+    }
+
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def _wall_minute(value: str | None) -> int | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value, "%H:%M")
+    except ValueError:
+        raise ToolError("I didn't understand that time of day.")
+    return parsed.hour * 60 + parsed.minute
+
+
+def find_next_available(db, business_id: str, args: FindNextAvailableArgs):
+    service = _find_service(db, business_id, args.service_id, args.service_name)
+    weekdays = None
+    if args.weekdays:
+        try:
+            weekdays = [WEEKDAYS.index(name.strip().lower()[:3]) for name in args.weekdays]
+        except ValueError:
+            raise ToolError("I didn't understand which days you meant.")
+    result = next_available_slots(
+        db,
+        business_id,
+        service.id,
+        count=min(max(args.count, 1), MAX_NEXT_SLOTS),
+        after=args.after,
+        earliest=_wall_minute(args.earliest),
+        latest=_wall_minute(args.latest),
+        weekdays=weekdays,
+    )
+    return {
+        "service": service.name,
+        "next_available": [slot["start_time"] for slot in result["slots"]],
+        "searched_until": result["searched_to"],
+    }
+
+
+def book_appointment(db, business_id: str, args: BookAppointmentArgs):
+    service = _find_service(db, business_id, args.service_id, args.service_name)
+    try:
+        appointment = booking_service.book_appointment(
+            db,
+            business_id=business_id,
+            customer_name=args.customer_name,
+            customer_phone=args.customer_phone,
+            start_time=args.start_time,
+            duration_minutes=service.duration_minutes,
+            service_id=service.id,
+        )
+    except booking_service.SlotUnavailableError:
+        raise ToolError("That time is no longer available.")
+    except booking_service.IneligibleResourceError:
+        raise ToolError("Nobody is available to do that service.")
+    zone = business_zones.get(db, business_id)
+    return {
+        "status": "booked",
+        "appointment_id": appointment.id,
+        "resource_id": appointment.resource_id,
+        "start_time": to_aware(appointment.start_time, zone).isoformat(),
+        "end_time": to_aware(appointment.end_time, zone).isoformat(),
+    }
+
+
+def cancel_appointment(db, business_id: str, args: CancelAppointmentArgs):
+    appointment = booking_service.cancel_appointment(db, args.appointment_id, business_id)
+    if not appointment:
+        raise ToolError("I couldn't find that appointment.")
+    return {"status": "cancelled", "appointment_id": appointment.id}
+
+
+# Tools that write: they run to completion, never cut off by the latency budget
+WRITE_TOOLS = {"book_appointment", "cancel_appointment"}
+
+TOOLS = {
+    "check_availability": (CheckAvailabilityArgs, check_availability),
+    "find_next_available": (FindNextAvailableArgs, find_next_available),
+    "book_appointment": (BookAppointmentArgs, book_appointment),
+    "cancel_appointment": (CancelAppointmentArgs, cancel_appointment),
+}
+
+
+# ---------------------------------------------------------
+# DISPATCH
+# ---------------------------------------------------------
+def dialed_number(message: VapiMessage) -> str | None:
+    return try_normalize_e164(((message.call or {}).get("phoneNumber") or {}).get("number"))
+
+
+def verify_secret(headers) -> bool:
+    """
+    True if the request carries the configured Vapi server secret, as
+    "X-Vapi-Secret" or "Authorization: Bearer". Without VAPI_WEBHOOK_SECRET
+    nothing is accepted.
+    """
+    if not VAPI_WEBHOOK_SECRET:
+        return False
+    sent = headers.get("x-vapi-secret")
+    if sent is None:
+        scheme, _, token = (headers.get("authorization") or "").partition(" ")
+        sent = token if scheme.lower() == "bearer" else ""
+    return hmac.compare_digest(sent.encode(), VAPI_WEBHOOK_SECRET.encode())
+
+
+def resolve_business_id(message: VapiMessage) -> str | None:
+    """
+    Business for a tool call: assistant metadata, then the number the
+    caller dialed (in-memory phone map). Never taken from tool arguments,
+    which the model fills in from what the caller says.
+    """
+    metadata = (message.assistant or {}).get("metadata") or {}
+    if metadata.get("business_id"):
+        return metadata["business_id"]
+    return phone_router.lookup(dialed_number(message))
+
+
+def _resolve_number(number: str) -> str | None:
+    db = SessionLocal()
+    try:
+        return phone_router.resolve(db, number)
+    finally:
+        db.close()
+
+
+def _run_tool(name: str, business_id: str, args):
+    _, handler = TOOLS[name]
+    db = SessionLocal()
+    try:
+        return handler(db, business_id, args)
+    finally:
+        db.close()
+
+
+async def run_tool_call(message: VapiMessage, name: str, arguments) -> dict:
+    """
+    Validates and runs one tool call. Lookups always return within the
+    latency budget; bookings and cancellations are waited for.
+
+    Results are dicts the assistant reads back; failures come back as
+    {"error": ...} rather than HTTP errors so the call keeps flowing.
+    """
+    started = time.perf_counter()
+    try:
+        if name not in TOOLS:
+            return {"error": f"Unknown tool {name}"}
+        if isinstance(arguments, str):
+            arguments = json.loads(arguments or "{}")
+
+        business_id = resolve_business_id(message)
+        if not business_id and dialed_number(message):
+            # number routed after this worker warmed its map
+            business_id = await run_in_threadpool(_resolve_number, dialed_number(message))
+        if not business_id:
+            return {"error": "No business is linked to this assistant."}
+
+        args_model, _ = TOOLS[name]
+        args = args_model.model_validate(arguments)
+
+        if name in WRITE_TOOLS:
+            # a timed-out write would still commit in its thread while the caller is told to retry
+            result = await run_in_threadpool(_run_tool, name, business_id, args)
+        else:
+            result = await asyncio.wait_for(
+                run_in_threadpool(_run_tool, name, business_id, args),
+                timeout=TOOL_BUDGET_SECONDS,
+            )
+        call_id = (message.call or {}).get("id")
+        if call_id and result.get("status") in ("booked", "cancelled"):
+            call_log_buffer.link_appointment(call_id, result["appointment_id"], result["status"])
+        return result
+    except ToolError as exc:
+        return {"error": str(exc)}
+    except (ValidationError, ValueError):
+        return {"error": "Some details were missing or invalid."}
+    except asyncio.TimeoutError:
+        return {"error": "This is taking longer than expected, please try again in a moment."}
+    except Exception:
+        # e.g. a database error: one failed tool must not fail the whole batch in `dispatch`
+        logger.exception("vapi tool %s failed", name)
+        return {"error": "Something went wrong on our side, please try again in a moment."}
+    finally:
+        # one label for every unknown name: the model picks them, they must not grow the metric
+        tool_latency.observe(name if name in TOOLS else "unknown", time.perf_counter() - started)
+
+
+async def dispatch(payload: dict) -> dict | None:
+    """
+    Answers Vapi tool-call and legacy function-call messages in-process.
+
+    Returns the response body for actionable messages, None otherwise.
+    """
+    message = payload.get("message") or {}
+    if message.get("type") not in ("tool-calls", "function-call"):
+        return None
+
+    message = webhook_adapter.validate_python(payload).message
+
+    if message.type == "function-call" and message.functionCall:
+        call = message.functionCall
+        return {"result": json.dumps(await run_tool_call(message, call.name, call.parameters))}
+
+    results = await asyncio.gather(*(
+        run_tool_call(message, call.function.name, call.function.arguments)
+        for call in message.toolCallList
+    ))
+    return {
+        "results": [
+            {"toolCallId": call.id, "result": json.dumps(result)}
+            for call, result in zip(message.toolCallList, results)
+        ]
+    }
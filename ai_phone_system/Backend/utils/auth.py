@@ -1,12 +1,191 @@
 from fastapi import Depends, HTTPException, Request
-import jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import threading
+import time
 import os
 
-SECRET_KEY = os.getenv("JWT_SECRET", "dev_secret")
+from Backend.database import get_async_db, get_db
+from Backend.models.business import Business
+
 ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_DAYS = 30
+
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+TOKEN_VERSION_TTL_SECONDS = int(os.getenv("JWT_VERSION_TTL_SECONDS", "60"))
+
+
+def load_signing_keys():
+    """
+    Signing keys by kid, plus the kid used for new tokens.
+
+    JWT_KEYS="2025-01:secretA,2024-07:secretB" enables rotation: tokens signed
+    with any listed key verify, new tokens use JWT_ACTIVE_KID (default: the
+    first listed). Without JWT_KEYS, JWT_SECRET is the single "default" key.
+    """
+    raw = os.getenv("JWT_KEYS")
+    if not raw:
+        return {"default": os.getenv("JWT_SECRET", "dev_secret")}, "default"
+
+    keys = {}
+    for pair in raw.split(","):
+        kid, _, secret = pair.strip().partition(":")
+        keys[kid] = secret
+    active = os.getenv("JWT_ACTIVE_KID") or next(iter(keys))
+    return keys, active
+
+
+SIGNING_KEYS, ACTIVE_KID = load_signing_keys()
+
+
+def create_access_token(data: dict, token_version: int = 0):
+    import jwt  # PyJWT and its crypto backends load on the first token, not at startup
+
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
+    to_encode.update({"exp": expire, "ver": token_version})
+    return jwt.encode(
+        to_encode,
+        SIGNING_KEYS[ACTIVE_KID],
+        algorithm=ALGORITHM,
+        headers={"kid": ACTIVE_KID},
+    )
+
+
+# ---------------------------------------------------------
+# VERIFIED-TOKEN CACHE
+# ---------------------------------------------------------
+class TokenCache:
+    """
+    Bounded LRU of token -> verified claims. Entries die with the token's `exp`.
+    """
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str):
+        with self._lock:
+            claims = self._entries.get(token)
+            if claims is None or claims["exp"] <= time.time():
+                if claims is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return claims
+
+    def set(self, token: str, claims: dict):
+        with self._lock:
+            self._entries[token] = claims
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache()
+
+
+def verify_token(token: str, use_cache: bool = True) -> dict:
+    """
+    Returns the verified claims of `token`, raising jwt.PyJWTError if invalid.
+    """
+    import jwt
+
+    if use_cache:
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
+
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid:
+        key = SIGNING_KEYS.get(kid)
+    else:
+        # tokens issued before kids were added
+        key = SIGNING_KEYS.get("default", SIGNING_KEYS[ACTIVE_KID])
+    if key is None:
+        raise jwt.InvalidTokenError(f"Unknown signing key {kid}")
+    claims = jwt.decode(token, key, algorithms=[ALGORITHM], options={"require": ["exp"]})
+
+    if use_cache:
+        token_cache.set(token, claims)
+    return claims
 
 
-def get_current_business_id(request: Request) -> str:
+# ---------------------------------------------------------
+# REVOCATION (token_version counter on Business)
+# ---------------------------------------------------------
+_token_versions = {}  # business_id -> (token_version, fetched_at)
+_versions_lock = threading.Lock()
+
+
+def _cached_token_version(business_id: str):
+    with _versions_lock:
+        cached = _token_versions.get(business_id)
+    if cached and time.monotonic() - cached[1] < TOKEN_VERSION_TTL_SECONDS:
+        return cached[0]
+    return None
+
+
+def _store_token_version(business_id: str, version: int):
+    with _versions_lock:
+        _token_versions[business_id] = (version, time.monotonic())
+
+
+def current_token_version(db: Session, business_id: str):
+    """
+    Current token_version of a business, cached for TOKEN_VERSION_TTL_SECONDS.
+
+    Revocations made by this worker apply immediately; other workers pick
+    them up within the TTL.
+    """
+    version = _cached_token_version(business_id)
+    if version is not None:
+        return version
+
+    row = db.query(Business.token_version).filter(Business.id == business_id).first()
+    if row is None:
+        return None
+    _store_token_version(business_id, row[0])
+    return row[0]
+
+
+async def current_token_version_async(db: AsyncSession, business_id: str):
+    """Same as `current_token_version`, shares its cache; queries through an AsyncSession."""
+    version = _cached_token_version(business_id)
+    if version is not None:
+        return version
+
+    row = (await db.execute(select(Business.token_version).where(Business.id == business_id))).first()
+    if row is None:
+        return None
+    _store_token_version(business_id, row[0])
+    return row[0]
+
+
+def revoke_tokens(db: Session, business_id: str) -> int:
+    """Invalidates every token issued so far for a business; returns the new version."""
+    business = db.query(Business).filter(Business.id == business_id).first()
+    business.token_version = (business.token_version or 0) + 1
+    db.commit()
+    _store_token_version(business_id, business.token_version)
+    return business.token_version
+
+
+def _token_claims(request: Request) -> dict:
+    import jwt
+
     auth = request.headers.get("Authorization")
     if not auth:
         raise HTTPException(status_code=401, detail="Missing token")
@@ -14,10 +193,33 @@ def get_current_business_id(request: Request) -> str:
     token = auth.replace("Bearer ", "")
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        business_id = payload.get("business_id")
-        if not business_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return business_id
+        payload = verify_token(token)
     except jwt.PyJWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    if not payload.get("business_id"):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
+
+def _check_version(payload: dict, version):
+    if version is None or payload.get("ver", 0) != version:
+        raise HTTPException(status_code=401, detail="Token revoked")
+
+
+def get_current_business_id(request: Request, db: Session = Depends(get_db)) -> str:
+    payload = _token_claims(request)
+    business_id = payload["business_id"]
+    _check_version(payload, current_token_version(db, business_id))
+    return business_id
+
+
+async def get_current_business_id_async(request: Request, db: AsyncSession = Depends(get_async_db)) -> str:
+    """
+    `get_current_business_id` for async routes: the revocation check runs on
+    the async engine, so no sync-pool connection is taken per request.
+    """
+    payload = _token_claims(request)
+    business_id = payload["business_id"]
+    _check_version(payload, await current_token_version_async(db, business_id))
+    return business_id
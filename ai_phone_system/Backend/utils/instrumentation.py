@@ -0,0 +1,164 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import NoMatchFound
+
+from Backend.utils.metrics import Counter, Histogram
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Requests running more queries than this are logged: usually an N+1 loop
+REQUEST_QUERY_WARN = int(os.getenv("REQUEST_QUERY_WARN", "25"))
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+logger = logging.getLogger("reception_ai.performance")
+
+request_latency = Histogram(
+    "http_request_duration_seconds",
+    "Time from request to the end of the response, per route",
+    label=("method", "route", "status"),
+)
+request_queries = Histogram(
+    "http_request_db_queries",
+    "Database queries run while serving one request",
+    label=("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+request_db_time = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database queries while serving one request",
+    label=("method", "route"),
+)
+queries_total = Counter("db_queries_total", "Database queries run, inside requests or not")
+slow_queries_total = Counter(
+    "db_slow_queries_total", f"Database queries slower than SLOW_QUERY_MS ({SLOW_QUERY_MS:g} ms)"
+)
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Stats of the request being served. Threadpool workers and AsyncSession
+# greenlets run with a copy of the request's context, so they see (and add
+# to) the same QueryStats object.
+_current = ContextVar("request_query_stats", default=None)
+
+
+# ---------------------------------------------------------
+# SQLALCHEMY HOOKS (every engine, sync and async)
+# ---------------------------------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    queries_total.inc()
+
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        slow_queries_total.inc()
+        logger.warning("slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split())[:2000])
+
+
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+_installed = False
+
+
+def install_query_hooks():
+    """Times every statement on every Engine; safe to call more than once."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _installed = True
+
+
+# ---------------------------------------------------------
+# ASGI MIDDLEWARE
+# ---------------------------------------------------------
+def _route_label(scope) -> str:
+    # the route template, never the raw path: ids would explode the series
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    # routers included as nested routers only know their own part of the path
+    try:
+        own_path = route.url_path_for(route.name, **scope.get("path_params", {}))
+    except (NoMatchFound, TypeError):
+        return template
+    path = scope.get("path", "")
+    if own_path != path and path.endswith(own_path):
+        return path[:len(path) - len(own_path)] + template
+    return template
+
+
+class TimingMiddleware:
+    """
+    Records latency, query count and query time per route, and adds a
+    `Server-Timing` header so a single slow response can be read in the
+    browser's network panel.
+
+    Plain ASGI rather than BaseHTTPMiddleware: no extra task per request,
+    and the endpoint shares this context, so its queries are counted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = (
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}, "
+                    f"db;dur={stats.seconds * 1000:.1f};desc=\"{stats.count} queries\""
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            method, route = scope["method"], _route_label(scope)
+            request_latency.observe((method, route, str(status)), elapsed)
+            request_queries.observe((method, route), stats.count)
+            request_db_time.observe((method, route), stats.seconds)
+            if stats.count > REQUEST_QUERY_WARN:
+                logger.warning("%s %s ran %d queries (%.1f ms in the database)",
+                               method, route, stats.count, stats.seconds * 1000)
@@ -0,0 +1,123 @@
+import bisect
+import threading
+
+# Upper bounds in seconds, Prometheus-style (+Inf is implicit)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _labels(names, values, extra=None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _as_tuple(value):
+    return value if isinstance(value, tuple) else (value,)
+
+
+class Histogram:
+    """
+    Cumulative latency histogram keyed by a label value (e.g. tool or route name).
+
+    `label` may be a tuple of names, observed with a tuple of values.
+    """
+
+    def __init__(self, name: str, description: str, label, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series = {}  # label value -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def snapshot(self):
+        """Returns {label value: {"buckets": {le: cumulative count}, "count": n, "sum": s}}."""
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+
+        result = {}
+        for label_value, values in series.items():
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                running += count
+                cumulative[bound] = running
+            result[label_value] = {"buckets": cumulative, "count": running, "sum": values[-1]}
+        return result
+
+    def render(self):
+        """Prometheus text exposition lines."""
+        names = _as_tuple(self.label)
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for label_value, series in sorted(self.snapshot().items()):
+            values = _as_tuple(label_value)
+            for bound, count in series["buckets"].items():
+                lines.append(f"{self.name}_bucket{_labels(names, values, ('le', _number(bound)))} {count}")
+            lines.append(f"{self.name}_sum{_labels(names, values)} {_number(series['sum'])}")
+            lines.append(f"{self.name}_count{_labels(names, values)} {series['count']}")
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter, optionally keyed by a label value like `Histogram`.
+    """
+
+    def __init__(self, name: str, description: str, label=()):
+        self.name = name
+        self.description = description
+        self.label = label
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value=(), amount: float = 1):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def render(self):
+        names = _as_tuple(self.label)
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for label_value, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{_labels(names, _as_tuple(label_value))} {_number(value)}")
+        return lines
+
+
+def sample_lines(name: str, description: str, kind: str, samples, label=()):
+    """
+    Lines for values read from elsewhere (cache stats, queue depth):
+    `samples` is {label value: number}, or a bare number without labels.
+    """
+    names = _as_tuple(label)
+    if not isinstance(samples, dict):
+        samples = {(): samples}
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+    for label_value, value in sorted(samples.items()):
+        lines.append(f"{name}{_labels(names, _as_tuple(label_value))} {_number(value)}")
+    return lines
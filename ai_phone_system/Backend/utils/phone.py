@@ -0,0 +1,46 @@
+import os
+import re
+
+# Country code assumed for national numbers without a leading + or 00
+DEFAULT_COUNTRY_CODE = os.getenv("DEFAULT_COUNTRY_CODE", "1")
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+class InvalidPhoneNumberError(ValueError):
+    pass
+
+
+def normalize_e164(raw: str, country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    """
+    Normalises a dialed or typed number to E.164 ("+15145550123").
+
+    Accepts "+1 (514) 555-0123", "0015145550123", "514-555-0123" (national,
+    `country_code` is prepended) and Twilio/Vapi's own E.164 values.
+    """
+    raw = (raw or "").strip()
+    digits = _NON_DIGITS.sub("", raw)
+
+    if raw.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif country_code == "1" and len(digits) == 11 and digits.startswith("1"):
+        pass  # NANP with trunk prefix
+    else:
+        digits = country_code + digits.lstrip("0")
+
+    # E.164: country code + subscriber number, at most 15 digits, no leading 0
+    if not 8 <= len(digits) <= 15 or digits[0] == "0":
+        raise InvalidPhoneNumberError(f"Invalid phone number {raw!r}")
+    return "+" + digits
+
+
+def try_normalize_e164(raw: str | None) -> str | None:
+    """Like normalize_e164, but None for missing or unparseable input."""
+    if not raw:
+        return None
+    try:
+        return normalize_e164(raw)
+    except InvalidPhoneNumberError:
+        return None
@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket: `rate` requests per second, bursts of up to `burst`.
+
+    `pause` empties the bucket for a provider-requested Retry-After.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate